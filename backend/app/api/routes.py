@@ -9,11 +9,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from ..db import get_db, Database
+from ..core.config import settings
+from ..core.http_clients import get_http_clients
+from ..core.parsing import get_parse_executor
 from ..models import ProfileRing, ScrapedData, ProfileClassification, OutreachMessage
-from ..modules.radar import RadarScraper
-from ..modules.brain import BrainClassifier
+from ..modules.radar import RadarScraper, get_browser_pool
+from ..modules.brain import (
+    BrainClassifier,
+    get_breaker_stats,
+    get_cascade_stats,
+    get_classification_cache,
+    get_dedup_index,
+    get_hedge_policy,
+    get_local_model,
+    get_scheduler_stats,
+)
 from ..modules.hook import HookGenerator
-from ..modules.kvk import KvKClient
+from ..modules.kvk import KvKClient, KvKScanEngine, get_prefetch_stats, get_sbi_filter
 
 router = APIRouter()
 
@@ -80,6 +92,7 @@ class PipelineResult(BaseModel):
     ring_name: Optional[str] = None
     quality_score: Optional[float] = None
     outreach_channel: Optional[str] = None
+    duplicate_of: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -170,7 +183,7 @@ async def get_profile(
 @router.post("/scrape")
 async def scrape_urls(request: ScrapeRequest):
     """Scrape URLs and return raw data"""
-    async with RadarScraper() as scraper:
+    async with RadarScraper(pool=get_browser_pool()) as scraper:
         results = []
         async for data in scraper.scrape_batch(request.urls, request.source_type):
             results.append({
@@ -179,7 +192,8 @@ async def scrape_urls(request: ScrapeRequest):
                 "source_type": data.source_type,
                 "metadata": data.metadata,
             })
-    return {"scraped": len(results), "results": results}
+        blocking = scraper.blocker.get_stats()
+    return {"scraped": len(results), "results": results, "blocking": blocking}
 
 
 @router.post("/classify")
@@ -270,16 +284,33 @@ async def run_pipeline(
 
     logger.info(f"🚀 Starting pipeline for {len(request.urls)} URLs")
 
-    async with RadarScraper() as scraper:
-        classifier = BrainClassifier()
-        generator = HookGenerator()
+    classifier = BrainClassifier()
+    generator = HookGenerator()
 
-        async for scraped_data in scraper.scrape_batch(request.urls, request.source_type):
+    async def process(chunk: List[ScrapedData]):
+        # Up to BRAIN_BATCH_MAX_SIZE profiles share one LLM request; if the
+        # batch fails, each profile is classified on its own below
+        try:
+            classifications = await classifier.classify_batch(chunk)
+        except Exception as e:
+            logger.error(f"Batch classification failed, classifying one by one: {e}")
+            classifications = [None] * len(chunk)
+
+        for i, (scraped_data, classification) in enumerate(zip(chunk, classifications)):
             result = PipelineResult(url=scraped_data.url, success=False)
 
             try:
-                # Classify
-                classification = await classifier.classify(scraped_data)
+                if classification is None:
+                    classification = await classifier.classify(scraped_data)
+
+                # Flag near-identical listings seen before (earlier in this
+                # chunk counts, later in it does not)
+                extracted_data = classification.extracted_data
+                later = [item.url for item in chunk[i + 1:]]
+                duplicate = classifier.find_duplicate(scraped_data, exclude=later)
+                if duplicate is not None:
+                    extracted_data = {**extracted_data, "duplicate_of": duplicate.ref}
+                    result.duplicate_of = duplicate.ref
 
                 # Save profile
                 profile_data = {
@@ -292,7 +323,7 @@ async def run_pipeline(
                     "quality_score": classification.quality_score,
                     "confidence": classification.confidence,
                     "classification_reasoning": classification.reasoning,
-                    "extracted_data": classification.extracted_data,
+                    "extracted_data": extracted_data,
                     "raw_text": scraped_data.text_content[:5000],  # Truncate
                     "classified_at": datetime.utcnow(),
                 }
@@ -326,6 +357,16 @@ async def run_pipeline(
 
             results.append(result)
 
+    async with RadarScraper(pool=get_browser_pool()) as scraper:
+        chunk: List[ScrapedData] = []
+        async for scraped_data in scraper.scrape_batch(request.urls, request.source_type):
+            chunk.append(scraped_data)
+            if len(chunk) >= settings.BRAIN_BATCH_MAX_SIZE:
+                await process(chunk)
+                chunk = []
+        if chunk:
+            await process(chunk)
+
     await session.commit()
     logger.info(f"🏁 Pipeline complete: {sum(1 for r in results if r.success)}/{len(results)} successful")
 
@@ -384,6 +425,7 @@ async def kvk_search(
     type: Optional[str] = None,
     pagina: int = 1,
     resultatenPerPagina: int = 10,
+    prefetch: bool = False,
 ):
     """
     Search KVK Handelsregister (Real Test API)
@@ -395,6 +437,7 @@ async def kvk_search(
     - handelsnaam: Trade name
     - straatnaam, huisnummer, postcode, plaats: Address
     - type: hoofdvestiging, nevenvestiging, rechtspersoon
+    - prefetch: Warm the basisprofielen of the top hits in the background
 
     Test KVK numbers: 68750110, 69599068, 90003942, 24330087
     """
@@ -414,6 +457,10 @@ async def kvk_search(
         per_pagina=resultatenPerPagina,
     )
 
+    prefetching = 0
+    if prefetch:
+        prefetching = client.prefetch_basisprofielen(r.kvkNummer for r in result.resultaten)
+
     return {
         "pagina": result.pagina,
         "resultatenPerPagina": result.resultatenPerPagina,
@@ -432,6 +479,7 @@ async def kvk_search(
             }
             for r in result.resultaten
         ],
+        "prefetching": prefetching,
     }
 
 
@@ -500,6 +548,7 @@ async def kvk_bedrijf_details(kvk_nummer: str):
 async def kvk_vakmensen(
     plaats: Optional[str] = None,
     vakgebied: Optional[str] = None,
+    sbi_code: Optional[str] = None,
 ):
     """
     Search for vakmensen (contractors) in KVK
@@ -507,6 +556,7 @@ async def kvk_vakmensen(
     Convenience endpoint for finding contractors by:
     - plaats: Location (gemeente)
     - vakgebied: Trade category (loodgieter, elektra, schilder, timmerman, etc.)
+    - sbi_code: SBI code or prefix (needs the local bulk store)
 
     Note: Uses KVK test data - search "test" to see results
     """
@@ -515,11 +565,13 @@ async def kvk_vakmensen(
     result = await client.search_vakmensen(
         plaats=plaats,
         vakgebied=vakgebied,
+        sbi_code=sbi_code,
     )
 
     return {
         "pagina": result.pagina,
         "totaal": result.totaal,
+        "rejected": result.rejected,
         "vakmensen": [
             {
                 "kvkNummer": r.kvkNummer,
@@ -548,92 +600,51 @@ async def kvk_scan_and_classify(
     1. Fetches company data from KVK
     2. Classifies each company into the 4-Ring system
     3. Optionally generates outreach messages
+
+    Numbers are processed concurrently within the KvK quota; the response
+    includes per-stage timing.
     """
-    db = get_db()
-    results = []
+    engine = KvKScanEngine(client=KvKClient(use_test=True))
+    response = await engine.scan(session, kvk_nummers, auto_generate_outreach)
 
-    client = KvKClient(use_test=True)
-    classifier = BrainClassifier()
-    generator = HookGenerator()
+    await session.commit()
+    return response
 
-    for kvk_nummer in kvk_nummers:
-        try:
-            # Get profile from KVK
-            profile = await client.get_basisprofiel(kvk_nummer)
-
-            # Create scraped data from KVK profile
-            text_content = f"""
-            Bedrijfsnaam: {profile.naam}
-            KvK-nummer: {profile.kvkNummer}
-            Registratiedatum: {profile.formeleRegistratiedatum}
-            Activiteiten: {', '.join(s.sbiOmschrijving for s in (profile.sbiActiviteiten or []))}
-            """
-
-            scraped = ScrapedData(
-                url=f"kvk://{kvk_nummer}",
-                text_content=text_content,
-                source_type="kvk",
-                metadata={"kvk_nummer": kvk_nummer},
-            )
-
-            # Classify
-            classification = await classifier.classify(scraped)
-
-            # Save profile
-            profile_data = {
-                "source_url": f"kvk://{kvk_nummer}",
-                "source_type": "kvk",
-                "name": profile.naam,
-                "kvk_number": kvk_nummer,
-                "ring": classification.ring.value,
-                "quality_score": classification.quality_score,
-                "confidence": classification.confidence,
-                "classification_reasoning": classification.reasoning,
-                "extracted_data": {
-                    "kvk_nummer": kvk_nummer,
-                    "sbi_activiteiten": [s.sbiCode for s in (profile.sbiActiviteiten or [])],
-                },
-                "raw_text": text_content,
-                "classified_at": datetime.utcnow(),
-            }
-            saved_profile = await db.save_profile(session, profile_data)
-
-            result = {
-                "kvkNummer": kvk_nummer,
-                "success": True,
-                "profile_id": str(saved_profile.id),
-                "ring": classification.ring.value,
-                "ring_name": ProfileRing(classification.ring).name,
-                "quality_score": classification.quality_score,
-            }
 
-            # Generate outreach
-            if auto_generate_outreach:
-                message = generator.generate(saved_profile.id, classification)
-                await db.save_outreach(session, {
-                    "profile_id": message.profile_id,
-                    "ring": message.ring.value,
-                    "channel": message.channel,
-                    "template_type": message.template_type,
-                    "subject": message.subject,
-                    "body": message.body,
-                    "personalization_tokens": message.personalization_tokens,
-                })
-                result["outreach_channel"] = message.channel
+@router.post("/kvk/sweep")
+async def kvk_sweep(
+    plaats: Optional[str] = None,
+    vakgebied: Optional[str] = None,
+    max_results: Optional[int] = None,
+    auto_generate_outreach: bool = True,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Search KVK across all result pages and scan every company found
+
+    Search pages are streamed straight into the scan pipeline (the next page
+    is fetched while the current one is being processed), so a sweep over
+    thousands of companies runs in bounded memory. Only a ring summary and
+    timing are returned, not the per-company results. If a search page keeps
+    failing, the companies scanned so far are still saved and ``source_error``
+    says why the sweep stopped early.
+    """
+    client = KvKClient(use_test=True)
+    # Search results may lack SBI codes; re-check them after the fetch
+    engine = KvKScanEngine(client=client, sbi_filter=client.sbi_filter)
 
-            results.append(result)
-            logger.info(f"KVK scan: {kvk_nummer} -> Ring {classification.ring.value}")
+    async def kvk_nummers():
+        seen = set()
+        async for item in client.iter_vakmensen(plaats=plaats, vakgebied=vakgebied, max_results=max_results):
+            if item.kvkNummer not in seen:
+                seen.add(item.kvkNummer)
+                yield item.kvkNummer
 
-        except Exception as e:
-            results.append({
-                "kvkNummer": kvk_nummer,
-                "success": False,
-                "error": str(e),
-            })
-            logger.error(f"KVK scan failed for {kvk_nummer}: {e}")
+    response = await engine.scan(session, kvk_nummers(), auto_generate_outreach, keep_results=False)
 
     await session.commit()
-    return {"scanned": len(results), "results": results}
+    response.pop("results")
+    return response
 
 
 # ============== Additional Scraper Endpoints ==============
@@ -807,16 +818,22 @@ async def get_config_status():
     """
     import os
     from ..modules.kvk import KvKClient
-    from ..modules.scrapers import GooglePlacesClient
+    from ..modules.scrapers import GooglePlacesClient, MarktplaatsScraper, WerkspotScraper
 
     kvk_client = KvKClient()
     google_client = GooglePlacesClient()
+    local_model = get_local_model()
 
     return {
         "kvk": {
             "mode": "TEST" if kvk_client.use_test else "PRODUCTION",
             "base_url": kvk_client.base_url,
             "api_key_set": bool(kvk_client.api_key),
+            "quota": kvk_client.quota.get_stats(),
+            "prefetch": get_prefetch_stats(),
+            "sbi_filter": get_sbi_filter().get_stats(),
+            "cache": kvk_client.cache.get_stats(),
+            "bulk": kvk_client.bulk.get_stats() if kvk_client.bulk else None,
         },
         "google_places": {
             "api_key_set": bool(google_client.api_key),
@@ -825,8 +842,19 @@ async def get_config_status():
         "anthropic": {
             "api_key_set": bool(os.getenv("ANTHROPIC_API_KEY")),
         },
+        "brain": {
+            "cache": get_classification_cache().get_stats(),
+            "dedup": get_dedup_index().get_stats(),
+            "cascade": {"enabled": settings.BRAIN_CASCADE_ENABLED, **get_cascade_stats().get_stats()},
+            "local_model": local_model.get_stats() if local_model is not None else {"loaded": False},
+            "scheduler": {"enabled": settings.BRAIN_SCHEDULER_ENABLED, **get_scheduler_stats()},
+            "breakers": get_breaker_stats(),
+            "hedging": {"enabled": settings.BRAIN_HEDGE_ENABLED, **get_hedge_policy().get_stats()},
+        },
         "scrapers": {
-            "marktplaats": {"enabled": True},
-            "werkspot": {"enabled": True},
+            "marktplaats": {"enabled": True, "extraction_paths": MarktplaatsScraper.path_stats},
+            "werkspot": {"enabled": True, "extraction_paths": WerkspotScraper.path_stats},
         },
+        "parsing": get_parse_executor().get_stats(),
+        "http_clients": get_http_clients().get_stats(),
     }
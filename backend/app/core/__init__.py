@@ -1,4 +1,14 @@
 """Core module"""
 from .config import settings, get_settings
+from .http_cache import ResponseCache, get_response_cache, is_not_challenge_page
+from .http_clients import HTTPClientRegistry, get_http_clients
 
-__all__ = ["settings", "get_settings"]
+__all__ = [
+    "settings",
+    "get_settings",
+    "ResponseCache",
+    "get_response_cache",
+    "is_not_challenge_page",
+    "HTTPClientRegistry",
+    "get_http_clients",
+]
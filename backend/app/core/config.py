@@ -23,9 +23,60 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
 
+    # Classification cache: in-process LRU + SQLite, keyed on text, prompt version and model
+    BRAIN_CACHE_ENABLED: bool = True
+    BRAIN_CACHE_PATH: str = ".cache/brain/classifications.sqlite"
+    BRAIN_CACHE_MEMORY_ITEMS: int = 10000
+    # Near-duplicate reuse: SimHash distance (of 64 bits) that counts as the same listing
+    BRAIN_DEDUP_ENABLED: bool = True
+    BRAIN_DEDUP_MAX_DISTANCE: int = 6
+    BRAIN_DEDUP_MAX_ITEMS: int = 100000
+    # Batched classification: up to N profiles per LLM request within a token budget
+    BRAIN_BATCH_MAX_SIZE: int = 10
+    BRAIN_BATCH_TOKEN_BUDGET: int = 6000  # profile text tokens per request
+    BRAIN_BATCH_CONCURRENCY: int = 4  # batch requests in flight
+    # Cascade: rule-based answer when its confidence clears the threshold, LLM otherwise
+    BRAIN_CASCADE_ENABLED: bool = False
+    BRAIN_CASCADE_THRESHOLD: float = 0.8
+    BRAIN_CASCADE_AUDIT_RATE: float = 0.0  # share of confident rule answers still sent to the LLM
+    # Local TF-IDF model trained on stored LLM labels (python -m app.modules.brain train)
+    BRAIN_LOCAL_MODEL_PATH: str = ".cache/brain/local_model.npz"
+    # LLM call scheduler: per-provider quotas, adaptive concurrency, Retry-After aware retries
+    BRAIN_SCHEDULER_ENABLED: bool = True
+    BRAIN_OPENAI_RPM: int = 500
+    BRAIN_OPENAI_TPM: int = 30000
+    BRAIN_ANTHROPIC_RPM: int = 50
+    BRAIN_ANTHROPIC_TPM: int = 50000
+    BRAIN_LLM_MAX_CONCURRENCY: int = 16  # ceiling for the adaptive limit, per provider
+    BRAIN_LLM_LATENCY_TARGET: float = 30.0  # seconds; slower calls shrink the limit
+    BRAIN_LLM_MAX_RETRIES: int = 4  # retries after 429/529/5xx, timeouts and connection errors
+    # Circuit breaker per provider; hedging starts the next provider when the current one is slow
+    BRAIN_BREAKER_FAILURES: int = 5  # consecutive failed calls that open the circuit
+    BRAIN_BREAKER_RESET_SECONDS: float = 30.0  # open time before a half-open probe
+    BRAIN_HEDGE_ENABLED: bool = False
+    BRAIN_HEDGE_QUANTILE: float = 0.95  # hedge delay = this latency quantile of the current provider
+    BRAIN_HEDGE_MIN_DELAY: float = 1.0
+    BRAIN_HEDGE_DEFAULT_DELAY: float = 10.0  # until enough latencies are recorded
+
     # KVK API
     KVK_API_KEY: Optional[str] = None
     KVK_USE_PRODUCTION: bool = False
+    KVK_RATE_PER_SECOND: float = 5.0  # API quota, enforced with a token bucket
+    KVK_RATE_BURST: float = 10.0
+    KVK_SCAN_FETCH_CONCURRENCY: int = 8
+    KVK_SCAN_CLASSIFY_CONCURRENCY: int = 4
+    KVK_SCAN_BATCH_SIZE: int = 50  # profiles per DB flush
+    KVK_PREFETCH_TOP_N: int = 5  # search hits warmed with ?prefetch=true
+    KVK_PREFETCH_RESERVE: float = 5.0  # quota tokens prefetch never touches
+    # KvK response cache: "auto" (Redis when installed, else disk), "redis", "disk", "memory"
+    KVK_CACHE_ENABLED: bool = True
+    KVK_CACHE_BACKEND: str = "auto"
+    KVK_CACHE_DIR: str = ".cache/kvk"
+    KVK_CACHE_MEMORY_ITEMS: int = 5000
+    KVK_CACHE_NEGATIVE_TTL: int = 24 * 3600  # seconds a 404 is remembered
+    # Local SQLite store built from a KvK bulk extract (python -m app.modules.kvk)
+    KVK_BULK_DB_PATH: Optional[str] = None
+    KVK_SBI_FILTER: bool = True  # drop non-trade SBI codes before fetch/classify
 
     # Google Places API
     GOOGLE_PLACES_API_KEY: Optional[str] = None
@@ -33,7 +84,32 @@ class Settings(BaseSettings):
     # Scraper Settings
     SCRAPER_DELAY_MIN: float = 1.0
     SCRAPER_DELAY_MAX: float = 3.0
-    SCRAPER_MAX_CONCURRENT: int = 5
+    SCRAPER_MAX_CONCURRENT: int = 5  # in-flight requests per scraper
+    SCRAPER_CATEGORY_CONCURRENCY: int = 3  # categories fanned out at once
+
+    # Browser Pool (RADAR)
+    BROWSER_POOL_MAX_CONTEXTS: int = 4
+    BROWSER_POOL_PAGES_PER_CONTEXT: int = 50
+    BROWSER_POOL_IDLE_TTL: float = 300.0  # seconds
+    BROWSER_POOL_MIN_FREE_MB: float = 512.0
+    BROWSER_POOL_HEALTH_INTERVAL: float = 30.0  # seconds
+
+    # Pooled HTTP clients (one per upstream, kept alive between requests)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    HTTP2_ENABLED: bool = True  # needs the h2 package
+
+    # HTTP response cache (shared by all scrapers)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_DIR: str = ".cache/http"
+    HTTP_CACHE_MAX_MB: int = 512
+
+    # HTML parsing executor: "process" or "thread"; 0 workers = auto
+    PARSE_EXECUTOR_MODE: str = "process"
+    PARSE_WORKERS: int = 0
+    # Card extraction backend: "auto" (lxml when installed), "lxml" or "soup"
+    HTML_EXTRACTION_BACKEND: str = "auto"
 
     # Classification Thresholds
     VAKMAN_MIN_YEARS: int = 5
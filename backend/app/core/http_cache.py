@@ -0,0 +1,302 @@
+"""On-disk HTTP response cache with conditional revalidation"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Optional, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import httpx
+from loguru import logger
+
+from .config import settings
+
+
+# Query parameters that carry credentials and must not end up in cache keys
+SECRET_PARAMS = {"key", "apikey", "api_key", "token", "access_token"}
+
+# Response headers worth keeping (the stored body is already decoded)
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+CACHE_STATUS_HEADER = "x-solvari-cache"
+
+# Bot-protection interstitials that are served with a 200 status
+CHALLENGE_MARKERS = (
+    "cf-challenge",
+    "challenge-platform",
+    "just a moment...",
+    "px-captcha",
+    "g-recaptcha",
+    "h-captcha",
+    "captcha-delivery",
+)
+
+
+def is_not_challenge_page(response: httpx.Response) -> bool:
+    """``cacheable`` predicate for HTML scrapes: reject bot-challenge pages"""
+    head = response.text[:20_000].lower()
+    return not any(marker in head for marker in CHALLENGE_MARKERS)
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for upstream GET responses
+
+    Entries are keyed by normalized URL + params and stored as a gzipped body
+    next to a small JSON metadata file with the ETag/Last-Modified validators.
+    Fresh entries (younger than the source TTL) are served without touching
+    the network; stale ones are revalidated with If-None-Match /
+    If-Modified-Since so an unchanged page costs a 304 instead of a download.
+    The directory is kept under ``max_bytes`` by evicting the least recently
+    used entries.
+    """
+
+    # Freshness per source in seconds
+    SOURCE_TTLS = {
+        "marktplaats": 6 * 3600,
+        "werkspot": 24 * 3600,
+        "google_places": 24 * 3600,
+        "radar": 24 * 3600,
+    }
+    DEFAULT_TTL = 3600
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.cache_dir = cache_dir or settings.HTTP_CACHE_DIR
+        self.max_bytes = max_bytes or settings.HTTP_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = settings.HTTP_CACHE_ENABLED if enabled is None else enabled
+        self.ttls = {**self.SOURCE_TTLS, **(ttls or {})}
+
+        # key -> [size_bytes, last_access]
+        self._index: Optional[Dict[str, list]] = None
+        self._total_bytes = 0
+        self._index_lock = asyncio.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+        }
+
+    # ---------- Keys ----------
+
+    @staticmethod
+    def normalize_url(url: str, params: Optional[dict] = None) -> str:
+        """Lowercase scheme/host, drop fragments and secrets, sort the query"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+        query = sorted((k, v) for k, v in query if k.lower() not in SECRET_PARAMS)
+        path = parts.path or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+    def key_for(self, url: str, params: Optional[dict] = None) -> str:
+        return hashlib.sha256(self.normalize_url(url, params).encode()).hexdigest()
+
+    def ttl_for(self, source: str) -> int:
+        return self.ttls.get(source, self.DEFAULT_TTL)
+
+    # ---------- Public API ----------
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        source: str = "default",
+        cacheable: Optional[Callable[[httpx.Response], bool]] = None,
+    ) -> httpx.Response:
+        """
+        Cached drop-in for ``client.get``
+
+        Returns an httpx.Response either way; cached responses carry an
+        ``x-solvari-cache: hit|revalidated`` header. Only 200 responses are
+        stored, and only if ``cacheable(response)`` agrees when given - use it
+        for APIs that report errors in a 200 body or for challenge pages.
+        """
+        if not self.enabled:
+            return await client.get(url, params=params, headers=headers)
+
+        key = self.key_for(url, params)
+        entry = await asyncio.to_thread(self._load, key)
+
+        if entry and time.time() - entry[0]["stored_at"] < self.ttl_for(source):
+            self.stats["hits"] += 1
+            await self._touch(key)
+            return self._to_response(entry, "hit")
+
+        request_headers = dict(headers or {})
+        if entry:
+            meta = entry[0]
+            if meta["headers"].get("etag"):
+                request_headers["If-None-Match"] = meta["headers"]["etag"]
+            if meta["headers"].get("last-modified"):
+                request_headers["If-Modified-Since"] = meta["headers"]["last-modified"]
+
+        response = await client.get(url, params=params, headers=request_headers)
+
+        if response.status_code == 304 and entry:
+            self.stats["revalidated"] += 1
+            meta, body = entry
+            meta["stored_at"] = time.time()
+            await asyncio.to_thread(self._write_meta, key, meta)
+            await self._touch(key)
+            return self._to_response((meta, body), "revalidated")
+
+        self.stats["misses"] += 1
+        if response.status_code == 200 and (cacheable is None or cacheable(response)):
+            await self._store(key, response)
+        return response
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "entries": len(self._index or {}),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    # ---------- Storage ----------
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".gz"
+
+    def _load(self, key: str) -> Optional[Tuple[dict, bytes]]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = gzip.decompress(f.read())
+            return meta, body
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def _write_meta(self, key: str, meta: dict):
+        meta_path, _ = self._paths(key)
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def _write(self, key: str, meta: dict, body: bytes) -> int:
+        meta_path, body_path = self._paths(key)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        compressed = gzip.compress(body, compresslevel=6)
+        tmp = body_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, body_path)
+        self._write_meta(key, meta)
+        return len(compressed)
+
+    def _delete(self, key: str):
+        for path in self._paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _scan(self) -> Dict[str, list]:
+        index = {}
+        if not os.path.isdir(self.cache_dir):
+            return index
+        for shard in os.listdir(self.cache_dir):
+            shard_dir = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".gz"):
+                    continue
+                stat = os.stat(os.path.join(shard_dir, name))
+                index[name[:-3]] = [stat.st_size, stat.st_mtime]
+        return index
+
+    async def _ensure_index(self):
+        async with self._index_lock:
+            if self._index is None:
+                self._index = await asyncio.to_thread(self._scan)
+                self._total_bytes = sum(size for size, _ in self._index.values())
+
+    async def _touch(self, key: str):
+        await self._ensure_index()
+        if key in self._index:
+            self._index[key][1] = time.time()
+        _, body_path = self._paths(key)
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    async def _store(self, key: str, response: httpx.Response):
+        await self._ensure_index()
+        meta = {
+            "url": str(response.url),
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+            "stored_at": time.time(),
+        }
+        try:
+            size = await asyncio.to_thread(self._write, key, meta, response.content)
+        except OSError as e:
+            logger.warning(f"HTTP cache write failed: {e}")
+            return
+
+        old = self._index.get(key)
+        if old:
+            self._total_bytes -= old[0]
+        self._index[key] = [size, time.time()]
+        self._total_bytes += size
+        self.stats["stored"] += 1
+        await self._evict()
+
+    async def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append(key)
+            self._total_bytes -= size
+            del self._index[key]
+        for key in victims:
+            await asyncio.to_thread(self._delete, key)
+        self.stats["evicted"] += len(victims)
+
+    @staticmethod
+    def _to_response(entry: Tuple[dict, bytes], status: str) -> httpx.Response:
+        meta, body = entry
+        headers = {**meta["headers"], CACHE_STATUS_HEADER: status}
+        return httpx.Response(
+            status_code=meta["status"],
+            headers=headers,
+            content=body,
+            request=httpx.Request("GET", meta["url"]),
+        )
+
+
+# Global response cache instance
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,160 @@
+"""Shared, pooled HTTP clients per upstream"""
+import weakref
+from typing import Dict, Optional
+import httpx
+from loguru import logger
+
+from .config import settings
+
+H2_AVAILABLE = False
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    pass
+
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+# Client options per upstream
+UPSTREAMS: Dict[str, dict] = {
+    "kvk": {"timeout": 30.0, "headers": {"Accept": "application/json"}},
+    "google_places": {"timeout": 30.0},
+    "marktplaats": {"timeout": 30.0, "headers": BROWSER_HEADERS, "follow_redirects": True},
+    "werkspot": {"timeout": 30.0, "headers": BROWSER_HEADERS, "follow_redirects": True},
+    "radar": {"timeout": 15.0, "headers": BROWSER_HEADERS, "follow_redirects": True},
+}
+
+
+class HTTPClientRegistry:
+    """
+    One long-lived ``httpx.AsyncClient`` per upstream
+
+    Clients keep connections alive between calls so repeated requests to the
+    same API skip the TCP + TLS handshake, and negotiate HTTP/2 when the
+    ``h2`` package is installed. Event hooks count requests and whether each
+    response came over a new or a reused connection.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive or settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=keepalive_expiry or settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        wants_http2 = settings.HTTP2_ENABLED if http2 is None else http2
+        self.http2 = wants_http2 and H2_AVAILABLE
+        if wants_http2 and not H2_AVAILABLE:
+            logger.info("h2 not installed - HTTP clients use HTTP/1.1")
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._stats: Dict[str, dict] = {}
+        self._seen_streams: Dict[str, "weakref.WeakSet"] = {}
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """Pooled client for ``upstream`` (created on first use)"""
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._create(upstream)
+            self._clients[upstream] = client
+        return client
+
+    def _create(self, upstream: str) -> httpx.AsyncClient:
+        options = UPSTREAMS.get(upstream, {"timeout": 30.0})
+        self._stats.setdefault(upstream, {
+            "requests": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+            "http_versions": {},
+        })
+        self._seen_streams[upstream] = weakref.WeakSet()
+
+        async def on_request(request: httpx.Request):
+            self._stats[upstream]["requests"] += 1
+
+        async def on_response(response: httpx.Response):
+            self._record_response(upstream, response)
+
+        return httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            event_hooks={"request": [on_request], "response": [on_response]},
+            **options,
+        )
+
+    def _record_response(self, upstream: str, response: httpx.Response):
+        stats = self._stats[upstream]
+        versions = stats["http_versions"]
+        versions[response.http_version] = versions.get(response.http_version, 0) + 1
+
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        seen = self._seen_streams[upstream]
+        try:
+            if stream in seen:
+                stats["reused_connections"] += 1
+            else:
+                seen.add(stream)
+                stats["new_connections"] += 1
+        except TypeError:
+            pass  # stream type without weakref support
+
+    def get_stats(self) -> dict:
+        """Per-upstream request counts and connection reuse"""
+        upstreams = {}
+        for name, stats in self._stats.items():
+            connections = stats["new_connections"] + stats["reused_connections"]
+            upstreams[name] = {
+                **stats,
+                "reuse_ratio": round(stats["reused_connections"] / connections, 3) if connections else 0.0,
+            }
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "upstreams": upstreams,
+        }
+
+    async def aclose(self):
+        """Close every pooled client"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+# Global client registry instance
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_clients() -> HTTPClientRegistry:
+    """Get the global HTTP client registry"""
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
+
+
+def init_http_clients() -> HTTPClientRegistry:
+    """Create the registry on startup"""
+    registry = get_http_clients()
+    logger.info(f"HTTP client registry ready (http2={registry.http2})")
+    return registry
+
+
+async def close_http_clients():
+    """Close pooled connections on shutdown"""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
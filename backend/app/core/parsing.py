@@ -0,0 +1,136 @@
+"""Off-loop HTML parsing executor shared by all scrapers"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple, TypeVar
+from loguru import logger
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+def _timed_call(func: Callable[..., T], args: tuple) -> Tuple[T, float]:
+    """Run ``func`` in the worker and report its own CPU-side duration"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class ParseExecutor:
+    """
+    Runs synchronous parse functions (BeautifulSoup & co.) off the event loop
+
+    ``mode="process"`` uses a process pool, which sidesteps the GIL for the
+    pure-Python tree builders; ``mode="thread"`` is cheaper to start and fine
+    for parsers that release the GIL. Functions passed to a process pool must
+    be picklable: module-level functions, static- or classmethods.
+    """
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None):
+        self.mode = (mode or settings.PARSE_EXECUTOR_MODE).lower()
+        self.workers = workers or settings.PARSE_WORKERS or min(4, os.cpu_count() or 1)
+        self._executor: Optional[Executor] = None
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "parse_seconds_total": 0.0,
+            "parse_seconds_max": 0.0,
+            "wait_seconds_total": 0.0,
+        }
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="parse"
+                )
+            logger.info(f"Parse executor started ({self.mode}, {self.workers} workers)")
+        return self._executor
+
+    async def parse(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        self.stats["submitted"] += 1
+        self._pending += 1
+        submitted_at = time.perf_counter()
+
+        try:
+            try:
+                result, duration = await loop.run_in_executor(
+                    self._get_executor(), _timed_call, func, args
+                )
+            except BrokenProcessPool:
+                logger.warning("Parse process pool broke - restarting it")
+                self._executor = None
+                result, duration = await loop.run_in_executor(
+                    self._get_executor(), _timed_call, func, args
+                )
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        elapsed = time.perf_counter() - submitted_at
+        self.stats["completed"] += 1
+        self.stats["parse_seconds_total"] += duration
+        self.stats["parse_seconds_max"] = max(self.stats["parse_seconds_max"], duration)
+        self.stats["wait_seconds_total"] += max(0.0, elapsed - duration)
+        return result
+
+    @property
+    def queue_depth(self) -> int:
+        """Parses submitted but not yet picked up by a worker"""
+        return max(0, self._pending - self.workers)
+
+    def get_stats(self) -> dict:
+        """Queue depth and parse-time metrics"""
+        completed = self.stats["completed"] or 1
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "workers": self.workers,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "parse_ms_avg": round(self.stats["parse_seconds_total"] / completed * 1000, 3),
+            "wait_ms_avg": round(self.stats["wait_seconds_total"] / completed * 1000, 3),
+        }
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global parse executor instance
+_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Get the global parse executor instance"""
+    global _executor
+    if _executor is None:
+        _executor = ParseExecutor()
+    return _executor
+
+
+async def parse(func: Callable[..., T], *args: Any) -> T:
+    """Parse off the event loop using the global executor"""
+    return await get_parse_executor().parse(func, *args)
+
+
+def shutdown_parse_executor():
+    """Stop the global parse executor on shutdown"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,82 @@
+"""Async token bucket for upstream quotas"""
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, bursts up to ``capacity``
+
+    ``acquire`` waits until enough tokens are available. Waiters are served
+    in arrival order because the refill-and-take happens under a lock.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Sustained tokens per second
+            capacity: Burst size (default: one second worth of tokens, min 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        self.stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "wait_seconds_total": 0.0,
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available"""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if they are available right now"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            self.stats["acquired"] += 1
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until the bucket has refilled enough
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                delay = (tokens - self._tokens) / self.rate
+                self.stats["throttled"] += 1
+                await asyncio.sleep(delay)
+                waited = delay
+                self._refill()
+            self._tokens -= tokens
+
+        self.stats["acquired"] += 1
+        self.stats["wait_seconds_total"] += waited
+        return waited
+
+    def get_stats(self) -> dict:
+        """Acquisition counters and current fill"""
+        return {
+            **self.stats,
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "tokens_available": round(self.tokens, 2),
+        }
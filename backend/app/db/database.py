@@ -52,6 +52,14 @@ class Database:
         logger.info(f"📊 Saved profile: {profile.id}")
         return profile
 
+    async def save_profiles(self, session: AsyncSession, profiles_data: List[dict]) -> List[ProfileDB]:
+        """Save several profiles with a single flush"""
+        profiles = [ProfileDB(**data) for data in profiles_data]
+        session.add_all(profiles)
+        await session.flush()
+        logger.info(f"📊 Saved {len(profiles)} profiles")
+        return profiles
+
     async def get_profile(self, session: AsyncSession, profile_id: UUID) -> Optional[ProfileDB]:
         """Get a profile by ID"""
         result = await session.execute(
@@ -114,6 +122,15 @@ class Database:
         await session.flush()
         return outreach
 
+    async def save_outreach_batch(
+        self, session: AsyncSession, outreach_data: List[dict]
+    ) -> List[OutreachDB]:
+        """Save several outreach messages with a single flush"""
+        messages = [OutreachDB(**data) for data in outreach_data]
+        session.add_all(messages)
+        await session.flush()
+        return messages
+
     async def get_outreach_for_profile(
         self, session: AsyncSession, profile_id: UUID
     ) -> List[OutreachDB]:
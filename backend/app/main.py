@@ -11,6 +11,11 @@ import sys
 from .core.config import settings
 from .api import router
 from .db import init_database
+from .core.http_clients import init_http_clients, close_http_clients
+from .core.parsing import shutdown_parse_executor
+from .modules.radar import init_browser_pool, close_browser_pool, close_tiered_fetcher
+from .modules.kvk import close_kvk_cache, close_kvk_bulk_store
+from .modules.brain import close_classification_cache
 
 
 # Configure logging
@@ -35,6 +40,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Database initialization skipped: {e}")
 
+    init_http_clients()
+
+    try:
+        await init_browser_pool()
+        logger.info("✅ Browser pool ready")
+    except Exception as e:
+        logger.warning(f"⚠️ Browser pool startup skipped: {e}")
+
     logger.info("🚀 SOLVARI RADAR ONLINE")
     logger.info("=" * 50)
     logger.info("  🔴 Ring 1: Vakman Detection Active")
@@ -47,6 +60,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("⟁ SOLVARI RADAR SHUTTING DOWN...")
+    await close_browser_pool()
+    await close_tiered_fetcher()
+    await close_kvk_cache()
+    close_kvk_bulk_store()
+    close_classification_cache()
+    await close_http_clients()
+    shutdown_parse_executor()
 
 
 # Create FastAPI app
@@ -1,5 +1,57 @@
 """BRAIN Module - The Intelligence of Solvari"""
+from .breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    HedgePolicy,
+    get_breaker_stats,
+    get_circuit_breaker,
+    get_hedge_policy,
+)
+from .cache import ClassificationCache, get_classification_cache, close_classification_cache
+from .cascade import CascadeStats, get_cascade_stats
 from .classifier import BrainClassifier
-from .prompts import CLASSIFICATION_PROMPT, EXTRACTION_PROMPT
+from .dedup import SimHashIndex, NearDuplicate, simhash, get_dedup_index
+from .local_model import LocalModel, LocalPrediction, get_local_model
+from .prompts import (
+    CLASSIFICATION_SYSTEM_PROMPT,
+    CLASSIFICATION_PROFILE_PROMPT,
+    EXTRACTION_PROMPT,
+    PROMPT_VERSION,
+)
+from .rules import Rule, RuleEngine, RULES, get_rule_engine
+from .scheduler import ProviderScheduler, get_provider_scheduler, get_scheduler_stats
 
-__all__ = ["BrainClassifier", "CLASSIFICATION_PROMPT", "EXTRACTION_PROMPT"]
+__all__ = [
+    "BrainClassifier",
+    "ClassificationCache",
+    "get_classification_cache",
+    "close_classification_cache",
+    "CascadeStats",
+    "get_cascade_stats",
+    "SimHashIndex",
+    "NearDuplicate",
+    "simhash",
+    "get_dedup_index",
+    "LocalModel",
+    "LocalPrediction",
+    "get_local_model",
+    "Rule",
+    "RuleEngine",
+    "RULES",
+    "get_rule_engine",
+    "ProviderScheduler",
+    "get_provider_scheduler",
+    "get_scheduler_stats",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "HedgePolicy",
+    "get_breaker_stats",
+    "get_circuit_breaker",
+    "get_hedge_policy",
+    "CLASSIFICATION_SYSTEM_PROMPT",
+    "CLASSIFICATION_PROFILE_PROMPT",
+    "EXTRACTION_PROMPT",
+    "PROMPT_VERSION",
+]
@@ -0,0 +1,53 @@
+"""BRAIN command line: python -m app.modules.brain train [--out path]"""
+import argparse
+import asyncio
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from ...core.config import settings
+from ...db.database import get_db
+from ...db.models import ProfileDB
+from .local_model import DEFAULT_FEATURES, LocalModel
+
+# Reasoning prefixes of labels that did not come from an LLM
+NON_LLM_REASONING = ("Rule-based classification", "Local model classification")
+
+
+async def load_labelled_profiles(limit: Optional[int] = None) -> List[Tuple[str, int, float]]:
+    """(raw_text, ring, quality_score) of every LLM-classified profile"""
+    reasoning = func.coalesce(ProfileDB.classification_reasoning, "")
+    query = select(ProfileDB.raw_text, ProfileDB.ring, ProfileDB.quality_score).where(
+        ProfileDB.raw_text.is_not(None),
+        *(~reasoning.startswith(prefix) for prefix in NON_LLM_REASONING),
+    )
+    if limit:
+        query = query.limit(limit)
+
+    db = get_db()
+    async with db.async_session() as session:
+        rows = (await session.execute(query)).all()
+    await db.engine.dispose()
+    return [(text, ring, quality or 0.0) for text, ring, quality in rows]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train the local classifier on LLM-labelled profiles")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    trainer = subcommands.add_parser("train", help="Fit and save the local model")
+    trainer.add_argument("--out", default=settings.BRAIN_LOCAL_MODEL_PATH)
+    trainer.add_argument("--limit", type=int, default=None)
+    trainer.add_argument("--features", type=int, default=DEFAULT_FEATURES)
+    trainer.add_argument("--epochs", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rows = asyncio.run(load_labelled_profiles(args.limit))
+    print(f"{len(rows)} labelled profiles")
+    texts, rings, quality = zip(*rows) if rows else ((), (), ())
+    model = LocalModel.train(texts, rings, quality, n_features=args.features, epochs=args.epochs)
+    model.save(args.out)
+    print(f"{args.out}: {model.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""BRAIN - Circuit breakers and hedge delays for LLM providers"""
+import time
+from collections import Counter, deque
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from loguru import logger
+
+from ...core.config import settings
+from .scheduler import NETWORK_ERRORS, THROTTLE_STATUSES
+
+T = TypeVar("T")
+
+# Latencies kept per call kind, and needed before the quantile is trusted
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+def is_availability_failure(error: Exception) -> bool:
+    """
+    Whether an error says the provider is unavailable
+
+    Only timeouts, connection errors, 408, 429/529 and 5xx count. Client
+    errors (400/401/404/422, e.g. an oversized prompt) are about the
+    request, not the provider, and must not open the circuit for everyone.
+    """
+    if isinstance(error, NETWORK_ERRORS):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status == 408 or status in THROTTLE_STATUSES or status >= 500)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one provider
+
+    ``failure_threshold`` consecutive availability failures (see
+    is_availability_failure) open the circuit: calls are
+    refused at once (CircuitOpenError) so callers move on to the next
+    provider without waiting out another failure. After ``reset_timeout``
+    a single probe call is let through (half-open); its success closes the
+    circuit, its failure re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            name: Provider name (for logs and metrics)
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds open before a half-open probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.BRAIN_BREAKER_FAILURES
+        self.reset_timeout = settings.BRAIN_BREAKER_RESET_SECONDS if reset_timeout is None else reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        self.transitions: Counter = Counter()
+        self.stats = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "short_circuited": 0,
+        }
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (takes the probe slot when half-open)"""
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.stats["short_circuited"] += 1
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probing:
+                self.stats["short_circuited"] += 1
+                return False
+            self._probing = True
+        self.stats["calls"] += 1
+        return True
+
+    def record_success(self):
+        self.stats["successes"] += 1
+        self.consecutive_failures = 0
+        self._probing = False
+        if self.state is not CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state is CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state is not CircuitState.OPEN:
+                self._transition(CircuitState.OPEN)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` through the breaker
+
+        A cancelled call (e.g. the losing side of a hedge) and a client
+        error count as neither success nor failure.
+
+        Raises:
+            CircuitOpenError: When the circuit refuses the call
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is {self.state.value}")
+        try:
+            result = await fn()
+        except Exception as e:
+            if is_availability_failure(e):
+                self.record_failure()
+            else:
+                self._probing = False
+            raise
+        except BaseException:
+            self._probing = False
+            raise
+        self.record_success()
+        return result
+
+    def _transition(self, state: CircuitState):
+        logger.warning(f"🧠 {self.name} circuit {self.state.value} -> {state.value}")
+        self.transitions[f"{self.state.value}->{state.value}"] += 1
+        self.state = state
+
+    def get_stats(self) -> dict:
+        """Current state, call counters and state transition counts"""
+        return {
+            **self.stats,
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "open_seconds_left": round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 2)
+            if self.state is CircuitState.OPEN else 0.0,
+            "transitions": dict(self.transitions),
+        }
+
+
+class HedgePolicy:
+    """
+    When to start the next provider while one is still in flight
+
+    The delay is a latency quantile (default p95) of successful calls of
+    the same provider and kind, so roughly one call in twenty gets hedged
+    in normal operation and every call is bounded by about that quantile
+    plus the secondary's latency during an incident.
+    """
+
+    def __init__(
+        self,
+        quantile: Optional[float] = None,
+        min_delay: Optional[float] = None,
+        default_delay: Optional[float] = None,
+    ):
+        """
+        Args:
+            quantile: Latency quantile used as the hedge delay
+            min_delay: Floor for the delay (seconds)
+            default_delay: Delay until MIN_LATENCY_SAMPLES latencies are recorded
+        """
+        self.quantile = quantile or settings.BRAIN_HEDGE_QUANTILE
+        self.min_delay = settings.BRAIN_HEDGE_MIN_DELAY if min_delay is None else min_delay
+        self.default_delay = settings.BRAIN_HEDGE_DEFAULT_DELAY if default_delay is None else default_delay
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.stats = {
+            "hedged": 0,  # next provider started before the current one answered
+            "hedge_wins": 0,  # ... and answered first
+        }
+
+    def record(self, key: str, seconds: float):
+        """Record the latency of a successful call (key: "<provider>:<kind>")"""
+        self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def delay(self, key: str) -> float:
+        """Seconds to wait on ``key`` before hedging"""
+        samples = self._latencies.get(key)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return self.default_delay
+        ordered = sorted(samples)
+        return max(self.min_delay, ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))])
+
+    def get_stats(self) -> dict:
+        """Hedge counters and the current delay per provider and call kind"""
+        return {**self.stats, "delays": {key: round(self.delay(key), 3) for key in self._latencies}}
+
+
+# Global breakers, one per provider, and the shared hedge policy
+_breakers: Dict[str, CircuitBreaker] = {}
+_hedge_policy: Optional[HedgePolicy] = None
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for ``name``"""
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker(name)
+    return _breakers[name]
+
+
+def get_breaker_stats() -> Dict[str, dict]:
+    """Stats of every breaker created so far"""
+    return {name: breaker.get_stats() for name, breaker in _breakers.items()}
+
+
+def get_hedge_policy() -> HedgePolicy:
+    """Get the shared hedge policy"""
+    global _hedge_policy
+    if _hedge_policy is None:
+        _hedge_policy = HedgePolicy()
+    return _hedge_policy
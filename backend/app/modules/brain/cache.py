@@ -0,0 +1,196 @@
+"""BRAIN - Classification cache keyed by normalized content"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+from loguru import logger
+
+from ...core.config import settings
+from ...models import ProfileClassification
+from .prompts import PROMPT_VERSION
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-fold, lowercase and collapse whitespace so trivial reposts hash equal"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def content_hash(text: str) -> str:
+    """sha256 of the normalized text"""
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+class ClassificationCache:
+    """
+    Two-tier cache for LLM classifications
+
+    Keys are sha256(content hash, PROMPT_VERSION, model), so changing the
+    prompt or the model never serves stale answers. Lookups go in-process
+    LRU -> SQLite file; only the SQLite tier touches a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_items: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        prompt_version: str = PROMPT_VERSION,
+    ):
+        """
+        Args:
+            path: SQLite file for the persistent tier (None/"" = memory only)
+            memory_items: Size of the in-process LRU
+            enabled: Turn the cache off entirely
+            prompt_version: Prompt version folded into every key
+        """
+        self.path = settings.BRAIN_CACHE_PATH if path is None else path
+        self.memory_items = memory_items or settings.BRAIN_CACHE_MEMORY_ITEMS
+        self.enabled = settings.BRAIN_CACHE_ENABLED if enabled is None else enabled
+        self.prompt_version = prompt_version
+
+        self._memory: "OrderedDict[str, ProfileClassification]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "errors": 0,
+        }
+
+    def key_for(self, text: str, model: str) -> str:
+        return hashlib.sha256(
+            f"{content_hash(text)}|{self.prompt_version}|{model}".encode()
+        ).hexdigest()
+
+    async def get(self, text: str, model: str) -> Optional[ProfileClassification]:
+        """Cached classification of ``text`` by ``model``, or None"""
+        if not self.enabled:
+            return None
+        key = self.key_for(text, model)
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return cached.model_copy(deep=True)
+
+        if self.path:
+            row = await self._run(self._read, key)
+            if row is not None:
+                cached = ProfileClassification(**json.loads(row))
+                self._remember(key, cached)
+                self.stats["persistent_hits"] += 1
+                return cached.model_copy(deep=True)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, text: str, model: str, classification: ProfileClassification):
+        """Store a classification in both tiers"""
+        if not self.enabled:
+            return
+        key = self.key_for(text, model)
+        self._remember(key, classification.model_copy(deep=True))
+        if self.path:
+            await self._run(self._write, key, model, classification.model_dump_json())
+        self.stats["stored"] += 1
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters per tier"""
+        hits = self.stats["memory_hits"] + self.stats["persistent_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "prompt_version": self.prompt_version,
+            "memory_entries": len(self._memory),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- Tiers ----------
+
+    def _remember(self, key: str, classification: ProfileClassification):
+        self._memory[key] = classification
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    async def _run(self, func, *args):
+        try:
+            return await asyncio.to_thread(func, *args)
+        except (sqlite3.Error, OSError) as e:
+            self.stats["errors"] += 1
+            logger.warning(f"🧠 BRAIN cache: persistent tier error: {e}")
+            return None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(SCHEMA)
+        return self._conn
+
+    def _read(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT result FROM classifications WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, key: str, model: str, result: str):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO classifications VALUES (?, ?, ?, ?, ?)",
+                    (key, model, self.prompt_version, result, time.time()),
+                )
+
+
+# Global classification cache instance
+_cache: Optional[ClassificationCache] = None
+
+
+def get_classification_cache() -> ClassificationCache:
+    """Get the global classification cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = ClassificationCache()
+    return _cache
+
+
+def close_classification_cache():
+    """Close the global classification cache on shutdown"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,74 @@
+"""BRAIN - Tier counters for the rules -> LLM classification cascade"""
+from typing import Dict, List, Optional
+
+from ...core.config import settings
+from ...models import ProfileClassification
+
+# Lower edges of the rule-confidence bands agreement is reported in
+CONFIDENCE_BANDS = (0.0, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+def confidence_band(confidence: float) -> float:
+    """Lower edge of the band ``confidence`` falls in"""
+    return max((band for band in CONFIDENCE_BANDS if confidence >= band), default=0.0)
+
+
+class CascadeStats:
+    """
+    How often each cascade tier answered, and how well the rules agree with the LLM
+
+    Every escalated or audited profile yields a (rule guess, LLM answer)
+    pair. Agreement per rule-confidence band shows where the threshold can
+    go: a band whose rings match the LLM ~always is safe to answer locally.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Args:
+            threshold: Rule confidence at which the LLM is skipped
+        """
+        self.threshold = settings.BRAIN_CASCADE_THRESHOLD if threshold is None else threshold
+        self.stats = {
+            "rules": 0,  # answered by the rules tier
+            "escalated": 0,  # rules unsure, sent to the LLM
+            "audited": 0,  # rules sure, sent to the LLM anyway to measure agreement
+            "llm_unavailable": 0,  # escalated but every provider failed
+        }
+        self._agreement: Dict[float, List[int]] = {band: [0, 0] for band in CONFIDENCE_BANDS}
+
+    def record(self, tier: str):
+        self.stats[tier] += 1
+
+    def record_agreement(self, rules: ProfileClassification, llm: ProfileClassification):
+        """Compare the rule guess with the LLM answer for the same profile"""
+        counts = self._agreement[confidence_band(rules.confidence)]
+        counts[0] += 1
+        counts[1] += rules.ring == llm.ring
+
+    def get_stats(self) -> dict:
+        """Tier hit rates and rule/LLM agreement per confidence band"""
+        total = self.stats["rules"] + self.stats["escalated"] + self.stats["audited"]
+        compared = sum(c for c, _ in self._agreement.values())
+        agreed = sum(a for _, a in self._agreement.values())
+        return {
+            **self.stats,
+            "threshold": self.threshold,
+            "rules_ratio": round(self.stats["rules"] / total, 3) if total else 0.0,
+            "agreement": round(agreed / compared, 3) if compared else None,
+            "agreement_by_confidence": {
+                f"{band:.1f}": {"compared": c, "agreement": round(a / c, 3)}
+                for band, (c, a) in self._agreement.items() if c
+            },
+        }
+
+
+# Global cascade counters (classifiers are created per request)
+_stats: Optional[CascadeStats] = None
+
+
+def get_cascade_stats() -> CascadeStats:
+    """Get the global cascade counters"""
+    global _stats
+    if _stats is None:
+        _stats = CascadeStats()
+    return _stats
@@ -1,12 +1,38 @@
 """BRAIN - AI-powered profile classifier"""
+import asyncio
 import json
+import random
 import re
-from typing import Optional
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 from loguru import logger
 
 from ...models import ScrapedData, ProfileClassification, ProfileRing
 from ...core.config import settings
-from .prompts import CLASSIFICATION_PROMPT
+from .breaker import CircuitOpenError, HedgePolicy, get_circuit_breaker, get_hedge_policy
+from .cache import ClassificationCache, get_classification_cache
+from .cascade import CascadeStats, get_cascade_stats
+from .dedup import NearDuplicate, SimHashIndex, get_dedup_index
+from .prompts import (
+    BATCH_CLASSIFICATION_PROFILES_PROMPT,
+    BATCH_CLASSIFICATION_SYSTEM_PROMPT,
+    BATCH_PROFILE_TEMPLATE,
+    CLASSIFICATION_PROFILE_PROMPT,
+    CLASSIFICATION_SYSTEM_PROMPT,
+)
+from .local_model import LocalModel, get_local_model
+from .rules import DEFAULT_VERDICT, RING_THRESHOLDS, get_rule_engine
+from .scheduler import get_provider_scheduler
+
+# Outreach hook per ring for classifications that do not come from an LLM
+RING_HOOKS = {ring: hook for ring, _, _, hook in RING_THRESHOLDS}
+
+# Rough size of one token of Dutch profile text, for batch packing
+CHARS_PER_TOKEN = 4
+# Output tokens reserved per profile in a batch answer
+OUTPUT_TOKENS_PER_PROFILE = 350
+# Completion ceiling assumed for quota purposes when a call sets none
+DEFAULT_OUTPUT_TOKENS = 1024
 
 # AI imports with fallback
 try:
@@ -22,6 +48,10 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
 class BrainClassifier:
     """
     🧠 BRAIN: The Intelligence of Solvari
@@ -30,30 +60,78 @@ class BrainClassifier:
     and generates quality scores using LLM analysis.
     """
 
-    def __init__(self, provider: str = "auto"):
+    OPENAI_MODEL = "gpt-4o"
+    ANTHROPIC_MODEL = "claude-3-haiku-20240307"
+
+    # Templated sources whose texts differ only in names/numbers are never
+    # treated as near-duplicates of each other
+    DEDUP_SKIP_SOURCES = {"kvk"}
+
+    def __init__(
+        self,
+        provider: str = "auto",
+        cache: Optional[ClassificationCache] = None,
+        dedup: Optional[SimHashIndex] = None,
+        cascade: Optional[bool] = None,
+        cascade_stats: Optional[CascadeStats] = None,
+        local_model: Optional[LocalModel] = None,
+        hedge: Optional[bool] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ):
         """
         Initialize the classifier
 
         Args:
-            provider: "openai", "anthropic", or "auto" (tries both)
+            provider: "openai", "anthropic", "auto" (tries both) or "local" (no LLM)
+            cache: LLM result cache (default: the shared classification cache)
+            dedup: Near-duplicate index (default: the shared index when BRAIN_DEDUP_ENABLED)
+            cascade: Answer confident cases with the rules (default: BRAIN_CASCADE_ENABLED)
+            cascade_stats: Tier counters (default: the shared counters)
+            local_model: Trained offline model (default: the BRAIN_LOCAL_MODEL_PATH artifact)
+            hedge: Start the next provider when the current one is slow (default: BRAIN_HEDGE_ENABLED)
+            hedge_policy: Hedge delays and counters (default: the shared policy)
         """
         self.provider = provider
+        self.cache = cache or get_classification_cache()
+        self.dedup = dedup or (get_dedup_index() if settings.BRAIN_DEDUP_ENABLED else None)
+        self.cascade = settings.BRAIN_CASCADE_ENABLED if cascade is None else cascade
+        self.cascade_stats = cascade_stats or get_cascade_stats()
+        self.rules = get_rule_engine()
+        self.local_model = local_model or get_local_model()
+        self.hedge = settings.BRAIN_HEDGE_ENABLED if hedge is None else hedge
+        self.hedge_policy = hedge_policy or get_hedge_policy()
+        # Batch size ceiling: halves when a batch answer does not line up, creeps back on success
+        self._batch_limit = settings.BRAIN_BATCH_MAX_SIZE
+        # Prompt tokens per provider, split by what the provider served from its prompt cache
+        self.token_stats: Dict[str, Dict[str, int]] = {}
+        self.batch_stats = {
+            "batches": 0,
+            "batched_profiles": 0,
+            "served_without_llm": 0,
+            "fallback_profiles": 0,
+        }
         self._openai_client: Optional[AsyncOpenAI] = None
         self._anthropic_client: Optional[AsyncAnthropic] = None
         self._setup_clients()
 
     def _setup_clients(self):
         """Initialize AI clients based on available API keys"""
+        # The scheduler retries 429s, 5xx, timeouts and dropped connections itself;
+        # SDK retries would hide them from it
+        max_retries = 0 if settings.BRAIN_SCHEDULER_ENABLED else 2
         if OPENAI_AVAILABLE and settings.OPENAI_API_KEY:
-            self._openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=max_retries)
             logger.info("🧠 BRAIN: OpenAI client initialized")
 
         if ANTHROPIC_AVAILABLE and settings.ANTHROPIC_API_KEY:
-            self._anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+            self._anthropic_client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, max_retries=max_retries)
             logger.info("🧠 BRAIN: Anthropic client initialized")
 
-        if not self._openai_client and not self._anthropic_client:
-            logger.warning("🧠 BRAIN: No AI clients available - using rule-based fallback")
+        if self.provider == "local" or (not self._openai_client and not self._anthropic_client):
+            if self.local_model is not None:
+                logger.info("🧠 BRAIN: Using the local model")
+            else:
+                logger.warning("🧠 BRAIN: No AI clients or local model available - using rule-based fallback")
 
     async def classify(self, scraped_data: ScrapedData) -> ProfileClassification:
         """
@@ -66,54 +144,341 @@ class BrainClassifier:
             ProfileClassification with ring, score, and details
         """
         logger.info(f"🧠 Classifying profile from: {scraped_data.url}")
+        providers = self._providers()
+
+        known = await self._lookup(scraped_data, providers)
+        if known is not None:
+            return known
 
+        rules, final = self._cascade(scraped_data) if providers else (None, False)
+        if final:
+            return self._remember(scraped_data, rules, reusable=False)
+        return await self._escalate(scraped_data, providers, rules)
+
+    async def _escalate(
+        self, data: ScrapedData, providers: list, rules: Optional[ProfileClassification] = None
+    ) -> ProfileClassification:
+        """LLM classification; local model, then rules, when every provider fails"""
         # Try AI classification first
-        if self._openai_client and (self.provider in ["openai", "auto"]):
-            try:
-                return await self._classify_with_openai(scraped_data)
-            except Exception as e:
-                logger.error(f"OpenAI classification failed: {e}")
+        answer = await self._first_answer(providers, "single", lambda provider: provider[2](data))
+        if answer is not None:
+            (_, model, _, _), classification = answer
+            await self.cache.put(data.text_content, model, classification)
+            if rules is not None:
+                self.cascade_stats.record_agreement(rules, classification)
+            return self._remember(data, classification)
+
+        # Fallback to the local model, else rule-based classification
+        if rules is not None:
+            self.cascade_stats.record("llm_unavailable")
+        if self.local_model is not None:
+            return self._remember(data, self._classify_with_local([data])[0], reusable=False)
+        return self._remember(data, rules or self._classify_with_rules(data), reusable=False)
+
+    def _cascade(self, data: ScrapedData) -> Tuple[Optional[ProfileClassification], bool]:
+        """
+        Rule tier of the cascade
 
-        if self._anthropic_client and (self.provider in ["anthropic", "auto"]):
+        Returns:
+            (rule-based guess, whether it is the final answer); (None, False)
+            when cascade mode is off
+        """
+        if not self.cascade:
+            return None, False
+        rules = self._classify_with_rules(data)
+        if rules.confidence < self.cascade_stats.threshold:
+            self.cascade_stats.record("escalated")
+            return rules, False
+        if random.random() < settings.BRAIN_CASCADE_AUDIT_RATE:
+            self.cascade_stats.record("audited")
+            return rules, False
+        self.cascade_stats.record("rules")
+        logger.debug(f"🧠 Rules confident ({rules.confidence:.2f}), skipping LLM for: {data.url}")
+        return rules, True
+
+    async def classify_batch(self, items: Sequence[ScrapedData]) -> List[ProfileClassification]:
+        """
+        Classify several profiles, packing up to K of them into one LLM request
+
+        Cache hits, near-duplicates and (in cascade mode) confident rule
+        answers are served first. The rest is packed greedily into batches
+        bounded by BRAIN_BATCH_TOKEN_BUDGET and the current batch size
+        ceiling. Every batch answer must contain a valid result per profile
+        id; profiles missing from it are classified individually.
+
+        Args:
+            items: Raw scraped contents to analyze
+
+        Returns:
+            ProfileClassification per item, in input order
+        """
+        providers = self._providers()
+        if not providers and self.local_model is not None:
+            # Offline: one vectorized pass over the whole batch
+            return [
+                self._remember(data, classification, reusable=False)
+                for data, classification in zip(items, self._classify_with_local(items))
+            ]
+        if not providers:
+            return [await self.classify(data) for data in items]
+
+        results: List[Optional[ProfileClassification]] = [None] * len(items)
+        guesses: Dict[int, ProfileClassification] = {}
+        pending: List[int] = []
+
+        for i, data in enumerate(items):
+            results[i] = await self._lookup(data, providers)
+            if results[i] is None:
+                rules, final = self._cascade(data)
+                if final:
+                    results[i] = self._remember(data, rules, reusable=False)
+                elif rules is not None:
+                    guesses[i] = rules
+            if results[i] is not None:
+                self.batch_stats["served_without_llm"] += 1
+            else:
+                pending.append(i)
+
+        slots = asyncio.Semaphore(settings.BRAIN_BATCH_CONCURRENCY)
+
+        async def run(batch: List[int]):
+            async with slots:
+                if len(batch) == 1:
+                    i = batch[0]
+                    results[i] = await self._escalate(items[i], providers, guesses.get(i))
+                    return
+                answered = await self._classify_packed([items[i] for i in batch], providers)
+            for i, classification in zip(batch, answered):
+                if classification is None:
+                    self.batch_stats["fallback_profiles"] += 1
+                    classification = await self._escalate(items[i], providers, guesses.get(i))
+                elif i in guesses:
+                    self.cascade_stats.record_agreement(guesses[i], classification)
+                results[i] = classification
+
+        await asyncio.gather(*(run(batch) for batch in self._plan_batches(items, pending)))
+        return results
+
+    def _plan_batches(self, items: Sequence[ScrapedData], indexes: List[int]) -> List[List[int]]:
+        """Greedy packing under the token budget and the adaptive size ceiling"""
+        budget = settings.BRAIN_BATCH_TOKEN_BUDGET
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for i in indexes:
+            tokens = estimate_tokens(items[i].text_content)
+            if current and (used + tokens > budget or len(current) >= self._batch_limit):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _classify_packed(
+        self, batch: List[ScrapedData], providers: list
+    ) -> List[Optional[ProfileClassification]]:
+        """One request for the whole batch; None where the answer has no usable result"""
+        ids = [f"p{i}" for i in range(len(batch))]
+        prompt = BATCH_CLASSIFICATION_PROFILES_PROMPT.format(
+            count=len(batch),
+            profiles="\n".join(
+                BATCH_PROFILE_TEMPLATE.format(id=id_, profile_data=data.text_content)
+                for id_, data in zip(ids, batch)
+            ),
+        )
+
+        answer = await self._first_answer(providers, "batch", lambda provider: provider[3](prompt, len(batch)))
+        if answer is None:
+            return [None] * len(batch)
+        (name, model, _, _), content = answer
+
+        parsed = self._parse_batch_result(content, ids)
+        self.batch_stats["batches"] += 1
+        self.batch_stats["batched_profiles"] += len(parsed)
+        if len(parsed) == len(ids):
+            self._batch_limit = min(self._batch_limit + 1, settings.BRAIN_BATCH_MAX_SIZE)
+        else:
+            self._batch_limit = max(1, self._batch_limit // 2)
+            logger.warning(f"🧠 {name} batch answered {len(parsed)}/{len(ids)} profiles - batch size now {self._batch_limit}")
+
+        answered = []
+        for id_, data in zip(ids, batch):
+            classification = parsed.get(id_)
+            if classification is not None:
+                await self.cache.put(data.text_content, model, classification)
+                self._remember(data, classification)
+            answered.append(classification)
+        return answered
+
+    async def _first_answer(
+        self, providers: list, kind: str, attempt: Callable[[tuple], Awaitable[Any]]
+    ) -> Optional[Tuple[tuple, Any]]:
+        """
+        Ask the providers in order until one answers
+
+        A provider whose circuit is open fails at once, so the next one
+        starts without delay. In hedge mode the next provider is also
+        started when the current one has not answered within its hedge
+        delay; the first answer wins and the other call is cancelled.
+
+        Args:
+            providers: Entries of _providers()
+            kind: "single" or "batch" (latencies are tracked per kind)
+            attempt: Calls one provider entry
+
+        Returns:
+            (provider entry, answer), or None when every provider failed
+        """
+        remaining = list(providers)
+        running: Dict[asyncio.Future, tuple] = {}
+        hedges = set()
+
+        async def timed(provider: tuple):
+            started = time.monotonic()
+            result = await attempt(provider)
+            self.hedge_policy.record(f"{provider[0]}:{kind}", time.monotonic() - started)
+            return result
+
+        launch = True
+        try:
+            while remaining or running:
+                if launch and remaining:
+                    provider = remaining.pop(0)
+                    task = asyncio.ensure_future(timed(provider))
+                    if running:
+                        hedges.add(task)
+                        self.hedge_policy.stats["hedged"] += 1
+                    running[task] = provider
+                    current = provider
+                launch = False
+
+                delay = self.hedge_policy.delay(f"{current[0]}:{kind}") if self.hedge and remaining else None
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch = True  # too slow: hedge
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if task in hedges:
+                            self.hedge_policy.stats["hedge_wins"] += 1
+                        return provider, task.result()
+                    if isinstance(error, CircuitOpenError):
+                        logger.debug(f"🧠 Skipping {provider[0]}: {error}")
+                    else:
+                        logger.error(f"{provider[0]} {kind} classification failed: {error}")
+                launch = not running
+        finally:
+            for task in running:
+                task.cancel()
+        return None
+
+    def _parse_batch_result(self, content: str, ids: List[str]) -> Dict[str, ProfileClassification]:
+        """Classifications by profile id; entries that do not parse are left out"""
+        match = re.search(r'[\[{].*[\]}]', content or "", re.DOTALL)
+        if not match:
+            return {}
+        try:
+            data = json.loads(match.group())
+        except ValueError:
+            return {}
+        entries = data.get("results", []) if isinstance(data, dict) else data
+
+        parsed = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or entry.get("id") not in ids or entry["id"] in parsed:
+                continue
             try:
-                return await self._classify_with_anthropic(scraped_data)
-            except Exception as e:
-                logger.error(f"Anthropic classification failed: {e}")
+                parsed[entry["id"]] = self._parse_classification_result(entry)
+            except (ValueError, TypeError) as e:
+                logger.debug(f"🧠 Unusable batch entry {entry.get('id')}: {e}")
+        return parsed
+
+    async def _lookup(self, data: ScrapedData, providers: list) -> Optional[ProfileClassification]:
+        """Result that needs no LLM call: cached for this text, or reused from a near-duplicate"""
+        # Same text, prompt and model classified before
+        for _, model, _, _ in providers:
+            cached = await self.cache.get(data.text_content, model)
+            if cached is not None:
+                logger.debug(f"🧠 Cache hit ({model}) for: {data.url}")
+                return self._remember(data, cached)
+
+        # Near-identical listing classified before: reuse its verdict. The
+        # other listing's extracted_data (name, phone, ...) belongs to someone
+        # else, so it is rebuilt for this listing instead of copied.
+        duplicate = self.find_duplicate(data) if providers else None
+        if duplicate is not None and duplicate.payload is not None:
+            logger.debug(f"🧠 Near-duplicate of {duplicate.ref} ({duplicate.similarity:.0%}): {data.url}")
+            verdict = duplicate.payload
+            return ProfileClassification(
+                ring=verdict.ring,
+                quality_score=verdict.quality_score,
+                confidence=verdict.confidence,
+                reasoning=verdict.reasoning,
+                extracted_data={
+                    **self._source_data(data),
+                    "duplicate_of": duplicate.ref,
+                    "duplicate_similarity": duplicate.similarity,
+                },
+                recommended_hook=verdict.recommended_hook,
+            )
+        return None
+
+    def find_duplicate(self, data: ScrapedData, exclude: Sequence[str] = ()) -> Optional[NearDuplicate]:
+        """
+        Earlier classified profile whose text is near-identical to ``data``
+
+        ``exclude`` lists refs that must not count as the original, such as
+        later items of the same batch (classify_batch indexes them all).
+        """
+        if self.dedup is None or data.source_type in self.DEDUP_SKIP_SOURCES:
+            return None
+        return self.dedup.find_text(data.text_content, exclude=[data.url, *exclude])
+
+    def _remember(
+        self, data: ScrapedData, classification: ProfileClassification, reusable: bool = True
+    ) -> ProfileClassification:
+        """
+        Index a classified text for near-duplicate lookups
+
+        Rule-based results are indexed for duplicate flagging only; their
+        classification is never handed out in place of an LLM call.
+        """
+        if self.dedup is not None and data.source_type not in self.DEDUP_SKIP_SOURCES:
+            self.dedup.add_text(data.url, data.text_content, classification if reusable else None)
+        return classification
 
-        # Fallback to rule-based classification
-        return self._classify_with_rules(scraped_data)
+    def _providers(self) -> List[Tuple[str, str, Callable[..., Awaitable], Callable[..., Awaitable[str]]]]:
+        """(name, model, single method, batch method) per usable LLM provider, in preference order"""
+        providers = []
+        if self._openai_client and (self.provider in ["openai", "auto"]):
+            providers.append(("OpenAI", self.OPENAI_MODEL, self._classify_with_openai, self._batch_with_openai))
+        if self._anthropic_client and (self.provider in ["anthropic", "auto"]):
+            providers.append(("Anthropic", self.ANTHROPIC_MODEL, self._classify_with_anthropic, self._batch_with_anthropic))
+        return providers
 
     async def _classify_with_openai(self, data: ScrapedData) -> ProfileClassification:
         """Classify using OpenAI GPT-4"""
-        prompt = CLASSIFICATION_PROMPT.format(profile_data=data.text_content)
-
-        response = await self._openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "Je bent een expert classificatie-AI. Respond alleen met valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
+        content = await self._openai_complete(
+            CLASSIFICATION_SYSTEM_PROMPT,
+            CLASSIFICATION_PROFILE_PROMPT.format(profile_data=data.text_content),
         )
-
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
         return self._parse_classification_result(result)
 
     async def _classify_with_anthropic(self, data: ScrapedData) -> ProfileClassification:
         """Classify using Anthropic Claude"""
-        prompt = CLASSIFICATION_PROMPT.format(profile_data=data.text_content)
-
-        response = await self._anthropic_client.messages.create(
-            model="claude-3-haiku-20240307",
+        content = await self._anthropic_complete(
+            CLASSIFICATION_SYSTEM_PROMPT,
+            CLASSIFICATION_PROFILE_PROMPT.format(profile_data=data.text_content),
             max_tokens=1024,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
         )
 
         # Extract JSON from response
-        content = response.content[0].text
         json_match = re.search(r'\{.*\}', content, re.DOTALL)
         if json_match:
             result = json.loads(json_match.group())
@@ -121,76 +486,144 @@ class BrainClassifier:
 
         raise ValueError("Could not extract JSON from Anthropic response")
 
-    def _classify_with_rules(self, data: ScrapedData) -> ProfileClassification:
+    async def _batch_with_openai(self, prompt: str, count: int) -> str:
+        """Raw batch answer from OpenAI"""
+        return await self._openai_complete(
+            BATCH_CLASSIFICATION_SYSTEM_PROMPT, prompt, max_tokens=OUTPUT_TOKENS_PER_PROFILE * count
+        )
+
+    async def _batch_with_anthropic(self, prompt: str, count: int) -> str:
+        """Raw batch answer from Anthropic"""
+        return await self._anthropic_complete(
+            BATCH_CLASSIFICATION_SYSTEM_PROMPT, prompt, max_tokens=OUTPUT_TOKENS_PER_PROFILE * count
+        )
+
+    async def _openai_complete(self, system: str, user: str, max_tokens: Optional[int] = None) -> str:
         """
-        Rule-based classification fallback
+        JSON-mode chat completion
 
-        Uses keyword matching and heuristics when AI is unavailable
+        The static prompt goes first as the system message: OpenAI caches
+        repeated prompt prefixes automatically (from 1024 tokens up).
+        """
+        response = await self._schedule(
+            "openai",
+            lambda: self._openai_client.chat.completions.create(
+                model=self.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            ),
+            estimate_tokens(system + user) + (max_tokens or DEFAULT_OUTPUT_TOKENS),
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", 0) or 0
+            self._record_usage("openai", usage.prompt_tokens - cached, cached, 0)
+        return response.choices[0].message.content
+
+    async def _anthropic_complete(self, system: str, user: str, max_tokens: int) -> str:
         """
-        text = data.text_content.lower()
-        score = 5.0
-        confidence = 0.7
+        Message with the static prompt as a cache_control system block
 
-        # Check for Ring 1 (Vakman) indicators
-        vakman_indicators = [
-            "kvk" in text and any(c.isdigit() for c in text),
-            "jaar ervaring" in text or "years experience" in text,
-            "medewerkers" in text or "employees" in text,
-            "bv" in text or "b.v." in text,
-            "reviews" in text or "★" in text,
-        ]
+        Anthropic only caches prefixes above the model's minimum length;
+        shorter ones are processed normally and show up as uncached.
+        """
+        response = await self._schedule(
+            "anthropic",
+            lambda: self._anthropic_client.messages.create(
+                model=self.ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+                messages=[
+                    {"role": "user", "content": user}
+                ]
+            ),
+            estimate_tokens(system + user) + max_tokens,
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self._record_usage(
+                "anthropic",
+                usage.input_tokens,
+                getattr(usage, "cache_read_input_tokens", 0) or 0,
+                getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            )
+        return response.content[0].text
+
+    async def _schedule(self, provider: str, call: Callable[[], Awaitable], tokens: int):
+        """
+        Run a provider call through its circuit breaker and shared
+        scheduler (quotas, concurrency, 429 retries)
+        """
+        if not settings.BRAIN_SCHEDULER_ENABLED:
+            return await get_circuit_breaker(provider).call(call)
+        scheduler = get_provider_scheduler(provider)
+        return await get_circuit_breaker(provider).call(lambda: scheduler.run(call, tokens))
+
+    def _record_usage(self, provider: str, uncached: int, cached: int, cache_writes: int):
+        """Log and count prompt tokens served from / written to the provider's prompt cache"""
+        stats = self.token_stats.setdefault(
+            provider, {"calls": 0, "uncached_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0}
+        )
+        stats["calls"] += 1
+        stats["uncached_tokens"] += uncached
+        stats["cached_tokens"] += cached
+        stats["cache_write_tokens"] += cache_writes
+        logger.debug(
+            f"🧠 {provider} prompt tokens: {cached} cached, {uncached} uncached"
+            + (f", {cache_writes} written to cache" if cache_writes else "")
+        )
 
-        # Check for Ring 2 (ZZP) indicators
-        zzp_indicators = [
-            "zzp" in text or "freelance" in text,
-            "instagram" in text or "@" in text,
-            "dm" in text or "volg" in text,
-            "startend" in text or "jong" in text,
-        ]
+    @staticmethod
+    def _source_data(data: ScrapedData) -> dict:
+        """extracted_data for classifications that did not read the listing itself"""
+        return {"source_url": data.url, "source_type": data.source_type}
 
-        # Check for Ring 3 (Hobbyist) indicators
-        hobbyist_indicators = [
-            "hobby" in text or "bijverdienste" in text,
-            "buurman" in text or "buurvrouw" in text,
-            "€" in text and any(x in text for x in ["15", "20", "25"]),
-            "marktplaats" in text or "kleine klussen" in text,
-            "geen kvk" in text or "zonder kvk" in text,
-        ]
+    def _classify_with_rules(self, data: ScrapedData) -> ProfileClassification:
+        """
+        Rule-based classification fallback
 
-        # Count indicators
-        vakman_score = sum(vakman_indicators)
-        zzp_score = sum(zzp_indicators)
-        hobbyist_score = sum(hobbyist_indicators)
-
-        # Determine ring
-        if vakman_score >= 2:
-            ring = ProfileRing.VAKMAN
-            score = 7.0 + min(vakman_score, 3)
-            hook = "Directe agenda-vulling en Instant Payouts"
-        elif zzp_score >= 2:
-            ring = ProfileRing.ZZP
-            score = 6.0 + min(zzp_score, 3)
-            hook = "Gratis Admin-Bot en Real-time Lead Radar"
-        elif hobbyist_score >= 1:
-            ring = ProfileRing.HOBBYIST
-            score = 5.0 + min(hobbyist_score, 3)
-            hook = "Solvari Starter Programma"
-        else:
-            # Default to ZZP if unclear
-            ring = ProfileRing.ZZP
-            score = 5.0
-            confidence = 0.4
-            hook = "Algemene Solvari introductie"
+        Scores the compiled indicator table (rules.RULES) when AI is
+        unavailable, and as the first tier in cascade mode. Confidence grows
+        with the lead of the chosen ring over the strongest other ring.
+        """
+        verdict = self.rules.classify(data.text_content)
+        reasoning = (
+            f"Rule-based classification: vakman={verdict.count(ProfileRing.VAKMAN)}, "
+            f"zzp={verdict.count(ProfileRing.ZZP)}, hobbyist={verdict.count(ProfileRing.HOBBYIST)}"
+        )
+        if verdict.matched:
+            reasoning += f" ({', '.join(sorted(verdict.matched))})"
 
         return ProfileClassification(
-            ring=ring,
-            quality_score=min(score, 10.0),
-            confidence=confidence,
-            reasoning=f"Rule-based classification: vakman={vakman_score}, zzp={zzp_score}, hobbyist={hobbyist_score}",
-            extracted_data={"source_url": data.url, "source_type": data.source_type},
-            recommended_hook=hook,
+            ring=verdict.ring,
+            quality_score=verdict.quality_score,
+            confidence=verdict.confidence,
+            reasoning=reasoning,
+            extracted_data=self._source_data(data),
+            recommended_hook=verdict.hook,
         )
 
+    def _classify_with_local(self, items: Sequence[ScrapedData]) -> List[ProfileClassification]:
+        """Classify with the trained TF-IDF model (microseconds, no network)"""
+        predictions = self.local_model.predict_many([data.text_content for data in items])
+        return [
+            ProfileClassification(
+                ring=prediction.ring,
+                quality_score=prediction.quality_score,
+                confidence=prediction.confidence,
+                reasoning=f"Local model classification: p={prediction.confidence:.2f}",
+                extracted_data=self._source_data(data),
+                recommended_hook=RING_HOOKS.get(prediction.ring, DEFAULT_VERDICT[3]),
+            )
+            for data, prediction in zip(items, predictions)
+        ]
+
     def _parse_classification_result(self, result: dict) -> ProfileClassification:
         """Parse AI response into ProfileClassification"""
         ring_value = result.get("ring", 2)
@@ -0,0 +1,171 @@
+"""BRAIN - SimHash index for near-duplicate profile texts"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ...core.config import settings
+from .cache import normalize_text
+
+BITS = 64
+MASK = (1 << BITS) - 1
+
+# Below this many words a fingerprint is too unstable to trust
+MIN_WORDS = 8
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-bit SimHash over the words of the normalized text
+
+    Plain words rather than shingles: listings are short, and a one-word
+    edit should move only a couple of the ~40 features.
+
+    Returns:
+        Fingerprint, or None when the text has fewer than MIN_WORDS words
+    """
+    words = normalize_text(text).split()
+    if len(words) < MIN_WORDS:
+        return None
+
+    weights = [0] * BITS
+    for feature in words:
+        h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & MASK).count("1")
+
+
+@dataclass
+class NearDuplicate:
+    """Closest indexed text within the distance threshold"""
+    ref: str
+    distance: int
+    payload: Any = None
+
+    @property
+    def similarity(self) -> float:
+        return round(1 - self.distance / BITS, 3)
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup over SimHash fingerprints
+
+    The 64 bits are cut into ``max_distance + 1`` bands. Two fingerprints
+    within ``max_distance`` bits must agree exactly on at least one band
+    (pigeonhole), so a lookup only compares against items sharing a band
+    instead of scanning the whole index. Oldest items are evicted beyond
+    ``max_items``.
+    """
+
+    def __init__(self, max_distance: Optional[int] = None, max_items: Optional[int] = None):
+        """
+        Args:
+            max_distance: Largest Hamming distance that counts as a duplicate
+            max_items: Index size before the oldest entries are evicted
+        """
+        self.max_distance = settings.BRAIN_DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.max_items = max_items or settings.BRAIN_DEDUP_MAX_ITEMS
+        self.bands = self.max_distance + 1
+        self._band_bits = BITS // self.bands
+
+        self._items: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._tables: List[Dict[int, Set[str]]] = [{} for _ in range(self.bands)]
+
+        self.stats = {
+            "lookups": 0,
+            "matches": 0,
+            "indexed": 0,
+            "evicted": 0,
+            "too_short": 0,
+        }
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        mask = (1 << self._band_bits) - 1
+        return [fingerprint >> (i * self._band_bits) & mask for i in range(self.bands)]
+
+    def add(self, ref: str, fingerprint: int, payload: Any = None):
+        """Index (or re-index) ``ref`` under ``fingerprint``"""
+        if ref in self._items:
+            self._remove(ref)
+        self._items[ref] = (fingerprint, payload)
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            table.setdefault(key, set()).add(ref)
+        self.stats["indexed"] += 1
+
+        while len(self._items) > self.max_items:
+            oldest = next(iter(self._items))
+            self._remove(oldest)
+            self.stats["evicted"] += 1
+
+    def _remove(self, ref: str):
+        fingerprint, _ = self._items.pop(ref)
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            refs = table.get(key)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del table[key]
+
+    def find(self, fingerprint: int, exclude: Union[str, Iterable[str], None] = None) -> Optional[NearDuplicate]:
+        """Closest indexed item within max_distance (other than the ref(s) in ``exclude``)"""
+        self.stats["lookups"] += 1
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(fingerprint)):
+            candidates |= table.get(key, set())
+        candidates.difference_update([exclude] if isinstance(exclude, str) else exclude or ())
+
+        best = None
+        for ref in candidates:
+            other, payload = self._items[ref]
+            distance = hamming(fingerprint, other)
+            if distance <= self.max_distance and (best is None or distance < best.distance):
+                best = NearDuplicate(ref=ref, distance=distance, payload=payload)
+        if best is not None:
+            self.stats["matches"] += 1
+        return best
+
+    def add_text(self, ref: str, text: str, payload: Any = None) -> Optional[int]:
+        """Fingerprint and index a text; returns the fingerprint (None if too short)"""
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            self.stats["too_short"] += 1
+            return None
+        self.add(ref, fingerprint, payload)
+        return fingerprint
+
+    def find_text(self, text: str, exclude: Union[str, Iterable[str], None] = None) -> Optional[NearDuplicate]:
+        """Near-duplicate of a text, or None (also for texts too short to judge)"""
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None
+        return self.find(fingerprint, exclude=exclude)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_stats(self) -> dict:
+        """Lookup counters and index size"""
+        return {
+            **self.stats,
+            "items": len(self._items),
+            "max_distance": self.max_distance,
+            "match_ratio": round(self.stats["matches"] / self.stats["lookups"], 3) if self.stats["lookups"] else 0.0,
+        }
+
+
+# Global near-duplicate index
+_index: Optional[SimHashIndex] = None
+
+
+def get_dedup_index() -> SimHashIndex:
+    """Get the global near-duplicate index"""
+    global _index
+    if _index is None:
+        _index = SimHashIndex()
+    return _index
@@ -0,0 +1,356 @@
+"""BRAIN - Local hashing TF-IDF + linear classifier trained on stored LLM labels"""
+import json
+import math
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from loguru import logger
+
+from ...core.config import settings
+from ...models import ProfileRing
+from .cache import normalize_text
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+ARTIFACT_VERSION = 1
+DEFAULT_FEATURES = 2 ** 18
+TOKEN_PATTERN = re.compile(r"\w+|[€@★]")
+
+
+def hashed_features(text: str, n_features: int = DEFAULT_FEATURES) -> List[int]:
+    """
+    Hashed word unigram + bigram ids of a text
+
+    crc32 rather than hash(): the ids must be identical in every process
+    that loads the artifact.
+    """
+    tokens = TOKEN_PATTERN.findall(normalize_text(text))
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    mask = n_features - 1
+    return [zlib.crc32(gram.encode()) & mask for gram in grams]
+
+
+class LocalPrediction(NamedTuple):
+    ring: ProfileRing
+    confidence: float  # temperature-calibrated probability of ``ring``
+    quality_score: float
+
+
+class LocalModel:
+    """
+    Softmax regression (ring) + ridge regression (quality) on hashed TF-IDF
+
+    Profiles are hashed into ``n_features`` buckets of word uni/bigrams,
+    weighted by sublinear tf * idf and L2-normalized. Only the buckets seen
+    in training are stored, so the artifact stays small; on load they are
+    scattered into dense arrays and a prediction is a handful of gathers.
+    Confidences are softmax probabilities divided by a temperature fitted
+    on a held-out split.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[int],
+        feature_ids: "np.ndarray",
+        idf: "np.ndarray",
+        coef: "np.ndarray",
+        intercept: "np.ndarray",
+        quality_coef: "np.ndarray",
+        quality_intercept: float,
+        temperature: float = 1.0,
+        n_features: int = DEFAULT_FEATURES,
+        meta: Optional[dict] = None,
+    ):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the local model")
+        self.classes = [ProfileRing(int(c)) for c in classes]
+        self.n_features = n_features
+        self.temperature = float(temperature)
+        self.meta = meta or {}
+
+        self.feature_ids = np.asarray(feature_ids, dtype=np.int64)
+        self._idf = np.zeros(n_features, dtype=np.float32)
+        self._idf[self.feature_ids] = idf
+        self._coef = np.zeros((n_features, len(self.classes)), dtype=np.float32)
+        self._coef[self.feature_ids] = coef
+        self._intercept = np.asarray(intercept, dtype=np.float32)
+        self._quality_coef = np.zeros(n_features, dtype=np.float32)
+        self._quality_coef[self.feature_ids] = quality_coef
+        self._quality_intercept = float(quality_intercept)
+
+    # ---------- Inference ----------
+
+    def predict(self, text: str) -> LocalPrediction:
+        """Ring, calibrated confidence and quality score for one text"""
+        counts = Counter(hashed_features(text, self.n_features))
+        cols = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))) * self._idf[cols]
+        norm = math.sqrt(values @ values)
+        if norm:
+            values /= norm
+        logits = values @ self._coef[cols] + self._intercept
+        quality = values @ self._quality_coef[cols] + self._quality_intercept
+        return self._prediction(_softmax(logits[None, :] / self.temperature)[0], quality)
+
+    def predict_many(self, texts: Sequence[str]) -> List[LocalPrediction]:
+        """Vectorized predictions, in input order"""
+        rows, cols, values = _tfidf([hashed_features(t, self.n_features) for t in texts], self._idf)
+        n = len(texts)
+        logits = _sparse_dot(rows, cols, values, self._coef, n) + self._intercept
+        probabilities = _softmax(logits / self.temperature)
+        quality = _sparse_dot(rows, cols, values, self._quality_coef[:, None], n)[:, 0] + self._quality_intercept
+
+        return [self._prediction(p, q) for p, q in zip(probabilities, quality)]
+
+    def _prediction(self, probabilities: "np.ndarray", quality: float) -> LocalPrediction:
+        best = int(probabilities.argmax())
+        return LocalPrediction(
+            ring=self.classes[best],
+            confidence=round(float(probabilities[best]), 3),
+            quality_score=round(min(max(float(quality), 0.0), 10.0), 1),
+        )
+
+    def get_stats(self) -> dict:
+        """Artifact metadata (training size, held-out metrics)"""
+        return {
+            "loaded": True,
+            "classes": [int(c) for c in self.classes],
+            "features": int(len(self.feature_ids)),
+            "temperature": round(self.temperature, 3),
+            **self.meta,
+        }
+
+    # ---------- Training ----------
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        rings: Sequence[int],
+        quality_scores: Sequence[float],
+        n_features: int = DEFAULT_FEATURES,
+        epochs: int = 200,
+        learning_rate: float = 0.05,
+        l2: float = 1e-4,
+        validation_split: float = 0.2,
+        seed: int = 0,
+    ) -> "LocalModel":
+        """
+        Fit the model on labelled profiles
+
+        Args:
+            texts: Profile texts (profiles.raw_text)
+            rings: Ring label per text
+            quality_scores: Quality score (0-10) per text
+            n_features: Hash buckets (power of two)
+            epochs: Full-batch Adam steps
+            learning_rate: Adam step size
+            l2: Weight decay for both heads
+            validation_split: Held-out share for calibration and metrics
+            seed: Shuffle seed
+
+        Returns:
+            Trained LocalModel
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the local model")
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        if len(texts) < 2:
+            raise ValueError("need at least two labelled profiles")
+
+        started = time.perf_counter()
+        hashed = [hashed_features(t, n_features) for t in texts]
+        classes = sorted({int(r) for r in rings})
+        labels = np.array([classes.index(int(r)) for r in rings])
+        quality = np.asarray(quality_scores, dtype=np.float64)
+
+        order = np.random.default_rng(seed).permutation(len(texts))
+        n_val = int(len(texts) * validation_split) if len(texts) >= 20 else 0
+        val, train = order[:n_val], order[n_val:]
+
+        # Vocabulary = buckets seen in the training split, re-indexed compactly
+        df: Dict[int, int] = {}
+        for i in train:
+            for f in set(hashed[i]):
+                df[f] = df.get(f, 0) + 1
+        feature_ids = np.array(sorted(df), dtype=np.int64)
+        column = {f: j for j, f in enumerate(feature_ids.tolist())}
+        idf = np.log((1 + len(train)) / (1 + np.array([df[f] for f in feature_ids.tolist()]))) + 1.0
+
+        def compact(indexes):
+            return [[column[f] for f in hashed[i] if f in column] for i in indexes]
+
+        rows, cols, values = _tfidf(compact(train), idf)
+        n, m, k = len(train), len(feature_ids), len(classes)
+        targets = np.eye(k)[labels[train]]
+
+        coef, intercept = np.zeros((m, k)), np.zeros(k)
+        quality_coef, quality_intercept = np.zeros(m), float(quality[train].mean())
+        params = [coef, intercept, quality_coef]
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+
+        for step in range(1, epochs + 1):
+            error = (_softmax(_sparse_dot(rows, cols, values, coef, n) + intercept) - targets) / n
+            residual = (_sparse_dot(rows, cols, values, quality_coef[:, None], n)[:, 0] + quality_intercept - quality[train]) / n
+            grads = [
+                _sparse_dot_t(rows, cols, values, error, m) + l2 * coef,
+                error.sum(axis=0),
+                _sparse_dot_t(rows, cols, values, residual[:, None], m)[:, 0] + l2 * quality_coef,
+            ]
+            quality_intercept -= learning_rate * residual.sum()
+            for param, grad, (mean, var) in zip(params, grads, moments):
+                mean *= 0.9
+                mean += 0.1 * grad
+                var *= 0.999
+                var += 0.001 * grad ** 2
+                param -= learning_rate * (mean / (1 - 0.9 ** step)) / (np.sqrt(var / (1 - 0.999 ** step)) + 1e-8)
+
+        model = cls(
+            classes, feature_ids, idf.astype(np.float32), coef.astype(np.float32),
+            intercept.astype(np.float32), quality_coef.astype(np.float32), quality_intercept,
+            n_features=n_features,
+        )
+        model.meta = {"trained_on": int(n), "trained_at": int(time.time())}
+
+        if n_val:
+            model.temperature = model._fit_temperature([texts[i] for i in val], labels[val])
+            predictions = model.predict_many([texts[i] for i in val])
+            model.meta.update({
+                "validated_on": int(n_val),
+                "val_accuracy": round(float(np.mean([
+                    int(p.ring) == classes[label] for p, label in zip(predictions, labels[val])
+                ])), 3),
+                "val_quality_mae": round(float(np.mean(np.abs(
+                    np.array([p.quality_score for p in predictions]) - quality[val]
+                ))), 2),
+            })
+
+        logger.info(
+            f"🧠 Local model trained on {n} profiles ({m} features) in "
+            f"{time.perf_counter() - started:.1f}s: {model.meta}"
+        )
+        return model
+
+    def _fit_temperature(self, texts: Sequence[str], labels: "np.ndarray") -> float:
+        """Temperature minimizing held-out negative log-likelihood"""
+        rows, cols, values = _tfidf([hashed_features(t, self.n_features) for t in texts], self._idf)
+        logits = _sparse_dot(rows, cols, values, self._coef, len(texts)) + self._intercept
+        best, best_nll = 1.0, math.inf
+        for temperature in np.exp(np.linspace(math.log(0.05), math.log(20.0), 120)):
+            probabilities = _softmax(logits / temperature)
+            nll = -np.mean(np.log(probabilities[np.arange(len(labels)), labels] + 1e-12))
+            if nll < best_nll:
+                best, best_nll = float(temperature), nll
+        return best
+
+    # ---------- Persistence ----------
+
+    def save(self, path: str):
+        """Write the compact .npz artifact (seen buckets only)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=ARTIFACT_VERSION,
+                classes=np.array([int(c) for c in self.classes], dtype=np.int8),
+                n_features=self.n_features,
+                feature_ids=self.feature_ids.astype(np.int32),
+                idf=self._idf[self.feature_ids],
+                coef=self._coef[self.feature_ids],
+                intercept=self._intercept,
+                quality_coef=self._quality_coef[self.feature_ids],
+                quality_intercept=self._quality_intercept,
+                temperature=self.temperature,
+                meta=json.dumps(self.meta),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalModel":
+        """Read an artifact written by ``save``"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != ARTIFACT_VERSION:
+                raise ValueError(f"unsupported local model artifact version {int(data['version'])}")
+            return cls(
+                classes=data["classes"].tolist(),
+                feature_ids=data["feature_ids"],
+                idf=data["idf"],
+                coef=data["coef"],
+                intercept=data["intercept"],
+                quality_coef=data["quality_coef"],
+                quality_intercept=float(data["quality_intercept"]),
+                temperature=float(data["temperature"]),
+                n_features=int(data["n_features"]),
+                meta=json.loads(str(data["meta"])),
+            )
+
+
+# ---------- Sparse helpers (COO rows/cols/values) ----------
+
+def _tfidf(docs: List[List[int]], idf: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Sublinear tf * idf, L2-normalized per row; buckets with idf 0 are dropped"""
+    lengths = [len(ids) for ids in docs]
+    ids = np.fromiter(chain.from_iterable(docs), dtype=np.int64, count=sum(lengths))
+    rows = np.repeat(np.arange(len(docs), dtype=np.int64), lengths)
+    # One unique() over (row, bucket) keys counts every document at once
+    keys, counts = np.unique(rows * len(idf) + ids, return_counts=True)
+    rows, cols = keys // len(idf), keys % len(idf)
+
+    values = (1.0 + np.log(counts)) * idf[cols]
+    keep = values > 0
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+    norms = np.sqrt(np.bincount(rows, weights=values ** 2, minlength=len(docs)))
+    return rows, cols, values / np.maximum(norms[rows], 1e-12)
+
+
+def _sparse_dot(rows, cols, values, weights, n_rows: int) -> "np.ndarray":
+    """X @ weights for X given as COO triplets"""
+    contributions = values[:, None] * weights[cols]
+    return np.stack(
+        [np.bincount(rows, weights=contributions[:, j], minlength=n_rows) for j in range(weights.shape[1])],
+        axis=1,
+    )
+
+
+def _sparse_dot_t(rows, cols, values, weights, n_cols: int) -> "np.ndarray":
+    """X.T @ weights for X given as COO triplets"""
+    contributions = values[:, None] * weights[rows]
+    return np.stack(
+        [np.bincount(cols, weights=contributions[:, j], minlength=n_cols) for j in range(weights.shape[1])],
+        axis=1,
+    )
+
+
+def _softmax(logits: "np.ndarray") -> "np.ndarray":
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+# Global local model (loaded once from BRAIN_LOCAL_MODEL_PATH)
+_model: Optional[LocalModel] = None
+_load_attempted = False
+
+
+def get_local_model() -> Optional[LocalModel]:
+    """Get the trained local model, or None when no artifact is available"""
+    global _model, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        path = settings.BRAIN_LOCAL_MODEL_PATH
+        if NUMPY_AVAILABLE and path and os.path.exists(path):
+            try:
+                _model = LocalModel.load(path)
+                logger.info(f"🧠 BRAIN: local model loaded from {path}")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"🧠 BRAIN: could not load local model {path}: {e}")
+    return _model
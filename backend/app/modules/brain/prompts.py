@@ -1,11 +1,10 @@
 """Prompt templates for BRAIN AI classification"""
 
-CLASSIFICATION_PROMPT = """
-Je bent een expert classificatie-AI voor Solvari, een Nederlands platform dat vakmensen koppelt aan huiseigenaren.
-
-Analyseer het volgende profiel en classificeer het volgens het 4-RINGEN SYSTEEM:
+# Bump whenever the classification prompts change: cached classifications are keyed on it
+PROMPT_VERSION = "2"
 
-## DE 4 RINGEN:
+# Ring definitions shared by the single and batch prompts
+RINGS_DESCRIPTION = """## DE 4 RINGEN:
 
 🔴 **RING 1 - VAKMAN** (Score: hoogste prioriteit)
 - Gevestigd bedrijf met >5 jaar ervaring
@@ -32,15 +31,20 @@ Analyseer het volgende profiel en classificeer het volgens het 4-RINGEN SYSTEEM:
 🔵 **RING 4 - ACADEMY** (Niet van toepassing voor externe profielen)
 - Alleen voor interne Solvari medewerkers
 
----
+"""
+
+# The classification prompt is split into a static prefix (system prompt) and
+# the per-profile suffix. The prefix is byte-identical on every call, so Anthropic
+# (cache_control) and OpenAI (automatic prefix caching) can serve it from cache.
+CLASSIFICATION_SYSTEM_PROMPT = """
+Je bent een expert classificatie-AI voor Solvari, een Nederlands platform dat vakmensen koppelt aan huiseigenaren.
 
-## PROFIEL DATA:
-{profile_data}
+Je classificeert profielen volgens het 4-RINGEN SYSTEEM:
 
----
+""" + RINGS_DESCRIPTION + """---
 
 ## INSTRUCTIES:
-Analyseer het profiel en geef een JSON response met:
+Analyseer het profiel uit het gebruikersbericht en geef een JSON response met:
 1. `ring`: nummer 1-3 (4 is alleen intern)
 2. `quality_score`: 0-10 gebaseerd op professionaliteit en volledigheid
 3. `confidence`: 0-1 hoe zeker je bent van de classificatie
@@ -51,6 +55,39 @@ Analyseer het profiel en geef een JSON response met:
 Respond ALLEEN met valid JSON.
 """
 
+CLASSIFICATION_PROFILE_PROMPT = """## PROFIEL DATA:
+{profile_data}
+"""
+
+BATCH_CLASSIFICATION_SYSTEM_PROMPT = """
+Je bent een expert classificatie-AI voor Solvari, een Nederlands platform dat vakmensen koppelt aan huiseigenaren.
+
+Je classificeert meerdere profielen tegelijk, elk afzonderlijk, volgens het 4-RINGEN SYSTEEM:
+
+""" + RINGS_DESCRIPTION + """---
+
+## INSTRUCTIES:
+Het gebruikersbericht bevat profielen, elk met een id. Geef een JSON object met een veld
+`results`: een lijst met precies één object per profiel, met:
+1. `id`: het id van het profiel, exact zoals gegeven
+2. `ring`: nummer 1-3 (4 is alleen intern)
+3. `quality_score`: 0-10 gebaseerd op professionaliteit en volledigheid
+4. `confidence`: 0-1 hoe zeker je bent van de classificatie
+5. `reasoning`: korte uitleg van je beslissing
+6. `extracted_data`: alle relevante geëxtraheerde informatie
+7. `recommended_hook`: welke hook/aanpak voor deze persoon
+
+Beoordeel elk profiel alleen op zijn eigen tekst. Respond ALLEEN met valid JSON.
+"""
+
+BATCH_CLASSIFICATION_PROFILES_PROMPT = """## PROFIELEN ({count}):
+{profiles}
+"""
+
+BATCH_PROFILE_TEMPLATE = """### id: {id}
+{profile_data}
+"""
+
 EXTRACTION_PROMPT = """
 Extraheer alle relevante bedrijfs- en contactinformatie uit de volgende tekst.
 Focus op:
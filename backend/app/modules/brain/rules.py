@@ -0,0 +1,192 @@
+"""BRAIN - Compiled keyword rules for the rule-based classifier"""
+import re
+from functools import lru_cache
+from itertools import compress
+from typing import FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from ...models import ProfileRing
+
+
+class Rule(NamedTuple):
+    """One indicator: fires once when any of its terms occurs"""
+    ring: ProfileRing
+    name: str
+    # Regex fragments (one alternative each) matched as whole words in the
+    # lowercased text; end a term with \w* to also match longer words
+    terms: Tuple[str, ...]
+
+
+RULES: Tuple[Rule, ...] = (
+    # Ring 1 (Vakman)
+    Rule(ProfileRing.VAKMAN, "kvk_number", (r"kvk(?:[\s:.#-]*(?:nr|nummer))?[\s:.#-]*\d{8}",)),
+    Rule(ProfileRing.VAKMAN, "experience", (r"jaar\s+ervaring", r"years?\s+(?:of\s+)?experience")),
+    Rule(ProfileRing.VAKMAN, "staff", (r"medewerkers?", r"employees")),
+    Rule(ProfileRing.VAKMAN, "legal_form", ("bv", r"b\.v\.?")),
+    Rule(ProfileRing.VAKMAN, "reviews", (r"reviews?", "★")),
+    # Ring 2 (ZZP)
+    Rule(ProfileRing.ZZP, "zzp", (r"zzp\w*", r"freelance\w*")),
+    Rule(ProfileRing.ZZP, "social", ("instagram", r"@\w{2,}")),
+    Rule(ProfileRing.ZZP, "dm", ("dm", r"volg(?:en|ers)?")),
+    Rule(ProfileRing.ZZP, "starter", (r"startend\w*", r"jonge?")),
+    # Ring 3 (Hobbyist)
+    Rule(ProfileRing.HOBBYIST, "hobby", (r"hobby\w*", r"bijverdienste\w*")),
+    Rule(ProfileRing.HOBBYIST, "neighbour", ("buurman", "buurvrouw")),
+    Rule(ProfileRing.HOBBYIST, "low_rate", (r"€\s*(?:15|20|25)",)),
+    Rule(ProfileRing.HOBBYIST, "marketplace", ("marktplaats", r"kleine\s+klus(?:sen|jes)")),
+    Rule(ProfileRing.HOBBYIST, "no_kvk", (r"geen\s+kvk", r"zonder\s+kvk")),
+)
+
+# Ring decision in priority order: (ring, minimum indicators, base score, hook)
+RING_THRESHOLDS = (
+    (ProfileRing.VAKMAN, 2, 7.0, "Directe agenda-vulling en Instant Payouts"),
+    (ProfileRing.ZZP, 2, 6.0, "Gratis Admin-Bot en Real-time Lead Radar"),
+    (ProfileRing.HOBBYIST, 1, 5.0, "Solvari Starter Programma"),
+)
+RING_ORDER = tuple(ring for ring, *_ in RING_THRESHOLDS)
+# Nothing conclusive: ZZP with low confidence
+DEFAULT_VERDICT = (ProfileRing.ZZP, 5.0, 0.4, "Algemene Solvari introductie")
+
+_META = set(".^$*+?{}[]\\|()")
+
+
+def split_literal(term: str) -> Tuple[str, str]:
+    """
+    Split a term into its leading literal text and the regex remainder
+
+    Returns:
+        (literal, rest), e.g. "volg(?:en|ers)?" -> ("volg", "(?:en|ers)?")
+    """
+    literal, i = [], 0
+    while i < len(term):
+        char, step = term[i], 1
+        if char == "\\" and i + 1 < len(term) and not term[i + 1].isalnum():
+            char, step = term[i + 1], 2
+        elif char in _META:
+            break
+        if term[i + step:i + step + 1] in ("*", "?", "{"):
+            break
+        literal.append(char)
+        i += step
+    return "".join(literal), term[i:]
+
+
+def compile_term(term: str) -> Tuple[str, "re.Pattern"]:
+    """
+    Whole-word pattern for a term, plus the literal that gates it
+
+    The word-boundary check sits behind the literal rather than in front
+    of it, so the regex keeps a literal prefix and the engine can jump
+    straight to candidate positions.
+    """
+    literal, rest = split_literal(term)
+    if not literal:
+        return "", re.compile(rf"(?<!\w)(?:{term})(?!\w)")
+    head = re.escape(literal)
+    return literal, re.compile(rf"{head}(?<!\w{head})(?:{rest})(?!\w)")
+
+
+def rule_confidence(counts: Sequence[int], slot: int) -> float:
+    """
+    Confidence of a rule-based ring choice from its indicator lead
+
+    0.5 for a tie with another ring, +0.15 per indicator ahead, so three
+    unopposed indicators (B.V. + KvK number + reviews) give 0.95.
+
+    Args:
+        counts: Indicator count per ring, in RING_THRESHOLDS order
+        slot: Position of the chosen ring in ``counts``
+    """
+    return _lead_confidence(counts[slot] - max(counts[:slot] + counts[slot + 1:]))
+
+
+@lru_cache(maxsize=None)
+def _lead_confidence(lead: int) -> float:
+    return round(min(0.95, max(0.3, 0.5 + 0.15 * lead)), 2)
+
+
+class RuleVerdict(NamedTuple):
+    ring: ProfileRing
+    quality_score: float
+    confidence: float
+    hook: str
+    counts: Tuple[int, ...]  # per ring, in RING_THRESHOLDS order
+    matched: FrozenSet[str]
+
+    def count(self, ring: ProfileRing) -> int:
+        return self.counts[RING_ORDER.index(ring)]
+
+
+class RuleEngine:
+    """
+    The rules table compiled for fast bulk scoring
+
+    Every term becomes a whole-word regex (no "bv" inside "subvloer",
+    no "dm" inside "admin"). Each is guarded by its leading literal: a C
+    substring search rejects almost every term per text, so only the few
+    terms whose literal occurs pay for a regex. In CPython this beats
+    scanning one combined alternation, which steps the regex engine
+    through every position of the text.
+    """
+
+    def __init__(self, rules: Sequence[Rule] = RULES):
+        """
+        Args:
+            rules: Indicator table (default: RULES)
+        """
+        self.rules = tuple(rules)
+        self._literals: List[str] = []
+        self._checks: List[Tuple[int, "re.Pattern"]] = []
+        for index, rule in enumerate(self.rules):
+            for term in rule.terms:
+                literal, pattern = compile_term(term)
+                self._literals.append(literal)
+                self._checks.append((index, pattern))
+        # Count slot per rule (plain ints: hashing Enum members is slow)
+        self._slots = [RING_ORDER.index(rule.ring) for rule in self.rules]
+        self._names = [rule.name for rule in self.rules]
+
+    def match(self, text: str) -> List[int]:
+        """Indexes of the rules firing on ``text``"""
+        text = text.lower()
+        fired: List[int] = []
+        last = -1
+        # All literal gates run in C; Python only sees the terms whose literal occurs
+        for index, pattern in compress(self._checks, map(text.__contains__, self._literals)):
+            if index != last and pattern.search(text):
+                fired.append(index)
+                last = index
+        return fired
+
+    def score(self, text: str) -> Tuple[int, ...]:
+        """Indicator count per ring, in RING_THRESHOLDS order"""
+        counts = [0] * len(RING_ORDER)
+        for index in self.match(text):
+            counts[self._slots[index]] += 1
+        return tuple(counts)
+
+    def classify(self, text: str) -> RuleVerdict:
+        """Ring, quality score, confidence and hook for ``text``"""
+        fired = self.match(text)
+        counts = [0] * len(RING_ORDER)
+        for index in fired:
+            counts[self._slots[index]] += 1
+        matched = frozenset([self._names[index] for index in fired])
+
+        for slot, (ring, minimum, base_score, hook) in enumerate(RING_THRESHOLDS):
+            if counts[slot] >= minimum:
+                score = min(base_score + min(counts[slot], 3), 10.0)
+                return RuleVerdict(ring, score, rule_confidence(counts, slot), hook, tuple(counts), matched)
+        ring, score, confidence, hook = DEFAULT_VERDICT
+        return RuleVerdict(ring, score, confidence, hook, tuple(counts), matched)
+
+
+# Global rule engine (compiled once)
+_engine: Optional[RuleEngine] = None
+
+
+def get_rule_engine() -> RuleEngine:
+    """Get the global compiled rule engine"""
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+    return _engine
@@ -0,0 +1,263 @@
+"""BRAIN - Per-provider admission control for LLM calls"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import httpx
+from loguru import logger
+
+from ...core.config import settings
+from ...core.ratelimit import TokenBucket
+
+T = TypeVar("T")
+
+# Provider answers meaning "slow down": rate limited / overloaded
+THROTTLE_STATUSES = {429, 529}
+# Transient server errors worth another attempt without slowing down
+RETRY_STATUSES = {408, 500, 502, 503, 504}
+# Seconds of quota a bucket may spend in one burst
+BURST_SECONDS = 10
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 60.0
+
+# Timeouts and dropped connections: no status code, but just as transient
+NETWORK_ERRORS = (asyncio.TimeoutError, ConnectionError, httpx.TransportError)
+try:
+    from openai import APIConnectionError as OpenAIConnectionError  # incl. APITimeoutError
+    NETWORK_ERRORS += (OpenAIConnectionError,)
+except ImportError:
+    pass
+try:
+    from anthropic import APIConnectionError as AnthropicConnectionError  # incl. APITimeoutError
+    NETWORK_ERRORS += (AnthropicConnectionError,)
+except ImportError:
+    pass
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed call is worth retrying: 408/5xx, timeouts, connection errors"""
+    return isinstance(error, NETWORK_ERRORS) or getattr(error, "status_code", None) in RETRY_STATUSES
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Back-off in seconds demanded by a provider error
+
+    Reads ``retry-after-ms`` / ``retry-after`` from the error's response
+    (both SDKs attach it as ``error.response``).
+
+    Returns:
+        Seconds to wait, or None when the error is not a throttle
+    """
+    if getattr(error, "status_code", None) not in THROTTLE_STATUSES:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return min(float(headers.get(header)) * scale, MAX_RETRY_AFTER)
+        except (TypeError, ValueError):
+            continue
+    return DEFAULT_RETRY_AFTER
+
+
+class ProviderScheduler:
+    """
+    Rate limits and adaptive concurrency for one LLM provider
+
+    Every call takes a request token and its estimated prompt+completion
+    tokens from per-minute buckets, then a concurrency slot. The slot
+    limit is AIMD: +1/limit per fast success (about +1 per round trip),
+    x0.9 when a call is slower than the latency target and halved on a
+    429/529, at most once per average latency so a burst of 429s from
+    the same window counts once. Throttled calls wait out Retry-After
+    (which pauses the whole provider) and are retried; 5xx answers,
+    timeouts and connection errors are retried with exponential backoff.
+    The SDK clients' own retries should be off so these signals reach the
+    scheduler.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: float,
+        tpm: float,
+        max_concurrency: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ):
+        """
+        Args:
+            name: Provider name (for logs and metrics)
+            rpm: Requests per minute
+            tpm: Tokens per minute
+            max_concurrency: Upper bound for the adaptive slot limit
+            latency_target: Seconds above which a call counts as congested
+            max_retries: Attempts after a throttle, transient server error,
+                         timeout or connection error
+        """
+        self.name = name
+        self.requests = TokenBucket(rpm / 60, capacity=max(1.0, rpm / 60 * BURST_SECONDS))
+        self.tokens = TokenBucket(tpm / 60, capacity=max(1.0, tpm / 60 * BURST_SECONDS))
+        self.max_concurrency = max_concurrency or settings.BRAIN_LLM_MAX_CONCURRENCY
+        self.latency_target = settings.BRAIN_LLM_LATENCY_TARGET if latency_target is None else latency_target
+        self.max_retries = settings.BRAIN_LLM_MAX_RETRIES if max_retries is None else max_retries
+
+        # Slow start: a quarter of the ceiling, grown by successes
+        self.limit = float(max(1, self.max_concurrency // 4))
+        self.in_flight = 0
+        self.queued = 0
+        self.latency_ewma: Optional[float] = None
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.stats = {
+            "completed": 0,
+            "failed": 0,
+            "rate_limited": 0,  # 429/529 answers
+            "retries": 0,
+            "latency_backoffs": 0,
+        }
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        Run one provider call under the limits
+
+        Args:
+            call: Zero-argument coroutine factory (called once per attempt)
+            tokens: Estimated prompt + completion tokens
+
+        Returns:
+            The call's result; the last error is raised when retries run out
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._admit(tokens)
+            started = time.monotonic()
+            try:
+                result = await call()
+            except Exception as e:
+                error = e
+            else:
+                error = None
+            finally:
+                # Also on cancellation (e.g. the losing side of a hedge)
+                self._release()
+
+            if error is None:
+                self._on_success(time.monotonic() - started)
+                return result
+            delay = self._on_error(error, attempt)
+            if delay is None or attempt == self.max_retries:
+                self.stats["failed"] += 1
+                raise error
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    # ---------- Admission ----------
+
+    async def _admit(self, tokens: int):
+        self.queued += 1
+        try:
+            await self.requests.acquire()
+            if tokens:
+                # A call bigger than the burst (a packed batch) waits for a
+                # full bucket and drains it instead of driving it far negative
+                await self.tokens.acquire(min(tokens, self.tokens.capacity))
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                if self.in_flight < int(self.limit):
+                    break
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+            self.in_flight += 1
+        finally:
+            self.queued -= 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    # ---------- AIMD ----------
+
+    def _on_success(self, latency: float):
+        self.stats["completed"] += 1
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        if self.latency_target and latency > self.latency_target:
+            self.stats["latency_backoffs"] += 1
+            self._decrease(0.9)
+        else:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+            self._wake()
+
+    def _on_error(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None when the error is final"""
+        delay = retry_after(error)
+        if delay is not None:
+            self.stats["rate_limited"] += 1
+            self._decrease(0.5)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            logger.warning(
+                f"🧠 {self.name} throttled ({getattr(error, 'status_code', '?')}), "
+                f"pausing {delay:.1f}s - concurrency now {int(self.limit)}"
+            )
+            return delay
+        if is_transient(error):
+            return min(0.5 * 2 ** attempt, MAX_RETRY_AFTER)
+        return None
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency_ewma or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit * factor)
+
+    def get_stats(self) -> dict:
+        """Live in-flight/queued counts, current limit and throttle counters"""
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_concurrency,
+            "throttled": self.requests.stats["throttled"] + self.tokens.stats["throttled"],
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+        }
+
+
+# Global schedulers, one per provider (limits are per API key, not per classifier)
+_schedulers: Dict[str, ProviderScheduler] = {}
+
+
+def get_provider_scheduler(name: str) -> ProviderScheduler:
+    """Get the shared scheduler for ``name`` ("openai" or "anthropic")"""
+    if name not in _schedulers:
+        limits = {
+            "openai": (settings.BRAIN_OPENAI_RPM, settings.BRAIN_OPENAI_TPM),
+            "anthropic": (settings.BRAIN_ANTHROPIC_RPM, settings.BRAIN_ANTHROPIC_TPM),
+        }
+        rpm, tpm = limits[name]
+        _schedulers[name] = ProviderScheduler(name, rpm, tpm)
+    return _schedulers[name]
+
+
+def get_scheduler_stats() -> Dict[str, dict]:
+    """Stats of every scheduler created so far"""
+    return {name: scheduler.get_stats() for name, scheduler in _schedulers.items()}
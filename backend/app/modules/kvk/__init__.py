@@ -1,5 +1,7 @@
 """KVK Handelsregister API Integration"""
-from .client import KvKClient
+from .bulk import KvKBulkStore, get_kvk_bulk_store, close_kvk_bulk_store
+from .cache import KvKCache, get_kvk_cache, close_kvk_cache
+from .client import KvKClient, get_kvk_quota, get_prefetch_stats
 from .models import (
     KvKSearchResult,
     KvKBasisprofiel,
@@ -7,9 +9,23 @@ from .models import (
     KvKAdres,
     KvKSbiActiviteit,
 )
+from .sbi import SBITrie, SBIFilter, get_sbi_filter
+from .scan import KvKScanEngine
 
 __all__ = [
     "KvKClient",
+    "KvKCache",
+    "KvKBulkStore",
+    "get_kvk_bulk_store",
+    "close_kvk_bulk_store",
+    "get_kvk_cache",
+    "close_kvk_cache",
+    "KvKScanEngine",
+    "SBITrie",
+    "SBIFilter",
+    "get_sbi_filter",
+    "get_kvk_quota",
+    "get_prefetch_stats",
     "KvKSearchResult",
     "KvKBasisprofiel",
     "KvKVestiging",
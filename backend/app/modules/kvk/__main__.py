@@ -0,0 +1,26 @@
+"""KVK command line: python -m app.modules.kvk import extract.csv [--db path]"""
+import argparse
+from typing import List, Optional
+
+from ...core.config import settings
+from .bulk import KvKBulkStore
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Import a KvK bulk extract into the local store")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    importer = subcommands.add_parser("import", help="Load a .csv or .jsonl extract")
+    importer.add_argument("files", nargs="+")
+    importer.add_argument("--db", default=settings.KVK_BULK_DB_PATH, required=not settings.KVK_BULK_DB_PATH)
+    importer.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    store = KvKBulkStore(args.db)
+    for path in args.files:
+        print(f"{path}: {store.import_file(path, args.batch_size)}")
+    print(f"{args.db}: {store.count()} companies")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
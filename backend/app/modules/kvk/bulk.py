@@ -0,0 +1,464 @@
+"""KVK - Local store built from a bulk Handelsregister/SBI extract"""
+import asyncio
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from loguru import logger
+
+from ...core.config import settings
+
+# Bumped when the table layout changes; older stores are rebuilt on open
+SCHEMA_VERSION = 2
+
+# One companies row per vestiging: an extract lists every branch of a
+# company, so kvk_nummer alone is not unique ("" for rows without a branch)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    kvk_nummer TEXT NOT NULL,
+    vestigingsnummer TEXT NOT NULL DEFAULT '',
+    naam TEXT NOT NULL,
+    naam_norm TEXT NOT NULL,
+    handelsnamen TEXT,
+    type TEXT,
+    rechtsvorm TEXT,
+    registratiedatum TEXT,
+    werkzame_personen INTEGER,
+    straatnaam TEXT,
+    huisnummer TEXT,
+    postcode TEXT,
+    plaats TEXT,
+    plaats_norm TEXT,
+    PRIMARY KEY (kvk_nummer, vestigingsnummer)
+);
+CREATE TABLE IF NOT EXISTS company_sbi (
+    kvk_nummer TEXT NOT NULL,
+    sbi_code TEXT NOT NULL,
+    omschrijving TEXT,
+    hoofdactiviteit TEXT,
+    PRIMARY KEY (kvk_nummer, sbi_code)
+);
+CREATE TABLE IF NOT EXISTS name_trigrams (
+    trigram TEXT NOT NULL,
+    kvk_nummer TEXT NOT NULL,
+    PRIMARY KEY (trigram, kvk_nummer)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_companies_postcode ON companies (postcode);
+CREATE INDEX IF NOT EXISTS ix_companies_plaats ON companies (plaats_norm);
+CREATE INDEX IF NOT EXISTS ix_company_sbi_code ON company_sbi (sbi_code, kvk_nummer);
+"""
+
+# Accepted column names per field (CSV headers or flat JSONL keys)
+FIELD_ALIASES = {
+    "kvk_nummer": ("kvkNummer", "kvk_nummer", "kvknummer", "kvk"),
+    "vestigingsnummer": ("vestigingsnummer", "vestigingsNummer"),
+    "naam": ("naam", "handelsnaam", "eersteHandelsnaam", "statutaireNaam"),
+    "type": ("type",),
+    "rechtsvorm": ("rechtsvorm",),
+    "registratiedatum": ("formeleRegistratiedatum", "registratiedatum"),
+    "werkzame_personen": ("totaalWerkzamePersonen", "werkzamePersonen", "werkzame_personen"),
+    "straatnaam": ("straatnaam",),
+    "huisnummer": ("huisnummer",),
+    "postcode": ("postcode",),
+    "plaats": ("plaats", "woonplaats"),
+    "sbi_codes": ("sbiCodes", "sbiCode", "sbi_codes", "sbi"),
+    "sbi_omschrijvingen": ("sbiOmschrijvingen", "sbiOmschrijving"),
+}
+
+LIST_SEPARATOR = ";"
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, alphanumerics only, single spaces"""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", (text or "").lower()).split())
+
+
+def normalize_postcode(postcode: Optional[str]) -> Optional[str]:
+    return re.sub(r"\s+", "", postcode).upper() if postcode else None
+
+
+def trigrams(text: str) -> set:
+    """Character trigrams of a normalized name (spaces included, so words join)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _first(record: dict, field: str):
+    for alias in FIELD_ALIASES[field]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _split(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(LIST_SEPARATOR) if v.strip()]
+
+
+def normalize_record(record: dict) -> Optional[dict]:
+    """
+    Map an extract row onto the store's columns
+
+    Accepts flat rows (CSV, or JSONL with the FIELD_ALIASES keys; lists
+    separated by ``;``) as well as API-shaped JSON with ``sbiActiviteiten``
+    and an ``adres``/``adressen`` object.
+
+    Returns:
+        Column dict plus an ``sbi`` list, or None when kvkNummer/naam is missing
+    """
+    kvk_nummer = _first(record, "kvk_nummer")
+    naam = _first(record, "naam")
+    if not kvk_nummer or not naam:
+        return None
+
+    adres = record.get("adres") or (record.get("adressen") or [None])[0] or {}
+    adres = adres.get("binnenlandsAdres", adres)
+    merged = {**adres, **{k: v for k, v in record.items() if v not in (None, "")}}
+
+    if record.get("sbiActiviteiten"):
+        sbi = [
+            (str(s["sbiCode"]), s.get("sbiOmschrijving"), s.get("indHoofdactiviteit"))
+            for s in record["sbiActiviteiten"]
+        ]
+    else:
+        codes = _split(_first(record, "sbi_codes"))
+        descriptions = _split(_first(record, "sbi_omschrijvingen"))
+        sbi = [
+            (code, descriptions[i] if i < len(descriptions) else None, "Ja" if i == 0 else "Nee")
+            for i, code in enumerate(codes)
+        ]
+
+    raw_names = record.get("handelsnamen")
+    if not isinstance(raw_names, list):
+        raw_names = _split(raw_names)
+    handelsnamen = [h.get("naam") if isinstance(h, dict) else h for h in raw_names]
+    werkzame = _first(record, "werkzame_personen")
+    plaats = _first(merged, "plaats")
+
+    return {
+        "kvk_nummer": str(kvk_nummer).zfill(8),
+        "vestigingsnummer": str(_first(record, "vestigingsnummer") or ""),
+        "naam": naam,
+        "naam_norm": normalize_name(naam),
+        "handelsnamen": json.dumps([h for h in handelsnamen if h]),
+        "type": _first(record, "type") or "hoofdvestiging",
+        "rechtsvorm": _first(record, "rechtsvorm"),
+        "registratiedatum": _first(record, "registratiedatum"),
+        "werkzame_personen": int(werkzame) if str(werkzame or "").isdigit() else None,
+        "straatnaam": _first(merged, "straatnaam"),
+        "huisnummer": str(_first(merged, "huisnummer") or "") or None,
+        "postcode": normalize_postcode(_first(merged, "postcode")),
+        "plaats": plaats,
+        "plaats_norm": normalize_name(plaats) if plaats else None,
+        "sbi": sbi,
+    }
+
+
+def read_extract(path: str) -> Iterator[dict]:
+    """Stream raw records from a .csv or .jsonl extract"""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+            yield from csv.DictReader(f, dialect=dialect)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+class KvKBulkStore:
+    """
+    SQLite store for a KvK bulk extract
+
+    One row per vestiging, keyed on (kvkNummer, vestigingsnummer) and
+    indexed on SBI code, postcode, plaats and name trigrams, so lookups that
+    would cost an API round trip are answered locally in well under a
+    millisecond. SBI codes and name trigrams are kept per company. All async methods run the query in
+    a worker thread; the connection is shared behind a lock.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file (created on first import)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "query_seconds_total": 0.0,
+        }
+
+    def _migrate(self):
+        """Drop tables from an older layout; the store is rebuilt from the extract"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        if self._conn.execute("SELECT name FROM sqlite_master WHERE name = 'companies'").fetchone():
+            logger.warning(f"KVK bulk: {self.path} uses an old layout - re-import the extract")
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS companies; DROP TABLE IF EXISTS company_sbi; "
+                "DROP TABLE IF EXISTS name_trigrams;"
+            )
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ---------- Import ----------
+
+    def import_records(self, records: Iterable[dict], batch_size: int = 5000) -> dict:
+        """
+        Upsert extract records in batches
+
+        Args:
+            records: Raw extract rows (see normalize_record)
+            batch_size: Rows per transaction
+
+        Returns:
+            Dict with imported and skipped counts
+        """
+        imported = skipped = 0
+        batch: List[dict] = []
+        # Companies whose SBI codes/trigrams were already reset in this import
+        seen: set = set()
+
+        for record in records:
+            row = normalize_record(record)
+            if row is None:
+                skipped += 1
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self._write_batch(batch, seen)
+                imported += len(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch, seen)
+            imported += len(batch)
+
+        with self._lock:
+            self._conn.execute("ANALYZE")
+        logger.info(f"KVK bulk: imported {imported} vestigingen ({skipped} skipped) into {self.path}")
+        return {"imported": imported, "skipped": skipped}
+
+    def import_file(self, path: str, batch_size: int = 5000) -> dict:
+        """Import a .csv or .jsonl extract"""
+        return self.import_records(read_extract(path), batch_size)
+
+    def _write_batch(self, rows: List[dict], seen: set):
+        columns = [c for c in rows[0] if c != "sbi"]
+        # Per-company data is replaced once per import, then merged across vestigingen
+        numbers = [(n,) for n in {row["kvk_nummer"] for row in rows} - seen]
+        seen.update(n for n, in numbers)
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM company_sbi WHERE kvk_nummer = ?", numbers)
+            self._conn.executemany("DELETE FROM name_trigrams WHERE kvk_nummer = ?", numbers)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO companies ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[c] for c in columns) for row in rows],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO company_sbi VALUES (?, ?, ?, ?)",
+                [(row["kvk_nummer"], *sbi) for row in rows for sbi in row["sbi"]],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO name_trigrams VALUES (?, ?)",
+                [(t, row["kvk_nummer"]) for row in rows for t in trigrams(row["naam_norm"])],
+            )
+
+    # ---------- Lookups ----------
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT kvk_nummer) FROM companies").fetchone()[0]
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _sbi_for(self, kvk_nummers: List[str]) -> Dict[str, List[dict]]:
+        if not kvk_nummers:
+            return {}
+        rows = self._query(
+            f"SELECT * FROM company_sbi WHERE kvk_nummer IN ({', '.join('?' * len(kvk_nummers))}) "
+            "ORDER BY hoofdactiviteit = 'Ja' DESC, sbi_code",
+            tuple(kvk_nummers),
+        )
+        activities: Dict[str, List[dict]] = {}
+        for row in rows:
+            activities.setdefault(row["kvk_nummer"], []).append({
+                "sbiCode": row["sbi_code"],
+                "sbiOmschrijving": row["omschrijving"] or "",
+                "indHoofdactiviteit": row["hoofdactiviteit"],
+            })
+        return activities
+
+    @staticmethod
+    def _as_company(row: sqlite3.Row, sbi: List[dict]) -> dict:
+        return {
+            "kvkNummer": row["kvk_nummer"],
+            "vestigingsnummer": row["vestigingsnummer"] or None,
+            "naam": row["naam"],
+            "handelsnamen": json.loads(row["handelsnamen"] or "[]"),
+            "type": row["type"],
+            "rechtsvorm": row["rechtsvorm"],
+            "formeleRegistratiedatum": row["registratiedatum"],
+            "totaalWerkzamePersonen": row["werkzame_personen"],
+            "adres": {
+                "binnenlandsAdres": {
+                    "straatnaam": row["straatnaam"],
+                    "huisnummer": row["huisnummer"],
+                    "postcode": row["postcode"],
+                    "plaats": row["plaats"],
+                }
+            },
+            "sbiActiviteiten": sbi,
+        }
+
+    def get_sync(self, kvk_nummer: str) -> Optional[dict]:
+        rows = self._query(
+            "SELECT * FROM companies WHERE kvk_nummer = ? "
+            "ORDER BY type = 'hoofdvestiging' DESC, vestigingsnummer LIMIT 1",
+            (kvk_nummer,),
+        )
+        if not rows:
+            return None
+        return self._as_company(rows[0], self._sbi_for([kvk_nummer]).get(kvk_nummer, []))
+
+    def search_sync(
+        self,
+        query: Optional[str] = None,
+        kvk_nummer: Optional[str] = None,
+        postcode: Optional[str] = None,
+        plaats: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        sbi_prefixes: Optional[Iterable[str]] = None,
+        pagina: int = 1,
+        per_pagina: int = 10,
+    ) -> Tuple[int, List[dict]]:
+        """
+        Filtered, paged search
+
+        A name query is narrowed through the trigram index (every trigram must
+        match) and then confirmed as a substring of the normalized name.
+        SBI prefixes are matched as index range scans.
+
+        Returns:
+            (total matches, companies on the requested page)
+        """
+        where, params = [], []
+
+        name = normalize_name(query) if query else ""
+        grams = sorted(trigrams(name))
+        if grams:
+            where.append(
+                "c.kvk_nummer IN (SELECT kvk_nummer FROM name_trigrams "
+                f"WHERE trigram IN ({', '.join('?' * len(grams))}) "
+                "GROUP BY kvk_nummer HAVING COUNT(*) = ?)"
+            )
+            params += [*grams, len(grams)]
+        if name:
+            where.append("instr(c.naam_norm, ?) > 0")
+            params.append(name)
+        if kvk_nummer:
+            where.append("c.kvk_nummer = ?")
+            params.append(kvk_nummer)
+        if postcode:
+            where.append("c.postcode = ?")
+            params.append(normalize_postcode(postcode))
+        if plaats:
+            where.append("c.plaats_norm = ?")
+            params.append(normalize_name(plaats))
+        if type_filter:
+            where.append("c.type = ?")
+            params.append(type_filter)
+
+        prefixes = [p for p in (sbi_prefixes or []) if p]
+        if prefixes:
+            # "43" covers 43000..43999: code >= "43" AND code < "44"
+            ranges = " OR ".join("(s.sbi_code >= ? AND s.sbi_code < ?)" for _ in prefixes)
+            where.append(f"c.kvk_nummer IN (SELECT s.kvk_nummer FROM company_sbi s WHERE {ranges})")
+            for prefix in prefixes:
+                params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        total = self._query(f"SELECT COUNT(*) FROM companies c {clause}", tuple(params))[0][0]
+        rows = self._query(
+            f"SELECT c.* FROM companies c {clause} ORDER BY c.naam_norm LIMIT ? OFFSET ?",
+            (*params, per_pagina, (pagina - 1) * per_pagina),
+        )
+        activities = self._sbi_for([row["kvk_nummer"] for row in rows])
+        return total, [self._as_company(row, activities.get(row["kvk_nummer"], [])) for row in rows]
+
+    async def get(self, kvk_nummer: str) -> Optional[dict]:
+        """Company by kvkNummer (its hoofdvestiging), or None when it is not in the extract"""
+        return await self._timed(self.get_sync, kvk_nummer)
+
+    async def search(self, **filters) -> Tuple[int, List[dict]]:
+        """Async wrapper for search_sync"""
+        return await self._timed(self.search_sync, **filters)
+
+    async def _timed(self, func, *args, **kwargs):
+        begun = time.perf_counter()
+        result = await asyncio.to_thread(func, *args, **kwargs)
+        self.stats["lookups"] += 1
+        self.stats["query_seconds_total"] += time.perf_counter() - begun
+        found = result[0] if isinstance(result, tuple) else result
+        self.stats["hits" if found else "misses"] += 1
+        return result
+
+    def get_stats(self) -> dict:
+        """Lookup counters and store size"""
+        lookups = self.stats["lookups"] or 1
+        return {
+            **self.stats,
+            "path": self.path,
+            "companies": self.count(),
+            "avg_query_ms": round(self.stats["query_seconds_total"] / lookups * 1000, 3),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Global bulk store instance (None when no extract has been configured)
+_store: Optional[KvKBulkStore] = None
+
+
+def get_kvk_bulk_store() -> Optional[KvKBulkStore]:
+    """Get the global bulk store, if KVK_BULK_DB_PATH points at an imported file"""
+    global _store
+    if _store is None and settings.KVK_BULK_DB_PATH and os.path.exists(settings.KVK_BULK_DB_PATH):
+        _store = KvKBulkStore(settings.KVK_BULK_DB_PATH)
+        logger.info(f"KVK bulk store loaded: {settings.KVK_BULK_DB_PATH}")
+    return _store
+
+
+def close_kvk_bulk_store():
+    """Close the global bulk store on shutdown"""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
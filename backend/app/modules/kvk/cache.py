@@ -0,0 +1,308 @@
+"""KVK - Two-tier profile cache with negative caching and single-flight"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+import httpx
+from loguru import logger
+
+from ...core.config import settings
+
+REDIS_AVAILABLE = False
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    pass
+
+
+BACKEND_MEMORY = "memory"
+BACKEND_DISK = "disk"
+BACKEND_REDIS = "redis"
+
+
+class KvKCache:
+    """
+    Cache for KvK API responses
+
+    Lookups go memory (LRU) -> persistent tier (Redis or JSON files on disk)
+    -> API. 404s are cached as well, for a shorter time, and replayed as an
+    ``httpx.HTTPStatusError`` so callers behave exactly as on a live 404.
+    Concurrent lookups of the same key share one API call.
+    """
+
+    # Freshness per endpoint in seconds
+    ENDPOINT_TTLS = {
+        "basisprofielen": 7 * 24 * 3600,
+        "vestigingsprofielen": 7 * 24 * 3600,
+        "naamgevingen": 7 * 24 * 3600,
+        "vestigingen": 3 * 24 * 3600,
+        "zoeken": 24 * 3600,
+    }
+    DEFAULT_TTL = 24 * 3600
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        memory_items: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        Args:
+            backend: "memory", "disk", "redis" or "auto" (Redis when the client
+                     library is installed, else disk)
+            cache_dir: Directory for the disk tier
+            memory_items: Size of the in-memory LRU
+            negative_ttl: How long a 404 is remembered (seconds)
+            redis_url: Redis connection URL (default: REDIS_URL)
+            enabled: Turn caching off entirely (single-flight stays on)
+        """
+        backend = (backend or settings.KVK_CACHE_BACKEND).lower()
+        if backend == "auto":
+            backend = BACKEND_REDIS if REDIS_AVAILABLE else BACKEND_DISK
+        if backend == BACKEND_REDIS and not REDIS_AVAILABLE:
+            logger.warning("KVK cache: redis package missing - using disk tier")
+            backend = BACKEND_DISK
+        self.backend = backend
+
+        self.cache_dir = cache_dir or settings.KVK_CACHE_DIR
+        self.memory_items = memory_items or settings.KVK_CACHE_MEMORY_ITEMS
+        self.negative_ttl = negative_ttl or settings.KVK_CACHE_NEGATIVE_TTL
+        self.enabled = settings.KVK_CACHE_ENABLED if enabled is None else enabled
+        self._redis_url = redis_url or settings.REDIS_URL
+        self._redis = None
+
+        self._memory: "OrderedDict[str, dict]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stored": 0,
+            "negative_stored": 0,
+            "errors": 0,
+        }
+
+    # ---------- Keys ----------
+
+    @classmethod
+    def endpoint_kind(cls, endpoint: str) -> str:
+        """TTL class of an endpoint path like "v1/basisprofielen/123/vestigingen" """
+        parts = [p for p in endpoint.split("/") if p]
+        if parts and parts[-1] == "vestigingen":
+            return "vestigingen"
+        return next((p for p in parts if p in cls.ENDPOINT_TTLS), endpoint)
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.ENDPOINT_TTLS.get(self.endpoint_kind(endpoint), self.DEFAULT_TTL)
+
+    @staticmethod
+    def key_for(endpoint: str, params: Optional[dict] = None) -> str:
+        query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+        return "kvk:" + hashlib.sha256(f"{endpoint}?{query}".encode()).hexdigest()
+
+    # ---------- Public API ----------
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+        fetch: Callable[[], Awaitable[dict]],
+        url: str = "",
+    ) -> dict:
+        """
+        Cached JSON for ``endpoint``, calling ``fetch`` on a miss
+
+        Raises:
+            httpx.HTTPStatusError: live or cached (negative) API error
+        """
+        key = self.key_for(endpoint, params)
+
+        if self.enabled:
+            entry = await self._lookup(key)
+            if entry is not None:
+                if entry["status"] == 404:
+                    self.stats["negative_hits"] += 1
+                    raise self._not_found(entry.get("url") or url)
+                return entry["data"]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._fetch_and_store(key, endpoint, fetch, url)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; nobody else has to
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_and_store(
+        self, key: str, endpoint: str, fetch: Callable[[], Awaitable[dict]], url: str
+    ) -> dict:
+        self.stats["misses"] += 1
+        try:
+            data = await fetch()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404 and self.enabled:
+                await self._store(key, {"status": 404, "url": str(e.request.url)}, self.negative_ttl)
+                self.stats["negative_stored"] += 1
+            raise
+
+        if self.enabled:
+            await self._store(key, {"status": 200, "data": data}, self.ttl_for(endpoint))
+            self.stats["stored"] += 1
+        return data
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters per tier"""
+        hits = self.stats["memory_hits"] + self.stats["persistent_hits"] + self.stats["negative_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "backend": self.backend,
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    async def close(self):
+        """Close the Redis connection, if any"""
+        if self._redis is not None:
+            close = getattr(self._redis, "aclose", None) or self._redis.close
+            await close()
+            self._redis = None
+
+    # ---------- Tiers ----------
+
+    async def _lookup(self, key: str) -> Optional[dict]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry["expires_at"] > time.time():
+                self._memory.move_to_end(key)
+                if entry["status"] == 200:
+                    self.stats["memory_hits"] += 1
+                return entry
+            del self._memory[key]
+
+        entry = await self._persistent_get(key)
+        if entry is not None and entry["expires_at"] > time.time():
+            self._remember(key, entry)
+            if entry["status"] == 200:
+                self.stats["persistent_hits"] += 1
+            return entry
+        return None
+
+    async def _store(self, key: str, entry: dict, ttl: int):
+        entry = {**entry, "expires_at": time.time() + ttl}
+        self._remember(key, entry)
+        await self._persistent_set(key, entry, ttl)
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    async def _persistent_get(self, key: str) -> Optional[dict]:
+        try:
+            if self.backend == BACKEND_REDIS:
+                raw = await self._get_redis().get(key)
+                return json.loads(raw) if raw else None
+            if self.backend == BACKEND_DISK:
+                return await asyncio.to_thread(self._read_file, key)
+        except Exception as e:
+            self._tier_error(e)
+        return None
+
+    async def _persistent_set(self, key: str, entry: dict, ttl: int):
+        try:
+            if self.backend == BACKEND_REDIS:
+                await self._get_redis().set(key, json.dumps(entry), ex=ttl)
+            elif self.backend == BACKEND_DISK:
+                await asyncio.to_thread(self._write_file, key, entry)
+        except Exception as e:
+            self._tier_error(e)
+
+    def _tier_error(self, error: Exception):
+        self.stats["errors"] += 1
+        if self.backend == BACKEND_REDIS:
+            logger.warning(f"KVK cache: Redis unavailable ({error}) - falling back to disk")
+            self.backend = BACKEND_DISK
+            self._redis = None
+        else:
+            logger.warning(f"KVK cache: {self.backend} tier error: {error}")
+
+    def _get_redis(self):
+        if self._redis is None:
+            self._redis = aioredis.from_url(self._redis_url, decode_responses=True)
+        return self._redis
+
+    def _path(self, key: str) -> str:
+        digest = key.split(":", 1)[-1]
+        return os.path.join(self.cache_dir, digest[:2], digest + ".json")
+
+    def _read_file(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_file(self, key: str, entry: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _not_found(url: str) -> httpx.HTTPStatusError:
+        request = httpx.Request("GET", url or "https://api.kvk.nl/")
+        response = httpx.Response(404, request=request)
+        return httpx.HTTPStatusError(
+            f"Client error '404 Not Found' for url '{request.url}' (cached)",
+            request=request,
+            response=response,
+        )
+
+
+# Global KvK cache instance
+_cache: Optional[KvKCache] = None
+
+
+def get_kvk_cache() -> KvKCache:
+    """Get the global KvK cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = KvKCache()
+    return _cache
+
+
+async def close_kvk_cache():
+    """Close the global KvK cache on shutdown"""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
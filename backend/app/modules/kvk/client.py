@@ -1,9 +1,17 @@
 """KVK Handelsregister API Client - Test & Production Support"""
+import asyncio
 import os
-from typing import Optional, List
+from typing import AsyncIterator, Dict, Iterable, Optional, List
 import httpx
 from loguru import logger
 
+from ...core.config import settings
+from ...core.http_clients import get_http_clients
+from ...core.ratelimit import TokenBucket
+from .bulk import KvKBulkStore, get_kvk_bulk_store
+from .cache import KvKCache, get_kvk_cache
+from .sbi import SBIFilter, get_sbi_filter
+
 from .models import (
     KvKSearchResult,
     KvKSearchResultItem,
@@ -39,14 +47,39 @@ class KvKClient:
     # Default test API key (public, for test environment only)
     DEFAULT_TEST_API_KEY = "l7xx1f2691f2520d487b902f4e0b57a0b197"
 
-    def __init__(self, api_key: Optional[str] = None, use_test: Optional[bool] = None):
+    # iter_search retries a failing page before giving up on the sweep
+    SEARCH_PAGE_ATTEMPTS = 3
+    SEARCH_RETRY_BACKOFF = 1.0  # seconds, doubled per attempt
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        use_test: Optional[bool] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        quota: Optional[TokenBucket] = None,
+        cache: Optional[KvKCache] = None,
+        bulk: Optional[KvKBulkStore] = None,
+        sbi_filter: Optional[SBIFilter] = None,
+    ):
         """
         Initialize KVK client
 
         Args:
             api_key: KVK API key (uses env KVK_API_KEY or test key if not provided)
             use_test: Use test API (default: checks KVK_USE_PRODUCTION env var)
+            http_client: Pooled client (default: the shared "kvk" client)
+            quota: Rate limiter for API calls (default: the shared KvK quota)
+            cache: Response cache (default: the shared KvK cache)
+            bulk: Local bulk-extract store consulted before the API
+                  (default: the KVK_BULK_DB_PATH store, if any)
+            sbi_filter: Trade filter for search_vakmensen results
+                        (default: the shared filter when KVK_SBI_FILTER is on)
         """
+        self._http_client = http_client
+        self.quota = quota or get_kvk_quota()
+        self.cache = cache or get_kvk_cache()
+        self.bulk = bulk or get_kvk_bulk_store()
+        self.sbi_filter = sbi_filter or (get_sbi_filter() if settings.KVK_SBI_FILTER else None)
         # Determine if we should use production
         if use_test is None:
             # Check environment variable
@@ -74,18 +107,32 @@ class KvKClient:
         logger.info(f"KVK client initialized ({mode} mode, base={self.base_url})")
 
     async def _request(self, endpoint: str, params: Optional[dict] = None) -> dict:
-        """Make authenticated request to KVK API"""
+        """Make authenticated request to KVK API (served from the cache when possible)"""
+        url = f"{self.base_url}/{endpoint}"
+        return await self.cache.get_or_fetch(
+            f"{'test' if self.use_test else 'prod'}/{endpoint}",
+            params,
+            lambda: self._fetch(url, params),
+            url=url,
+        )
+
+    async def _fetch(self, url: str, params: Optional[dict] = None) -> dict:
+        """Live API call; only cache misses spend quota"""
         headers = {
             "apikey": self.api_key,
             "Accept": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{self.base_url}/{endpoint}"
-            logger.debug(f"KVK Request: {url}")
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        await self.quota.acquire()
+        logger.debug(f"KVK Request: {url}")
+        response = await self.http_client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one"""
+        return self._http_client or get_http_clients().get("kvk")
 
     async def search(
         self,
@@ -100,6 +147,7 @@ class KvKClient:
         type_filter: Optional[str] = None,
         pagina: int = 1,
         per_pagina: int = 10,
+        raise_errors: bool = False,
     ) -> KvKSearchResult:
         """
         Search KVK Handelsregister (v2 API)
@@ -116,10 +164,21 @@ class KvKClient:
             type_filter: hoofdvestiging, nevenvestiging, rechtspersoon
             pagina: Page number
             per_pagina: Results per page (max 100)
+            raise_errors: Re-raise API errors instead of returning an empty
+                          result (a 404 still means "no results")
 
         Returns:
             KvKSearchResult with matching companies
         """
+        # The bulk store covers the name/location filters; the rest go to the API
+        if self.bulk is not None and not (vestigingsnummer or handelsnaam or straatnaam or huisnummer):
+            local = await self._search_bulk(
+                query=query, kvk_nummer=kvk_nummer, postcode=postcode, plaats=plaats,
+                type_filter=type_filter, pagina=pagina, per_pagina=per_pagina,
+            )
+            if local is not None:
+                return local
+
         params = {
             "pagina": pagina,
             "resultatenperpagina": min(per_pagina, 100),
@@ -169,10 +228,105 @@ class KvKClient:
                 ],
             )
         except httpx.HTTPStatusError as e:
+            if raise_errors and e.response.status_code != 404:
+                raise
             logger.error(f"KVK Search failed: {e}")
             # Return empty result on error
             return KvKSearchResult(pagina=1, resultatenPerPagina=10, totaal=0, resultaten=[])
 
+    async def _search_bulk(self, per_pagina: int = 10, **filters) -> Optional[KvKSearchResult]:
+        """Search result from the bulk store, or None when it has no match"""
+        per_pagina = min(per_pagina, 100)
+        total, companies = await self.bulk.search(per_pagina=per_pagina, **filters)
+        if not total:
+            return None
+        return KvKSearchResult(
+            pagina=filters.get("pagina", 1),
+            resultatenPerPagina=per_pagina,
+            totaal=total,
+            resultaten=[
+                KvKSearchResultItem(
+                    kvkNummer=c["kvkNummer"],
+                    vestigingsnummer=c["vestigingsnummer"],
+                    naam=c["naam"],
+                    adres=c["adres"],
+                    type=c["type"] or "onbekend",
+                    sbiActiviteiten=[KvKSbiActiviteit(**sbi) for sbi in c["sbiActiviteiten"]] or None,
+                )
+                for c in companies
+            ],
+        )
+
+    async def iter_search(
+        self,
+        per_pagina: int = 100,
+        max_results: Optional[int] = None,
+        **filters,
+    ) -> AsyncIterator[KvKSearchResultItem]:
+        """
+        Stream search results across all pages
+
+        Page N+1 is requested while the caller consumes page N. Iteration
+        stops at ``totaal`` (or ``max_results``) and skips repeated
+        kvkNummer/vestigingsnummer pairs, so only one page is held at a time.
+        Transient page errors are retried; a page that keeps failing raises
+        instead of being mistaken for the last page.
+
+        Args:
+            per_pagina: Page size (max 100)
+            max_results: Stop after this many unique results
+            **filters: Any search() filter (query, plaats, postcode, type_filter, ...)
+
+        Yields:
+            KvKSearchResultItem per unique result
+
+        Raises:
+            httpx.HTTPError: a page still failed after SEARCH_PAGE_ATTEMPTS
+        """
+        per_pagina = min(per_pagina, 100)
+        seen = set()
+        yielded = 0
+        pagina = 1
+        next_page = asyncio.create_task(self._search_page(pagina, per_pagina, filters))
+
+        try:
+            while next_page is not None:
+                result = await next_page
+                next_page = None
+
+                has_more = bool(result.resultaten) and pagina * per_pagina < result.totaal
+                if has_more and (max_results is None or yielded < max_results):
+                    next_page = asyncio.create_task(self._search_page(pagina + 1, per_pagina, filters))
+
+                for item in result.resultaten:
+                    key = (item.kvkNummer, item.vestigingsnummer)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield item
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+
+                pagina += 1
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _search_page(self, pagina: int, per_pagina: int, filters: dict) -> KvKSearchResult:
+        """One iter_search page, retrying 429/5xx and network errors with backoff"""
+        for attempt in range(1, self.SEARCH_PAGE_ATTEMPTS + 1):
+            try:
+                return await self.search(pagina=pagina, per_pagina=per_pagina, raise_errors=True, **filters)
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                transient = status is None or status == 429 or status >= 500
+                if not transient or attempt == self.SEARCH_PAGE_ATTEMPTS:
+                    logger.error(f"KVK Search page {pagina} failed: {e}")
+                    raise
+                logger.warning(f"KVK Search page {pagina} failed (attempt {attempt}), retrying: {e}")
+                await asyncio.sleep(self.SEARCH_RETRY_BACKOFF * 2 ** (attempt - 1))
+
     async def get_basisprofiel(self, kvk_nummer: str) -> Optional[KvKBasisprofiel]:
         """
         Get company basic profile (v1 API)
@@ -183,6 +337,29 @@ class KvKClient:
         Returns:
             KvKBasisprofiel with company details, or None on error
         """
+        # A speculative prefetch for this number may already be on its way
+        inflight = _prefetch_tasks.get(kvk_nummer)
+        if inflight is not None and not inflight.done() and inflight is not asyncio.current_task():
+            _prefetch_stats["joined"] += 1
+            return await asyncio.shield(inflight)
+
+        if self.bulk is not None:
+            company = await self.bulk.get(kvk_nummer)
+            if company is not None:
+                return KvKBasisprofiel(
+                    kvkNummer=company["kvkNummer"],
+                    naam=company["naam"],
+                    formeleRegistratiedatum=company["formeleRegistratiedatum"],
+                    totaalWerkzamePersonen=company["totaalWerkzamePersonen"],
+                    handelsnamen=company["handelsnamen"],
+                    sbiActiviteiten=[KvKSbiActiviteit(**sbi) for sbi in company["sbiActiviteiten"]],
+                    rechtsvorm=company["rechtsvorm"],
+                    hoofdvestiging={
+                        "vestigingsnummer": company["vestigingsnummer"],
+                        "adressen": [company["adres"]["binnenlandsAdres"]],
+                    },
+                )
+
         try:
             data = await self._request(f"v1/basisprofielen/{kvk_nummer}")
 
@@ -279,33 +456,76 @@ class KvKClient:
             sbi_code: Specific SBI code to search
 
         Returns:
-            KvKSearchResult with matching contractors
+            KvKSearchResult with matching contractors; ``rejected`` counts
+            hits dropped because none of their SBI codes is a trade
+        """
+        result = None
+        # SBI filtering is only possible against the bulk store
+        if sbi_code and self.bulk is not None:
+            result = await self._search_bulk(
+                query=self._trade_query(vakgebied),
+                plaats=plaats,
+                type_filter="hoofdvestiging",
+                sbi_prefixes=[sbi_code],
+            )
+        if result is None:
+            result = await self.search(
+                query=self._trade_query(vakgebied),
+                plaats=plaats,
+                type_filter="hoofdvestiging",
+            )
+
+        if self.sbi_filter is not None:
+            result.resultaten, result.rejected = self.sbi_filter.filter(result.resultaten, vakgebied)
+        return result
+
+    async def iter_vakmensen(
+        self,
+        plaats: Optional[str] = None,
+        vakgebied: Optional[str] = None,
+        max_results: Optional[int] = None,
+    ) -> AsyncIterator[KvKSearchResultItem]:
         """
-        # Build search query
-        search_query = None
-        if vakgebied:
-            # Map Dutch trade names to search terms
-            trade_terms = {
-                "loodgieter": "loodgieter",
-                "elektra": "elektr",
-                "elektrician": "elektr",
-                "schilder": "schilder",
-                "timmerman": "timmer",
-                "dakdekker": "dakdek",
-                "tuinman": "hovenier",
-                "schoonmaak": "schoonmaak",
-                "metselaar": "metsel",
-                "stukadoor": "stukadoor",
-                "bouw": "bouw",
-                "aannemer": "aannemer",
-            }
-            search_query = trade_terms.get(vakgebied.lower(), vakgebied)
-
-        return await self.search(
-            query=search_query,
+        Stream every vakman hoofdvestiging for a location and trade
+
+        Same filters as search_vakmensen (including the SBI trade filter),
+        but over all result pages. ``max_results`` counts accepted results.
+        """
+        yielded = 0
+        async for item in self.iter_search(
+            query=self._trade_query(vakgebied),
             plaats=plaats,
             type_filter="hoofdvestiging",
-        )
+        ):
+            if self.sbi_filter is not None and self.sbi_filter.check(item.sbiActiviteiten, vakgebied) is False:
+                continue
+            yield item
+            yielded += 1
+            if max_results is not None and yielded >= max_results:
+                return
+
+    # Map Dutch trade names to search terms
+    TRADE_TERMS = {
+        "loodgieter": "loodgieter",
+        "elektra": "elektr",
+        "elektrician": "elektr",
+        "schilder": "schilder",
+        "timmerman": "timmer",
+        "dakdekker": "dakdek",
+        "tuinman": "hovenier",
+        "schoonmaak": "schoonmaak",
+        "metselaar": "metsel",
+        "stukadoor": "stukadoor",
+        "bouw": "bouw",
+        "aannemer": "aannemer",
+    }
+
+    @classmethod
+    def _trade_query(cls, vakgebied: Optional[str]) -> Optional[str]:
+        """Search term for a trade category"""
+        if not vakgebied:
+            return None
+        return cls.TRADE_TERMS.get(vakgebied.lower(), vakgebied)
 
     async def get_company_details(self, kvk_nummer: str) -> dict:
         """
@@ -317,12 +537,13 @@ class KvKClient:
         Returns:
             Complete company profile with vestigingen
         """
-        basisprofiel = await self.get_basisprofiel(kvk_nummer)
+        basisprofiel, vestigingen = await asyncio.gather(
+            self.get_basisprofiel(kvk_nummer),
+            self.get_vestigingen(kvk_nummer),
+        )
         if not basisprofiel:
             return {}
 
-        vestigingen = await self.get_vestigingen(kvk_nummer)
-
         return {
             "kvkNummer": basisprofiel.kvkNummer,
             "naam": basisprofiel.naam,
@@ -338,3 +559,80 @@ class KvKClient:
             "hoofdvestiging": basisprofiel.hoofdvestiging,
             "vestigingen": vestigingen,
         }
+
+    def prefetch_basisprofielen(self, kvk_nummers: Iterable[str], limit: Optional[int] = None) -> int:
+        """
+        Warm basisprofielen in the background (speculative, best effort)
+
+        Only numbers not already being fetched are scheduled, and only while
+        the quota keeps KVK_PREFETCH_RESERVE tokens free for interactive
+        requests. A later get_basisprofiel for the same number joins the
+        in-flight fetch or hits the response cache.
+
+        Args:
+            kvk_nummers: Candidates in priority order (e.g. search hits)
+            limit: Maximum number to schedule (default: KVK_PREFETCH_TOP_N)
+
+        Returns:
+            Number of prefetches scheduled
+        """
+        limit = settings.KVK_PREFETCH_TOP_N if limit is None else limit
+        scheduled = 0
+
+        for kvk_nummer in kvk_nummers:
+            if scheduled >= limit:
+                break
+            if kvk_nummer in _prefetch_tasks:
+                _prefetch_stats["skipped_inflight"] += 1
+                continue
+            # Each scheduled fetch will take a token; keep the reserve intact
+            if self.quota.tokens - scheduled < settings.KVK_PREFETCH_RESERVE + 1:
+                _prefetch_stats["skipped_quota"] += 1
+                break
+
+            task = asyncio.create_task(self._prefetch_one(kvk_nummer))
+            _prefetch_tasks[kvk_nummer] = task
+            task.add_done_callback(lambda _, n=kvk_nummer: _prefetch_tasks.pop(n, None))
+            scheduled += 1
+
+        _prefetch_stats["scheduled"] += scheduled
+        return scheduled
+
+    async def _prefetch_one(self, kvk_nummer: str) -> Optional[KvKBasisprofiel]:
+        try:
+            profile = await self.get_basisprofiel(kvk_nummer)
+        except Exception as e:
+            logger.debug(f"KVK prefetch failed for {kvk_nummer}: {e}")
+            _prefetch_stats["failed"] += 1
+            return None
+        _prefetch_stats["completed" if profile else "failed"] += 1
+        return profile
+
+
+# Speculative prefetches in flight, shared across client instances
+_prefetch_tasks: Dict[str, "asyncio.Task"] = {}
+_prefetch_stats = {
+    "scheduled": 0,
+    "completed": 0,
+    "failed": 0,
+    "joined": 0,
+    "skipped_inflight": 0,
+    "skipped_quota": 0,
+}
+
+
+def get_prefetch_stats() -> dict:
+    """Speculative prefetch counters"""
+    return {**_prefetch_stats, "in_flight": len(_prefetch_tasks)}
+
+
+# Global KvK quota (shared by every client instance)
+_quota: Optional[TokenBucket] = None
+
+
+def get_kvk_quota() -> TokenBucket:
+    """Get the global KvK API token bucket"""
+    global _quota
+    if _quota is None:
+        _quota = TokenBucket(settings.KVK_RATE_PER_SECOND, settings.KVK_RATE_BURST)
+    return _quota
@@ -83,6 +83,7 @@ class KvKSearchResult(BaseModel):
     resultatenPerPagina: int = 10
     totaal: int = 0
     resultaten: List[KvKSearchResultItem] = Field(default_factory=list)
+    rejected: int = 0  # results dropped by the SBI trade filter
 
 
 class KvKSearchRequest(BaseModel):
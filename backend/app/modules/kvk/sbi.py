@@ -0,0 +1,165 @@
+"""KVK - SBI taxonomy index for skipping non-trade companies"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import KvKSbiActiviteit, KvKSearchResultItem
+
+# Trade-relevant SBI 2008 prefixes. A prefix covers every code below it in
+# the hierarchy ("43" = all specialised construction, "812" = all cleaning).
+TRADE_SBI = {
+    "412": "Algemene burgerlijke en utiliteitsbouw",
+    "43": "Gespecialiseerde werkzaamheden in de bouw",
+    "4321": "Elektrotechnische bouwinstallatie",
+    "4322": "Loodgieters- en fitterswerk; installatie van sanitair en verwarming",
+    "4329": "Overige bouwinstallatie",
+    "4331": "Stukadoren",
+    "4332": "Bouwtimmeren",
+    "4333": "Afwerking van vloeren en wanden",
+    "4334": "Schilderen en glaszetten",
+    "4339": "Overige afwerking van gebouwen",
+    "4391": "Dakdekken en bouwen van dakconstructies",
+    "4399": "Overige gespecialiseerde werkzaamheden in de bouw",
+    "4942": "Verhuisvervoer",
+    "812": "Reiniging",
+    "8130": "Landschapsverzorging",
+}
+
+# Narrower prefixes per vakgebied (keys match KvKClient.TRADE_TERMS)
+VAKGEBIED_SBI = {
+    "loodgieter": ("4322",),
+    "elektra": ("4321",),
+    "elektrician": ("4321",),
+    "schilder": ("4334",),
+    "timmerman": ("4332", "412"),
+    "dakdekker": ("4391",),
+    "tuinman": ("8130",),
+    "schoonmaak": ("812",),
+    "metselaar": ("4399", "412"),
+    "stukadoor": ("4331",),
+    "bouw": ("412", "43"),
+    "aannemer": ("412", "43"),
+}
+
+
+class SBITrie:
+    """
+    Digit trie over SBI code prefixes
+
+    ``match`` walks a code digit by digit and returns the most specific
+    prefix it passes, so a lookup costs at most len(code) dict hops no
+    matter how many prefixes are indexed.
+    """
+
+    def __init__(self, prefixes: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            prefixes: SBI prefix -> label (default: TRADE_SBI)
+        """
+        self._root: dict = {}
+        for prefix, label in (TRADE_SBI if prefixes is None else prefixes).items():
+            self.add(prefix, label)
+
+    def add(self, prefix: str, label: str = ""):
+        node = self._root
+        for digit in prefix:
+            node = node.setdefault(digit, {})
+        node[None] = (prefix, label)
+
+    def match(self, code: str) -> Optional[Tuple[str, str]]:
+        """Most specific (prefix, label) covering ``code``, or None"""
+        node, found = self._root, None
+        for digit in str(code).replace(".", "").strip():
+            node = node.get(digit)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    def __contains__(self, code: str) -> bool:
+        return self.match(code) is not None
+
+
+class SBIFilter:
+    """
+    Keeps only companies with at least one trade SBI activity
+
+    Companies without SBI data (the live zoeken API usually omits it) are
+    kept and counted as ``unknown``; they can be checked again once their
+    basisprofiel has been fetched. Counters accumulate across calls.
+    """
+
+    def __init__(self, trie: Optional[SBITrie] = None):
+        self.trie = trie or SBITrie()
+        self._narrowed: Dict[Tuple[str, ...], SBITrie] = {}
+        self.stats = {
+            "checked": 0,
+            "accepted": 0,
+            "rejected": 0,
+            "unknown": 0,
+        }
+
+    def for_vakgebied(self, vakgebied: Optional[str]) -> SBITrie:
+        """Trie restricted to one trade, or the full trade trie"""
+        prefixes = VAKGEBIED_SBI.get((vakgebied or "").lower())
+        if not prefixes:
+            return self.trie
+        if prefixes not in self._narrowed:
+            self._narrowed[prefixes] = SBITrie({p: TRADE_SBI.get(p, "") for p in prefixes})
+        return self._narrowed[prefixes]
+
+    def check(
+        self, activities: Optional[Iterable[KvKSbiActiviteit]], vakgebied: Optional[str] = None
+    ) -> Optional[bool]:
+        """
+        Whether a company's SBI activities include a trade
+
+        Returns:
+            True/False, or None when there are no activities to judge
+        """
+        codes = [a.sbiCode for a in (activities or [])]
+        self.stats["checked"] += 1
+        if not codes:
+            self.stats["unknown"] += 1
+            return None
+        trie = self.for_vakgebied(vakgebied)
+        if any(code in trie for code in codes):
+            self.stats["accepted"] += 1
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def filter(
+        self, items: Iterable[KvKSearchResultItem], vakgebied: Optional[str] = None
+    ) -> Tuple[List[KvKSearchResultItem], int]:
+        """
+        Drop search results whose SBI codes are all non-trade
+
+        Returns:
+            (kept items, number rejected)
+        """
+        kept, rejected = [], 0
+        for item in items:
+            if self.check(item.sbiActiviteiten, vakgebied) is False:
+                rejected += 1
+            else:
+                kept.append(item)
+        return kept, rejected
+
+    def get_stats(self) -> dict:
+        """Counters since startup"""
+        judged = self.stats["accepted"] + self.stats["rejected"]
+        return {
+            **self.stats,
+            "rejection_rate": round(self.stats["rejected"] / judged, 3) if judged else 0.0,
+        }
+
+
+# Global SBI filter instance
+_filter: Optional[SBIFilter] = None
+
+
+def get_sbi_filter() -> SBIFilter:
+    """Get the global SBI filter instance"""
+    global _filter
+    if _filter is None:
+        _filter = SBIFilter()
+    return _filter
@@ -0,0 +1,300 @@
+"""KVK - Concurrent scan engine: fetch, classify and save in parallel"""
+import asyncio
+import time
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+from uuid import uuid4
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...db import Database, get_db
+from ...models import ProfileRing, ScrapedData
+from ..brain import BrainClassifier
+from ..hook import HookGenerator
+from .client import KvKClient
+from .models import KvKBasisprofiel
+from .sbi import SBIFilter
+
+T = TypeVar("T")
+
+STAGES = ("fetch", "classify", "save")
+
+
+class KvKScanEngine:
+    """
+    Runs a list of KvK numbers through fetch -> classify -> save concurrently
+
+    KvK fetches and LLM classifications each get their own concurrency limit
+    (the KvK quota itself is enforced by the client's token bucket). Profiles
+    get their UUIDs up front, so outreach can be generated before the insert
+    and both are written in batches of ``batch_size`` with a single flush,
+    each inside its own savepoint. The session is only ever touched by one
+    batch at a time.
+
+    With an ``sbi_filter`` (for numbers that came out of a search, e.g. a
+    sweep), companies whose SBI codes are all non-trade are rejected after
+    the fetch, before they cost an LLM call, and listed as rejected in the
+    results. Without one, every number is scanned as given.
+    """
+
+    def __init__(
+        self,
+        client: Optional[KvKClient] = None,
+        classifier: Optional[BrainClassifier] = None,
+        generator: Optional[HookGenerator] = None,
+        db: Optional[Database] = None,
+        fetch_concurrency: Optional[int] = None,
+        classify_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        sbi_filter: Optional[SBIFilter] = None,
+    ):
+        self.client = client or KvKClient()
+        self.classifier = classifier or BrainClassifier()
+        self.generator = generator or HookGenerator()
+        self.db = db or get_db()
+        self.fetch_concurrency = fetch_concurrency or settings.KVK_SCAN_FETCH_CONCURRENCY
+        self.classify_concurrency = classify_concurrency or settings.KVK_SCAN_CLASSIFY_CONCURRENCY
+        self.batch_size = batch_size or settings.KVK_SCAN_BATCH_SIZE
+        self.sbi_filter = sbi_filter
+
+    @staticmethod
+    def profile_text(profile: KvKBasisprofiel) -> str:
+        """Text handed to the classifier for a KvK profile"""
+        return f"""
+            Bedrijfsnaam: {profile.naam}
+            KvK-nummer: {profile.kvkNummer}
+            Registratiedatum: {profile.formeleRegistratiedatum}
+            Activiteiten: {', '.join(s.sbiOmschrijving for s in (profile.sbiActiviteiten or []))}
+            """
+
+    @staticmethod
+    async def _iterate(kvk_nummers: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        if hasattr(kvk_nummers, "__aiter__"):
+            async for kvk_nummer in kvk_nummers:
+                yield kvk_nummer
+        else:
+            for kvk_nummer in kvk_nummers:
+                yield kvk_nummer
+
+    async def scan(
+        self,
+        session: AsyncSession,
+        kvk_nummers: Union[Iterable[str], AsyncIterable[str]],
+        auto_generate_outreach: bool = True,
+        keep_results: bool = True,
+    ) -> dict:
+        """
+        Scan KvK numbers concurrently
+
+        Numbers are pulled from ``kvk_nummers`` only as fast as the pipeline
+        drains, so an async generator (e.g. KvKClient.iter_search) streams
+        through with a bounded number of profiles in memory. If that source
+        fails part-way, the numbers already pulled are still finished and
+        saved and the error is reported as ``source_error``.
+
+        Args:
+            session: Database session the profiles are written to (not committed)
+            kvk_nummers: KvK numbers to scan (list or async iterable)
+            auto_generate_outreach: Also generate and store outreach messages
+            keep_results: Return per-number results; turn off for large sweeps
+
+        Returns:
+            Dict with a ring summary, per-number results (input order, when
+            kept), per-stage timing and ``source_error`` (None when the whole
+            input was scanned)
+        """
+        started = time.perf_counter()
+        fetch_slots = asyncio.Semaphore(self.fetch_concurrency)
+        classify_slots = asyncio.Semaphore(self.classify_concurrency)
+        window = asyncio.Semaphore(self.fetch_concurrency + self.classify_concurrency)
+        save_lock = asyncio.Lock()
+
+        timing = {stage: {"count": 0, "seconds": 0.0, "wait_seconds": 0.0} for stage in STAGES}
+        results: List[Optional[dict]] = []
+        pending: List[Tuple[int, dict, Optional[dict]]] = []
+        summary = {"scanned": 0, "succeeded": 0, "failed": 0, "rejected": 0, "by_ring": {}}
+
+        def record(index: int, result: dict):
+            if keep_results:
+                results[index] = result
+
+        def count(result: dict, delta: int = 1):
+            if result["success"]:
+                summary["succeeded"] += delta
+                ring = summary["by_ring"]
+                ring[result["ring"]] = ring.get(result["ring"], 0) + delta
+            elif result.get("rejected"):
+                summary["rejected"] += delta
+            else:
+                summary["failed"] += delta
+
+        async def timed(stage: str, slots: asyncio.Semaphore, coro: Awaitable[T]) -> T:
+            queued = time.perf_counter()
+            async with slots:
+                begun = time.perf_counter()
+                try:
+                    return await coro
+                finally:
+                    timing[stage]["count"] += 1
+                    timing[stage]["seconds"] += time.perf_counter() - begun
+                    timing[stage]["wait_seconds"] += begun - queued
+
+        async def flush():
+            async with save_lock:
+                batch = pending[:]
+                pending.clear()
+                if not batch:
+                    return
+                begun = time.perf_counter()
+                try:
+                    # A savepoint per batch keeps a failed insert from poisoning the
+                    # transaction for later batches and the caller's commit
+                    async with session.begin_nested():
+                        await self.db.save_profiles(session, [data for _, data, _ in batch])
+                        outreach = [o for _, _, o in batch if o]
+                        if outreach:
+                            await self.db.save_outreach_batch(session, outreach)
+                except Exception as e:
+                    logger.error(f"KVK scan: saving batch of {len(batch)} failed: {e}")
+                    for index, data, _ in batch:
+                        summary["succeeded"] -= 1
+                        summary["by_ring"][data["ring"]] -= 1
+                        failure = {"kvkNummer": data["kvk_number"], "success": False, "error": str(e)}
+                        count(failure)
+                        record(index, failure)
+                finally:
+                    timing["save"]["count"] += len(batch)
+                    timing["save"]["seconds"] += time.perf_counter() - begun
+
+        async def process(index: int, kvk_nummer: str):
+            try:
+                # Get profile from KVK
+                profile = await timed("fetch", fetch_slots, self.client.get_basisprofiel(kvk_nummer))
+                if profile is None:
+                    raise LookupError(f"KVK nummer {kvk_nummer} niet gevonden")
+
+                if self.sbi_filter is not None and self.sbi_filter.check(profile.sbiActiviteiten) is False:
+                    rejected = {
+                        "kvkNummer": kvk_nummer,
+                        "success": False,
+                        "rejected": True,
+                        "reason": "geen vakgebied SBI-code",
+                        "sbi": [s.sbiCode for s in profile.sbiActiviteiten],
+                    }
+                    count(rejected)
+                    record(index, rejected)
+                    return
+
+                text_content = self.profile_text(profile)
+                scraped = ScrapedData(
+                    url=f"kvk://{kvk_nummer}",
+                    text_content=text_content,
+                    source_type="kvk",
+                    metadata={"kvk_nummer": kvk_nummer},
+                )
+
+                # Classify
+                classification = await timed("classify", classify_slots, self.classifier.classify(scraped))
+
+                profile_id = uuid4()
+                profile_data = {
+                    "id": profile_id,
+                    "source_url": f"kvk://{kvk_nummer}",
+                    "source_type": "kvk",
+                    "name": profile.naam,
+                    "kvk_number": kvk_nummer,
+                    "ring": classification.ring.value,
+                    "quality_score": classification.quality_score,
+                    "confidence": classification.confidence,
+                    "classification_reasoning": classification.reasoning,
+                    "extracted_data": {
+                        "kvk_nummer": kvk_nummer,
+                        "sbi_activiteiten": [s.sbiCode for s in (profile.sbiActiviteiten or [])],
+                    },
+                    "raw_text": text_content,
+                    "classified_at": datetime.utcnow(),
+                }
+
+                result = {
+                    "kvkNummer": kvk_nummer,
+                    "success": True,
+                    "profile_id": str(profile_id),
+                    "ring": classification.ring.value,
+                    "ring_name": ProfileRing(classification.ring).name,
+                    "quality_score": classification.quality_score,
+                }
+
+                # Generate outreach
+                outreach = None
+                if auto_generate_outreach:
+                    message = self.generator.generate(profile_id, classification)
+                    outreach = {
+                        "profile_id": message.profile_id,
+                        "ring": message.ring.value,
+                        "channel": message.channel,
+                        "template_type": message.template_type,
+                        "subject": message.subject,
+                        "body": message.body,
+                        "personalization_tokens": message.personalization_tokens,
+                    }
+                    result["outreach_channel"] = message.channel
+
+                count(result)
+                record(index, result)
+                pending.append((index, profile_data, outreach))
+                logger.info(f"KVK scan: {kvk_nummer} -> Ring {classification.ring.value}")
+
+                if len(pending) >= self.batch_size:
+                    await flush()
+
+            except Exception as e:
+                failure = {
+                    "kvkNummer": kvk_nummer,
+                    "success": False,
+                    "error": str(e),
+                }
+                count(failure)
+                record(index, failure)
+                logger.error(f"KVK scan failed for {kvk_nummer}: {e}")
+            finally:
+                window.release()
+
+        tasks = []
+        source_error = None
+        try:
+            async for kvk_nummer in self._iterate(kvk_nummers):
+                await window.acquire()
+                if keep_results:
+                    results.append(None)
+                tasks.append(asyncio.create_task(process(summary["scanned"], kvk_nummer)))
+                summary["scanned"] += 1
+                if len(tasks) >= 4 * self.batch_size:
+                    tasks = [t for t in tasks if not t.done()]
+        except Exception as e:
+            source_error = str(e)
+            logger.error(f"KVK scan: input stopped after {summary['scanned']} numbers: {e}")
+        await asyncio.gather(*tasks)
+        await flush()
+
+        total = time.perf_counter() - started
+        return {
+            **summary,
+            "results": results if keep_results else None,
+            "source_error": source_error,
+            "timing": {
+                "total_seconds": round(total, 3),
+                **{stage: self._summarize(stats) for stage, stats in timing.items()},
+            },
+            "quota": self.client.quota.get_stats(),
+        }
+
+    @staticmethod
+    def _summarize(stats: Dict[str, float]) -> dict:
+        count = stats["count"] or 1
+        return {
+            "count": stats["count"],
+            "seconds": round(stats["seconds"], 3),
+            "wait_seconds": round(stats["wait_seconds"], 3),
+            "avg_ms": round(stats["seconds"] / count * 1000, 1),
+        }
@@ -1,5 +1,17 @@
 """RADAR Module - The Eyes of Solvari"""
 from .scraper import RadarScraper
 from .stealth import StealthConfig
+from .pool import BrowserPool, get_browser_pool, init_browser_pool, close_browser_pool
+from .fetcher import TieredFetcher, get_tiered_fetcher, close_tiered_fetcher
 
-__all__ = ["RadarScraper", "StealthConfig"]
+__all__ = [
+    "RadarScraper",
+    "StealthConfig",
+    "BrowserPool",
+    "get_browser_pool",
+    "init_browser_pool",
+    "close_browser_pool",
+    "TieredFetcher",
+    "get_tiered_fetcher",
+    "close_tiered_fetcher",
+]
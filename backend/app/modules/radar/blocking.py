@@ -0,0 +1,68 @@
+"""RADAR - Request interception for lean page renders"""
+from typing import Any, Dict
+from loguru import logger
+
+from .stealth import StealthConfig
+
+
+# Typical transfer sizes, used to estimate what an aborted request would have cost
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 80_000,
+    "media": 750_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+
+class RequestBlocker:
+    """
+    Playwright route handler that aborts unneeded requests
+
+    Images, media, fonts, stylesheets and tracker hosts (per StealthConfig)
+    are aborted before they hit the network. Counters keep track of how many
+    requests were blocked and roughly how many bytes that saved.
+    """
+
+    def __init__(self, config: StealthConfig):
+        self.config = config
+        self.stats: Dict[str, Any] = {
+            "requests_allowed": 0,
+            "requests_blocked": 0,
+            "bytes_saved_estimate": 0,
+            "blocked_by_type": {},
+        }
+
+    async def install(self, page):
+        """Route every request of ``page`` through this blocker"""
+        if self.config.block_resources:
+            await page.route("**/*", self.handle)
+
+    async def handle(self, route):
+        """Abort or continue a single intercepted request"""
+        request = route.request
+        resource_type = request.resource_type
+
+        if not self.config.should_block(resource_type, request.url):
+            self.stats["requests_allowed"] += 1
+            await route.continue_()
+            return
+
+        self.stats["requests_blocked"] += 1
+        self.stats["bytes_saved_estimate"] += ESTIMATED_RESOURCE_BYTES.get(
+            resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        by_type = self.stats["blocked_by_type"]
+        by_type[resource_type] = by_type.get(resource_type, 0) + 1
+
+        try:
+            await route.abort("blockedbyclient")
+        except Exception as e:
+            logger.debug(f"Route abort failed for {request.url}: {e}")
+
+    def get_stats(self) -> dict:
+        """Blocked/allowed counters"""
+        return {**self.stats, "blocked_by_type": dict(self.stats["blocked_by_type"])}
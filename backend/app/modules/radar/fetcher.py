@@ -0,0 +1,191 @@
+"""RADAR - Tiered fetching: plain HTTP first, browser only when needed"""
+import re
+from dataclasses import dataclass
+from typing import Optional, Dict
+from urllib.parse import urlparse
+import httpx
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from ...core.http_cache import ResponseCache, get_response_cache, is_not_challenge_page
+from ...core.http_clients import get_http_clients
+from ...core.parsing import parse
+from .stealth import StealthConfig, create_stealth_config
+
+
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+# Markers of pages that only render their content client-side
+JS_REQUIRED_PATTERNS = re.compile(
+    r"enable javascript|javascript is (?:required|disabled)|schakel javascript in"
+    r"|javascript (?:moet|dient) (?:ingeschakeld|aan)|cf-browser-verification|just a moment\.\.\.",
+    re.I,
+)
+EMPTY_APP_ROOT = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>",
+    re.I,
+)
+
+
+def extract_text(html: str) -> str:
+    """Strip scripts, styles and chrome and return the visible page text"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove scripts and styles
+    for element in soup(["script", "style", "nav", "footer"]):
+        element.decompose()
+
+    return soup.get_text(separator="\n", strip=True)
+
+
+def extract_title(html: str) -> Optional[str]:
+    """Cheap <title> lookup without building a DOM"""
+    match = re.search(r"<title[^>]*>(.*?)</title>", html, re.I | re.S)
+    return match.group(1).strip() if match else None
+
+
+@dataclass
+class StaticPage:
+    """Result of a successful plain-HTTP fetch"""
+    html: str
+    text: str
+    title: Optional[str]
+    final_url: str
+
+
+class TieredFetcher:
+    """
+    Fetch tier in front of the browser
+
+    Every URL is first tried with a pooled httpx GET. When the static text is
+    too thin or the page clearly depends on JavaScript, the caller escalates
+    to Playwright. The outcome is remembered per domain, so domains that need
+    a browser skip the HTTP attempt next time and static domains never pay for
+    a render.
+    """
+
+    def __init__(
+        self,
+        stealth_config: Optional[StealthConfig] = None,
+        min_text_chars: int = 400,
+        timeout: float = 15.0,
+        cache: Optional[ResponseCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.config = stealth_config or create_stealth_config()
+        self.min_text_chars = min_text_chars
+        self.timeout = timeout
+        self._client = http_client
+        self.cache = cache or get_response_cache()
+        self._domain_tier: Dict[str, str] = {}
+
+        self.stats = {
+            "http_served": 0,
+            "browser_escalations": 0,
+            "browser_remembered": 0,
+            "http_errors": 0,
+        }
+
+        self.headers = {
+            "User-Agent": self.config.get_random_user_agent(),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7",
+        }
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled "radar" client"""
+        return self._client or get_http_clients().get("radar")
+
+    async def close(self):
+        """Forget domain decisions; pooled connections belong to the registry"""
+        self._domain_tier.clear()
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    def tier_for(self, url: str) -> Optional[str]:
+        """Remembered tier for the URL's domain, None if not decided yet"""
+        return self._domain_tier.get(self.domain_of(url))
+
+    def remember(self, url: str, tier: str):
+        """Record which tier serves the URL's domain"""
+        self._domain_tier[self.domain_of(url)] = tier
+
+    def needs_browser(self, html: str, text: str) -> bool:
+        """Decide whether a statically fetched page has to be rendered"""
+        if len(text) < self.min_text_chars:
+            return True
+        if EMPTY_APP_ROOT.search(html):
+            return True
+        # A JS nag on a page with little else is a client-side app
+        return bool(JS_REQUIRED_PATTERNS.search(text)) and len(text) < self.min_text_chars * 3
+
+    async def fetch_static(self, url: str) -> Optional[StaticPage]:
+        """
+        Try to serve the URL without a browser
+
+        Returns:
+            StaticPage when plain HTTP is good enough, None to escalate
+        """
+        if self.tier_for(url) == TIER_BROWSER:
+            self.stats["browser_remembered"] += 1
+            return None
+
+        try:
+            response = await self.cache.get(
+                self._get_client(), url, headers=self.headers, source="radar",
+                cacheable=is_not_challenge_page,
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"Static fetch failed for {url}: {e}")
+            self.stats["http_errors"] += 1
+            return None
+
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or "html" not in content_type:
+            self.stats["http_errors"] += 1
+            return None
+
+        html = response.text
+        text = await parse(extract_text, html)
+
+        if self.needs_browser(html, text):
+            logger.info(f"🔭 {self.domain_of(url)} needs JavaScript - escalating to browser")
+            self.remember(url, TIER_BROWSER)
+            self.stats["browser_escalations"] += 1
+            return None
+
+        self.remember(url, TIER_HTTP)
+        self.stats["http_served"] += 1
+        return StaticPage(html=html, text=text, title=extract_title(html), final_url=str(response.url))
+
+    def get_stats(self) -> dict:
+        """Tier counters and number of remembered domains"""
+        tiers = list(self._domain_tier.values())
+        return {
+            **self.stats,
+            "domains_http": tiers.count(TIER_HTTP),
+            "domains_browser": tiers.count(TIER_BROWSER),
+        }
+
+
+# Global fetcher instance (domain decisions are shared across requests)
+_fetcher: Optional[TieredFetcher] = None
+
+
+def get_tiered_fetcher() -> TieredFetcher:
+    """Get the global tiered fetcher instance"""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = TieredFetcher()
+    return _fetcher
+
+
+async def close_tiered_fetcher():
+    """Close the global fetcher on shutdown"""
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.close()
+        _fetcher = None
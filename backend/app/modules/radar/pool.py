@@ -0,0 +1,330 @@
+"""RADAR - Persistent browser pool with warm, per-domain contexts"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, AsyncIterator
+from urllib.parse import urlparse
+from loguru import logger
+
+from ...core.config import settings
+from .stealth import StealthConfig, create_stealth_config
+
+# Playwright import with fallback for testing
+PLAYWRIGHT_AVAILABLE = False
+try:
+    from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    Browser = Any
+    BrowserContext = Any
+    Page = Any
+
+
+BROWSER_LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+]
+
+
+def _memory_available_mb() -> Optional[float]:
+    """Read available system memory (Linux only), None if unknown"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+@dataclass
+class PooledContext:
+    """A warm browser context bound to a single domain"""
+    domain: str
+    context: BrowserContext
+    created_at: float
+    last_used: float
+    pages_served: int = 0
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium instance with a pool of warm browser contexts
+
+    Contexts are leased per domain (so cookies and the user agent stay
+    consistent for a site), recycled after ``max_pages_per_context`` pages,
+    when idle for too long or when the host runs low on memory.
+    A background health check relaunches the browser if it disconnects.
+    """
+
+    def __init__(
+        self,
+        stealth_config: Optional[StealthConfig] = None,
+        max_contexts: Optional[int] = None,
+        max_pages_per_context: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        min_free_memory_mb: Optional[float] = None,
+        health_interval: Optional[float] = None,
+    ):
+        self.config = stealth_config or create_stealth_config()
+        self.max_contexts = max_contexts or settings.BROWSER_POOL_MAX_CONTEXTS
+        self.max_pages_per_context = max_pages_per_context or settings.BROWSER_POOL_PAGES_PER_CONTEXT
+        self.idle_ttl = idle_ttl if idle_ttl is not None else settings.BROWSER_POOL_IDLE_TTL
+        self.min_free_memory_mb = (
+            min_free_memory_mb if min_free_memory_mb is not None else settings.BROWSER_POOL_MIN_FREE_MB
+        )
+        self.health_interval = health_interval or settings.BROWSER_POOL_HEALTH_INTERVAL
+
+        self.browser: Optional[Browser] = None
+        self._playwright = None
+        self._idle: Dict[str, List[PooledContext]] = {}
+        self._leased = 0
+        self._slots = asyncio.Semaphore(self.max_contexts)
+        self._lock = asyncio.Lock()
+        self._health_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "browser_launches": 0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "contexts_recycled": 0,
+            "pages_served": 0,
+            "health_restarts": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        """True when a live browser is ready to serve pages"""
+        return PLAYWRIGHT_AVAILABLE and self.browser is not None
+
+    async def start(self):
+        """Launch the browser (idempotent) and start the health check"""
+        if self.browser is not None:
+            return
+        if not PLAYWRIGHT_AVAILABLE:
+            logger.info("Running in mock mode - no browser pool started")
+            return
+
+        await self._launch()
+        if self.browser is not None and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        """Close all contexts and shut the browser down"""
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        await self._close_idle(lambda ctx: True)
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.debug(f"Browser close failed: {e}")
+            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("🔭 RADAR browser pool closed")
+
+    async def _launch(self):
+        try:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self.browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=BROWSER_LAUNCH_ARGS,
+            )
+            self.stats["browser_launches"] += 1
+            logger.info("RADAR browser pool initialized")
+        except Exception as e:
+            logger.warning(f"Browser launch failed: {e} - using mock mode")
+            self.browser = None
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Domain key used to lease contexts"""
+        return (urlparse(url).hostname or "").lower()
+
+    def _under_memory_pressure(self) -> bool:
+        available = _memory_available_mb()
+        return available is not None and available < self.min_free_memory_mb
+
+    @asynccontextmanager
+    async def page(self, url: str) -> AsyncIterator[Page]:
+        """
+        Lease a fresh page in a warm context for the domain of ``url``
+
+        The page is closed on exit; the context goes back to the pool
+        unless it has to be recycled.
+        """
+        async with self._slots:
+            pooled = await self._acquire(self.domain_of(url))
+            page = None
+            healthy = True
+            try:
+                page = await pooled.context.new_page()
+                yield page
+            except Exception:
+                healthy = self.browser is not None and self.browser.is_connected()
+                raise
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception:
+                        healthy = False
+                await self._release(pooled, healthy)
+
+    async def _acquire(self, domain: str) -> PooledContext:
+        async with self._lock:
+            if self.browser is None or not self.browser.is_connected():
+                await self._restart()
+
+            idle = self._idle.get(domain)
+            if idle:
+                pooled = idle.pop()
+                self._leased += 1
+                self.stats["contexts_reused"] += 1
+                return pooled
+
+            # Make room: we hold a slot, so any overflow is idle contexts
+            if self._leased + self._idle_count() >= self.max_contexts:
+                await self._evict_lru()
+
+            context = await self.browser.new_context(**self.config.get_browser_context_options())
+            self._leased += 1
+            self.stats["contexts_created"] += 1
+            now = time.monotonic()
+            return PooledContext(domain=domain, context=context, created_at=now, last_used=now)
+
+    async def _release(self, pooled: PooledContext, healthy: bool):
+        async with self._lock:
+            self._leased -= 1
+            pooled.pages_served += 1
+            pooled.last_used = time.monotonic()
+            self.stats["pages_served"] += 1
+
+            if (
+                not healthy
+                or pooled.pages_served >= self.max_pages_per_context
+                or self._under_memory_pressure()
+            ):
+                await self._close_context(pooled)
+                return
+
+            self._idle.setdefault(pooled.domain, []).append(pooled)
+
+    def _idle_count(self) -> int:
+        return sum(len(v) for v in self._idle.values())
+
+    async def _evict_lru(self):
+        candidates = [c for contexts in self._idle.values() for c in contexts]
+        if not candidates:
+            return
+        oldest = min(candidates, key=lambda c: c.last_used)
+        self._idle[oldest.domain].remove(oldest)
+        await self._close_context(oldest)
+
+    async def _close_context(self, pooled: PooledContext):
+        self.stats["contexts_recycled"] += 1
+        if not self._idle.get(pooled.domain):
+            self._idle.pop(pooled.domain, None)
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Context close failed for {pooled.domain}: {e}")
+
+    async def _close_idle(self, predicate) -> int:
+        closed = 0
+        for domain in list(self._idle):
+            for pooled in list(self._idle.get(domain, [])):
+                if predicate(pooled):
+                    self._idle[domain].remove(pooled)
+                    await self._close_context(pooled)
+                    closed += 1
+        return closed
+
+    async def _restart(self):
+        """Relaunch a crashed or disconnected browser"""
+        logger.warning("🔭 RADAR browser disconnected - relaunching")
+        self.stats["health_restarts"] += 1
+        self._idle.clear()
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        await self._launch()
+        if self.browser is None:
+            raise RuntimeError("Browser pool could not relaunch Chromium")
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.error(f"Browser pool health check failed: {e}")
+
+    async def health_check(self) -> dict:
+        """Relaunch a dead browser and drop stale or excess idle contexts"""
+        async with self._lock:
+            if self.browser is not None and not self.browser.is_connected():
+                await self._restart()
+
+            now = time.monotonic()
+            if self._under_memory_pressure():
+                closed = await self._close_idle(lambda ctx: True)
+                if closed:
+                    logger.warning(f"🔭 Memory pressure - closed {closed} idle contexts")
+            else:
+                await self._close_idle(lambda ctx: now - ctx.last_used > self.idle_ttl)
+
+        return self.get_stats()
+
+    def get_stats(self) -> dict:
+        """Pool counters and current occupancy"""
+        return {
+            **self.stats,
+            "available": self.available,
+            "contexts_leased": self._leased,
+            "contexts_idle": self._idle_count(),
+            "domains": len(self._idle),
+        }
+
+
+# Global browser pool instance
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the global browser pool instance"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def init_browser_pool():
+    """Start the global browser pool on startup"""
+    await get_browser_pool().start()
+
+
+async def close_browser_pool():
+    """Stop the global browser pool on shutdown"""
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
@@ -0,0 +1,59 @@
+"""RADAR - Per-host politeness scheduling"""
+import asyncio
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+
+class HostScheduler:
+    """
+    Tracks the next time each host may be contacted
+
+    Politeness delays are applied per host instead of globally: a request to
+    one host only waits for earlier requests to that same host, and nobody
+    holds a concurrency slot while waiting.
+    """
+
+    def __init__(self, delay_fn: Callable[[], float]):
+        """
+        Args:
+            delay_fn: Returns the pause to keep between two requests to a host
+                      (e.g. StealthConfig.get_random_delay)
+        """
+        self.delay_fn = delay_fn
+        self._next_allowed: Dict[str, float] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Host key used for politeness accounting"""
+        return (urlparse(url).hostname or url).lower()
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_running_loop().time()
+
+    def next_allowed(self, host: str) -> float:
+        """Loop time at which ``host`` may be contacted again"""
+        return self._next_allowed.get(host, 0.0)
+
+    def is_ready(self, host: str, now: Optional[float] = None) -> bool:
+        """True when a request to ``host`` may start right now"""
+        return self.next_allowed(host) <= (now if now is not None else self._now())
+
+    def reserve(self, host: str) -> float:
+        """
+        Book the next request slot for ``host``
+
+        Returns:
+            Seconds the caller has to wait before sending the request
+        """
+        now = self._now()
+        start = max(now, self.next_allowed(host))
+        self._next_allowed[host] = start + self.delay_fn()
+        return start - now
+
+    async def wait(self, url_or_host: str):
+        """Reserve a slot for the URL's host and sleep until it opens"""
+        host = self.host_of(url_or_host) if "/" in url_or_host else url_or_host.lower()
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -1,17 +1,22 @@
 """RADAR - Async web scraper with stealth capabilities"""
 import asyncio
-from typing import Optional, List, AsyncGenerator, Any, TYPE_CHECKING
+from collections import deque
+from typing import Optional, List, Dict, Deque, AsyncGenerator, Any, TYPE_CHECKING
 from datetime import datetime
 from loguru import logger
-from bs4 import BeautifulSoup
 
 from ...models import ScrapedData
+from ...core.parsing import parse
 from .stealth import StealthConfig, create_stealth_config
+from .pool import BrowserPool
+from .scheduler import HostScheduler
+from .blocking import RequestBlocker
+from .fetcher import TieredFetcher, TIER_HTTP, TIER_BROWSER, extract_text, get_tiered_fetcher
 
 # Playwright import with fallback for testing
 PLAYWRIGHT_AVAILABLE = False
 try:
-    from playwright.async_api import async_playwright, Page, Browser
+    from playwright.async_api import Page, Browser
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     logger.warning("Playwright not available - using mock mode")
@@ -26,12 +31,33 @@ class RadarScraper:
 
     Async web scraper with anti-detection capabilities.
     Supports multiple sources: KvK, Google Maps, Marktplaats, etc.
+
+    Pages are rendered through a BrowserPool. Pass the shared, lifespan-managed
+    pool to reuse a warm browser; without one the scraper runs a private pool
+    for the duration of its ``async with`` block.
+
+    With ``tiered=True`` a plain HTTP fetch is tried first and Playwright is
+    only used for domains whose pages need JavaScript.
     """
 
-    def __init__(self, stealth_config: Optional[StealthConfig] = None):
+    def __init__(
+        self,
+        stealth_config: Optional[StealthConfig] = None,
+        pool: Optional[BrowserPool] = None,
+        fetcher: Optional[TieredFetcher] = None,
+        tiered: bool = True,
+    ):
         self.config = stealth_config or create_stealth_config()
-        self.browser: Optional[Browser] = None
-        self._playwright = None
+        self._owns_pool = pool is None
+        self.pool = pool or BrowserPool(stealth_config=self.config)
+        self.fetcher = (fetcher or get_tiered_fetcher()) if tiered else None
+        self.scheduler = HostScheduler(self.config.get_random_delay)
+        self.blocker = RequestBlocker(self.config)
+
+    @property
+    def browser(self) -> Optional[Browser]:
+        """The pool's browser, None in mock mode"""
+        return self.pool.browser
 
     async def __aenter__(self):
         await self.start()
@@ -41,36 +67,13 @@ class RadarScraper:
         await self.stop()
 
     async def start(self):
-        """Initialize the browser"""
-        if not PLAYWRIGHT_AVAILABLE:
-            logger.info("Running in mock mode - no browser started")
-            return
-
-        try:
-            self._playwright = await async_playwright().start()
-            self.browser = await self._playwright.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                ]
-            )
-            logger.info("RADAR browser initialized")
-        except Exception as e:
-            logger.warning(f"Browser launch failed: {e} - using mock mode")
-            self.browser = None
-            if self._playwright:
-                await self._playwright.stop()
-                self._playwright = None
+        """Initialize the browser pool (no-op if it is already running)"""
+        await self.pool.start()
 
     async def stop(self):
-        """Cleanup browser resources"""
-        if self.browser:
-            await self.browser.close()
-        if self._playwright:
-            await self._playwright.stop()
-        logger.info("🔭 RADAR browser closed")
+        """Cleanup browser resources we own; a shared pool stays warm"""
+        if self._owns_pool:
+            await self.pool.stop()
 
     async def scrape_url(self, url: str, source_type: str = "generic") -> ScrapedData:
         """
@@ -83,22 +86,39 @@ class RadarScraper:
         Returns:
             ScrapedData object with extracted content
         """
-        logger.info(f"🔭 Scraping: {url}")
+        # Per-host politeness delay for stealth
+        await self.scheduler.wait(url)
+        return await self._scrape(url, source_type)
 
-        # Add delay for stealth
-        delay = self.config.get_random_delay()
-        await asyncio.sleep(delay)
+    async def _scrape(self, url: str, source_type: str) -> ScrapedData:
+        """Fetch and extract a URL; politeness is the caller's responsibility"""
+        logger.info(f"🔭 Scraping: {url}")
 
-        if not PLAYWRIGHT_AVAILABLE or not self.browser:
+        # Static tier: most contractor sites are plain server-rendered pages,
+        # so this runs even on deploys without a browser
+        if self.fetcher:
+            static = await self.fetcher.fetch_static(url)
+            if static:
+                return ScrapedData(
+                    url=url,
+                    html_content=static.html,
+                    text_content=static.text,
+                    source_type=source_type,
+                    metadata={
+                        "title": static.title,
+                        "url_final": static.final_url,
+                        "fetch_tier": TIER_HTTP,
+                    },
+                    scraped_at=datetime.utcnow(),
+                )
+
+        if not PLAYWRIGHT_AVAILABLE or not self.pool.available:
             # Return mock data for testing
             return self._create_mock_data(url, source_type)
 
-        context = await self.browser.new_context(
-            **self.config.get_browser_context_options()
-        )
-
-        try:
-            page = await context.new_page()
+        async with self.pool.page(url) as page:
+            # Abort images, fonts, media, stylesheets and trackers
+            await self.blocker.install(page)
 
             # Navigate with timeout
             await page.goto(url, timeout=self.config.page_load_timeout)
@@ -109,16 +129,9 @@ class RadarScraper:
 
             # Extract content
             html_content = await page.content()
-            text_content = await page.inner_text("body")
 
             # Parse with BeautifulSoup for cleaner extraction
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # Remove scripts and styles
-            for element in soup(["script", "style", "nav", "footer"]):
-                element.decompose()
-
-            clean_text = soup.get_text(separator="\n", strip=True)
+            clean_text = await parse(extract_text, html_content)
 
             return ScrapedData(
                 url=url,
@@ -128,19 +141,20 @@ class RadarScraper:
                 metadata={
                     "title": await page.title(),
                     "url_final": page.url,
+                    "fetch_tier": TIER_BROWSER,
                 },
                 scraped_at=datetime.utcnow(),
             )
 
-        finally:
-            await context.close()
-
     async def scrape_batch(
         self, urls: List[str], source_type: str = "generic", max_concurrent: int = 3
     ) -> AsyncGenerator[ScrapedData, None]:
         """
         Scrape multiple URLs with controlled concurrency
 
+        Politeness delays are tracked per host by the HostScheduler and are
+        waited out without holding a slot, so URLs on other hosts keep flowing.
+
         Args:
             urls: List of URLs to scrape
             source_type: Type of source
@@ -149,20 +163,54 @@ class RadarScraper:
         Yields:
             ScrapedData objects as they complete
         """
-        semaphore = asyncio.Semaphore(max_concurrent)
+        loop = asyncio.get_running_loop()
 
-        async def scrape_with_semaphore(url: str) -> ScrapedData:
-            async with semaphore:
-                return await self.scrape_url(url, source_type)
+        # One queue per host; a host is only dispatched when its politeness
+        # delay has elapsed, so slots never sit idle while another host is ready
+        queues: Dict[str, Deque[str]] = {}
+        for url in urls:
+            queues.setdefault(self.scheduler.host_of(url), deque()).append(url)
 
-        tasks = [scrape_with_semaphore(url) for url in urls]
+        running: Dict[asyncio.Task, str] = {}
 
-        for coro in asyncio.as_completed(tasks):
-            try:
-                result = await coro
-                yield result
-            except Exception as e:
-                logger.error(f"Scrape failed: {e}")
+        try:
+            while queues or running:
+                now = loop.time()
+                busy = set(running.values())
+                for host in list(queues):
+                    if len(running) >= max_concurrent:
+                        break
+                    if host in busy or not self.scheduler.is_ready(host, now):
+                        continue
+                    url = queues[host].popleft()
+                    if not queues[host]:
+                        del queues[host]
+                    self.scheduler.reserve(host)
+                    running[asyncio.create_task(self._scrape(url, source_type))] = host
+
+                # Wake up when a task finishes or the next waiting host opens up
+                timeout = None
+                waiting = [h for h in queues if h not in running.values()]
+                if waiting and len(running) < max_concurrent:
+                    opens_at = min(self.scheduler.next_allowed(h) for h in waiting)
+                    timeout = max(0.0, opens_at - loop.time())
+
+                if not running:
+                    await asyncio.sleep(timeout or 0)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    running.pop(task)
+                    try:
+                        yield task.result()
+                    except Exception as e:
+                        logger.error(f"Scrape failed: {e}")
+        finally:
+            for task in running:
+                task.cancel()
 
     async def _simulate_scrolling(self, page: Page):
         """Simulate human-like scrolling behavior"""
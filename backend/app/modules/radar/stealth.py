@@ -2,9 +2,36 @@
 import random
 from dataclasses import dataclass, field
 from typing import List
+from urllib.parse import urlparse
 from fake_useragent import UserAgent
 
 
+# Resource types we never need: only the DOM text is kept
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font", "stylesheet"]
+
+# Analytics, ads and chat widgets commonly found on contractor sites
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "bing.com",
+    "linkedin.com",
+    "tiktok.com",
+    "cookiebot.com",
+    "onetrust.com",
+    "tawk.to",
+    "intercom.io",
+    "trustpilot.com",
+    "youtube.com",
+    "vimeo.com",
+]
+
+
 @dataclass
 class StealthConfig:
     """Configuration for stealth scraping operations"""
@@ -28,6 +55,13 @@ class StealthConfig:
     scroll_behavior: bool = True
     mouse_movement: bool = True
 
+    # Request interception
+    block_resources: bool = True
+    blocked_resource_types: List[str] = field(
+        default_factory=lambda: list(DEFAULT_BLOCKED_RESOURCE_TYPES)
+    )
+    blocked_hosts: List[str] = field(default_factory=lambda: list(DEFAULT_BLOCKED_HOSTS))
+
     def get_random_user_agent(self) -> str:
         """Get a random desktop user agent"""
         if self.user_agents:
@@ -38,6 +72,18 @@ class StealthConfig:
         """Get a random delay between requests"""
         return random.uniform(self.min_delay, self.max_delay)
 
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Whether a browser request should be aborted"""
+        if not self.block_resources:
+            return False
+        # Page and frame navigations are what we came for, even on tracker hosts
+        if resource_type == "document":
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == h or host.endswith("." + h) for h in self.blocked_hosts)
+
     def get_browser_context_options(self) -> dict:
         """Get Playwright browser context options"""
         return {
@@ -0,0 +1,219 @@
+"""Pluggable HTML extraction layer for the scrapers
+
+Card parsers are written once against ``Node``/``Selector`` and run on either
+backend:
+
+- ``lxml``: C-backed libxml2 parser with element iteration (fast path)
+- ``soup``: BeautifulSoup with ``html.parser``, optionally restricted to the
+  listing container tags with a SoupStrainer (fallback when lxml is missing)
+
+Selectors compile their regular expressions once, at class definition time of
+the scraper that owns them.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+from bs4 import BeautifulSoup, SoupStrainer
+
+from ...core.config import settings
+
+LXML_AVAILABLE = False
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    pass
+
+
+BACKEND_LXML = "lxml"
+BACKEND_SOUP = "soup"
+
+# Tags whose text never counts as visible text
+_SKIP_TEXT_TAGS = {"script", "style"}
+
+AttrMatch = Union[bool, str, "re.Pattern"]
+
+
+class Selector:
+    """
+    A precompiled ``tag`` + attribute filter, mirroring bs4's ``find`` arguments
+
+    ``cls`` is searched against every class token and the full class string,
+    like BeautifulSoup does; ``attrs`` values are ``True`` (attribute present)
+    or a pattern that is searched in the attribute value.
+    """
+
+    __slots__ = ("tag", "cls", "attrs", "_class_memo")
+
+    def __init__(
+        self,
+        tag: Optional[str] = None,
+        cls: Optional[Union[str, "re.Pattern"]] = None,
+        attrs: Optional[Dict[str, AttrMatch]] = None,
+        flags: int = 0,
+    ):
+        self.tag = tag
+        self.cls = re.compile(cls, flags) if isinstance(cls, str) else cls
+        self.attrs = {
+            name: re.compile(value, flags) if isinstance(value, str) else value
+            for name, value in (attrs or {}).items()
+        }
+        # Class strings repeat on every card, so remember the verdicts
+        self._class_memo: Dict[str, bool] = {}
+
+    def matches_class(self, class_value: Optional[str]) -> bool:
+        if self.cls is None:
+            return True
+        if not class_value:
+            return False
+        verdict = self._class_memo.get(class_value)
+        if verdict is None:
+            tokens = class_value.split()
+            verdict = any(self.cls.search(t) for t in tokens) or bool(self.cls.search(" ".join(tokens)))
+            if len(self._class_memo) < 4096:
+                self._class_memo[class_value] = verdict
+        return verdict
+
+    @staticmethod
+    def _matches_value(expected: AttrMatch, value: Optional[str]) -> bool:
+        if value is None:
+            return False
+        if expected is True:
+            return True
+        return bool(expected.search(value))
+
+    def matches_attrs(self, get) -> bool:
+        return all(self._matches_value(expected, get(name)) for name, expected in self.attrs.items())
+
+    def soup_kwargs(self) -> dict:
+        attrs = dict(self.attrs)
+        if self.cls is not None:
+            attrs["class"] = self.cls
+        return {"name": self.tag, "attrs": attrs}
+
+
+class Node(ABC):
+    """Backend-neutral element handle"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def find(self, selector: Selector) -> Optional["Node"]:
+        ...
+
+    @abstractmethod
+    def find_all(self, selector: Selector) -> List["Node"]:
+        ...
+
+    @abstractmethod
+    def get(self, attr: str, default: Optional[str] = None) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def text(self) -> str:
+        """Visible text, stripped per string and concatenated (bs4 ``strip=True``)"""
+
+
+class LxmlNode(Node):
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def _iter_matches(self, selector: Selector) -> Iterator["LxmlNode"]:
+        iterator = self.el.iterdescendants(selector.tag) if selector.tag else self.el.iterdescendants()
+        for el in iterator:
+            if not isinstance(el.tag, str):
+                continue  # comments / processing instructions
+            if not selector.matches_class(el.get("class")):
+                continue
+            if selector.attrs and not selector.matches_attrs(el.get):
+                continue
+            yield LxmlNode(el)
+
+    def find(self, selector: Selector) -> Optional["LxmlNode"]:
+        return next(self._iter_matches(selector), None)
+
+    def find_all(self, selector: Selector) -> List["LxmlNode"]:
+        return list(self._iter_matches(selector))
+
+    def get(self, attr: str, default: Optional[str] = None) -> Optional[str]:
+        return self.el.get(attr, default)
+
+    def text(self) -> str:
+        return "".join(s.strip() for s in _iter_text(self.el) if s.strip())
+
+
+def _iter_text(el) -> Iterator[str]:
+    if isinstance(el.tag, str) and el.tag not in _SKIP_TEXT_TAGS and el.text:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str):
+            yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+
+class SoupNode(Node):
+    __slots__ = ("tag",)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def find(self, selector: Selector) -> Optional["SoupNode"]:
+        found = self.tag.find(**selector.soup_kwargs())
+        return SoupNode(found) if found is not None else None
+
+    def find_all(self, selector: Selector) -> List["SoupNode"]:
+        return [SoupNode(t) for t in self.tag.find_all(**selector.soup_kwargs())]
+
+    def get(self, attr: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.tag.get(attr, default)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def text(self) -> str:
+        return self.tag.get_text(strip=True)
+
+
+_LXML_PARSER = None
+
+
+def _html_parser():
+    """Shared libxml2 HTML parser (one per process)"""
+    global _LXML_PARSER
+    if _LXML_PARSER is None:
+        _LXML_PARSER = etree.HTMLParser(encoding="utf-8")
+    return _LXML_PARSER
+
+
+def default_backend() -> str:
+    """Configured backend, falling back to soup when lxml is unavailable"""
+    backend = settings.HTML_EXTRACTION_BACKEND.lower()
+    if backend in ("auto", BACKEND_LXML):
+        return BACKEND_LXML if LXML_AVAILABLE else BACKEND_SOUP
+    return BACKEND_SOUP
+
+
+def parse_document(
+    html: str,
+    only: Optional[Sequence[str]] = None,
+    backend: Optional[str] = None,
+) -> Node:
+    """
+    Parse ``html`` into a Node
+
+    Args:
+        html: Page source
+        only: Container tag names to keep (SoupStrainer) on the soup backend;
+              lxml builds the full tree since it is cheap there
+        backend: "lxml" or "soup" (default: settings.HTML_EXTRACTION_BACKEND)
+    """
+    backend = backend or default_backend()
+    if backend == BACKEND_LXML and LXML_AVAILABLE:
+        if not html.strip():
+            html = "<html></html>"
+        root = etree.fromstring(html.encode("utf-8"), _html_parser())
+        return LxmlNode(root if root is not None else etree.fromstring(b"<html></html>", _html_parser()))
+
+    strainer = SoupStrainer(list(only)) if only else None
+    return SoupNode(BeautifulSoup(html, "html.parser", parse_only=strainer))
@@ -0,0 +1,95 @@
+"""Bounded concurrent fan-out shared by the scrapers"""
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Tuple, TypeVar
+from loguru import logger
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def merge_streams(
+    streams: Dict[K, Callable[[], AsyncIterator[T]]],
+    limit: int,
+) -> AsyncIterator[Tuple[K, T]]:
+    """
+    Run several async iterators concurrently and yield items as they arrive
+
+    Args:
+        streams: key -> factory returning the async iterator for that key
+        limit: Maximum number of streams running at the same time
+
+    Yields:
+        (key, item) tuples in arrival order. A stream that raises is logged
+        and ends; the others keep going. Closing the merged iterator cancels
+        every stream that is still running.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(max(1, limit))
+
+    async def pump(key: K, factory: Callable[[], AsyncIterator[T]]):
+        try:
+            async with slots:
+                async for item in factory():
+                    queue.put_nowait((key, item))
+        except Exception as e:
+            logger.error(f"Fan-out stream {key} failed: {e}")
+        finally:
+            queue.put_nowait((key, _DONE))
+
+    tasks = [asyncio.create_task(pump(key, factory)) for key, factory in streams.items()]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            key, item = await queue.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield key, item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable[list]],
+    max_pages: int,
+) -> AsyncIterator[Tuple[int, list]]:
+    """
+    Fetch pages 1..max_pages concurrently and stop at the first empty page
+
+    ``fetch_page`` should do its own politeness waiting; all pages are
+    started up front and pages past an empty (or failed) page are cancelled.
+
+    Yields:
+        (page, items) for every non-empty page in arrival order
+    """
+    tasks = {asyncio.create_task(fetch_page(page)): page for page in range(1, max_pages + 1)}
+    last_page = max_pages
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=tasks.get):
+                page = tasks[task]
+                if page > last_page:
+                    continue
+                try:
+                    items = task.result()
+                except Exception as e:
+                    logger.error(f"Error scraping page {page}: {e}")
+                    items = []
+
+                if not items:
+                    logger.info(f"No more results after page {page - 1}")
+                    last_page = page - 1
+                    for other in pending:
+                        if tasks[other] > last_page:
+                            other.cancel()
+                    continue
+
+                yield page, items
+    finally:
+        for task in tasks:
+            task.cancel()
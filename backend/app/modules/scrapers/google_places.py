@@ -1,11 +1,29 @@
 """Google Places API Client for Vakmensen Discovery"""
 import os
-from typing import Optional, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from loguru import logger
 import httpx
 from pydantic import BaseModel
 
+from ...core.config import settings
+from ...core.http_cache import get_response_cache
+from ...core.http_clients import get_http_clients
+from .fanout import merge_streams
+
+
+# Places answers quota and auth errors with HTTP 200; only these are real results
+CACHEABLE_PLACES_STATUSES = {"OK", "ZERO_RESULTS"}
+
+
+def places_response_ok(response: httpx.Response) -> bool:
+    """``cacheable`` predicate: keep OVER_QUERY_LIMIT/REQUEST_DENIED out of the cache"""
+    try:
+        return response.json().get("status") in CACHEABLE_PLACES_STATUSES
+    except ValueError:
+        return False
+
 
 class GooglePlaceResult(BaseModel):
     """Google Places search result model"""
@@ -74,18 +92,31 @@ class GooglePlacesClient:
         "warmtepomp": "warmtepomp heat pump",
     }
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Popular categories for multi-category searches
+    DEFAULT_CATEGORIES = [
+        "loodgieter", "elektricien", "aannemer", "cv_monteur",
+        "schilder", "dakdekker", "timmerman",
+    ]
+
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         """
         Initialize Google Places client
 
         Args:
             api_key: Google Places API key (or uses GOOGLE_PLACES_API_KEY env var)
+            http_client: Pooled client (default: the shared "google_places" client)
         """
         self.api_key = api_key or os.getenv("GOOGLE_PLACES_API_KEY")
+        self._http_client = http_client
 
         if not self.api_key:
             logger.warning("Google Places API key not set - some features disabled")
 
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one"""
+        return self._http_client or get_http_clients().get("google_places")
+
     async def search_nearby(
         self,
         query: str,
@@ -113,50 +144,53 @@ class GooglePlacesClient:
 
         results = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Text Search API
-                url = f"{self.BASE_URL}/textsearch/json"
-                params = {
-                    "query": query,
-                    "location": f"{lat},{lng}",
-                    "radius": min(radius_m, 50000),
-                    "key": self.api_key,
-                    "language": "nl",
-                    "region": "nl",
-                }
-
-                response = await client.get(url, params=params)
-                data = response.json()
-
-                if data.get("status") != "OK":
-                    logger.warning(f"Google Places API error: {data.get('status')}")
-                    return []
-
-                for place in data.get("results", [])[:max_results]:
-                    try:
-                        location = place.get("geometry", {}).get("location", {})
-
-                        result = GooglePlaceResult(
-                            place_id=place["place_id"],
-                            name=place.get("name", "Unknown"),
-                            address=place.get("formatted_address"),
-                            lat=location.get("lat"),
-                            lng=location.get("lng"),
-                            rating=place.get("rating"),
-                            review_count=place.get("user_ratings_total"),
-                            business_status=place.get("business_status"),
-                            types=place.get("types", []),
-                            photos=[p.get("photo_reference") for p in place.get("photos", [])],
-                        )
-                        results.append(result)
-                    except Exception as e:
-                        logger.debug(f"Could not parse place: {e}")
-
-                logger.info(f"Google Places: Found {len(results)} results for '{query}'")
-
-            except Exception as e:
-                logger.error(f"Google Places search error: {e}")
+        client = self.http_client
+        try:
+            # Text Search API
+            url = f"{self.BASE_URL}/textsearch/json"
+            params = {
+                "query": query,
+                "location": f"{lat},{lng}",
+                "radius": min(radius_m, 50000),
+                "key": self.api_key,
+                "language": "nl",
+                "region": "nl",
+            }
+
+            response = await get_response_cache().get(
+                client, url, params=params, source="google_places",
+                cacheable=places_response_ok,
+            )
+            data = response.json()
+
+            if data.get("status") != "OK":
+                logger.warning(f"Google Places API error: {data.get('status')}")
+                return []
+
+            for place in data.get("results", [])[:max_results]:
+                try:
+                    location = place.get("geometry", {}).get("location", {})
+
+                    result = GooglePlaceResult(
+                        place_id=place["place_id"],
+                        name=place.get("name", "Unknown"),
+                        address=place.get("formatted_address"),
+                        lat=location.get("lat"),
+                        lng=location.get("lng"),
+                        rating=place.get("rating"),
+                        review_count=place.get("user_ratings_total"),
+                        business_status=place.get("business_status"),
+                        types=place.get("types", []),
+                        photos=[p.get("photo_reference") for p in place.get("photos", [])],
+                    )
+                    results.append(result)
+                except Exception as e:
+                    logger.debug(f"Could not parse place: {e}")
+
+            logger.info(f"Google Places: Found {len(results)} results for '{query}'")
+
+        except Exception as e:
+            logger.error(f"Google Places search error: {e}")
 
         return results
 
@@ -165,6 +199,7 @@ class GooglePlacesClient:
         category: str,
         location: str,
         radius_m: int = 15000,
+        coords: Optional[Dict[str, float]] = None,
     ) -> List[GooglePlaceResult]:
         """
         Search for vakmensen in a category near a location
@@ -173,6 +208,7 @@ class GooglePlacesClient:
             category: Category key (loodgieter, elektricien, etc.)
             location: City or address to search near
             radius_m: Search radius in meters
+            coords: Already geocoded location (skips the geocode call)
 
         Returns:
             List of GooglePlaceResult objects
@@ -182,7 +218,7 @@ class GooglePlacesClient:
             return []
 
         # First geocode the location
-        coords = await self._geocode(location)
+        coords = coords or await self._geocode(location)
         if not coords:
             logger.warning(f"Could not geocode location: {location}")
             return []
@@ -214,52 +250,55 @@ class GooglePlacesClient:
             logger.error("Google Places API key required")
             return None
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                url = f"{self.BASE_URL}/details/json"
-                params = {
-                    "place_id": place_id,
-                    "key": self.api_key,
-                    "language": "nl",
-                    "fields": ",".join([
-                        "place_id", "name", "formatted_address", "formatted_phone_number",
-                        "website", "rating", "user_ratings_total", "reviews",
-                        "geometry", "types", "opening_hours", "price_level", "url",
-                        "business_status"
-                    ]),
-                }
-
-                response = await client.get(url, params=params)
-                data = response.json()
-
-                if data.get("status") != "OK":
-                    logger.warning(f"Google Places details error: {data.get('status')}")
-                    return None
-
-                result = data.get("result", {})
-                location = result.get("geometry", {}).get("location", {})
-
-                return GooglePlaceDetails(
-                    place_id=result.get("place_id", place_id),
-                    name=result.get("name", "Unknown"),
-                    formatted_address=result.get("formatted_address"),
-                    formatted_phone=result.get("formatted_phone_number"),
-                    website=result.get("website"),
-                    rating=result.get("rating"),
-                    review_count=result.get("user_ratings_total"),
-                    reviews=result.get("reviews", []),
-                    lat=location.get("lat"),
-                    lng=location.get("lng"),
-                    types=result.get("types", []),
-                    opening_hours=result.get("opening_hours"),
-                    price_level=result.get("price_level"),
-                    url=result.get("url"),
-                )
-
-            except Exception as e:
-                logger.error(f"Google Places details error: {e}")
+        client = self.http_client
+        try:
+            url = f"{self.BASE_URL}/details/json"
+            params = {
+                "place_id": place_id,
+                "key": self.api_key,
+                "language": "nl",
+                "fields": ",".join([
+                    "place_id", "name", "formatted_address", "formatted_phone_number",
+                    "website", "rating", "user_ratings_total", "reviews",
+                    "geometry", "types", "opening_hours", "price_level", "url",
+                    "business_status"
+                ]),
+            }
+
+            response = await get_response_cache().get(
+                client, url, params=params, source="google_places",
+                cacheable=places_response_ok,
+            )
+            data = response.json()
+
+            if data.get("status") != "OK":
+                logger.warning(f"Google Places details error: {data.get('status')}")
                 return None
 
+            result = data.get("result", {})
+            location = result.get("geometry", {}).get("location", {})
+
+            return GooglePlaceDetails(
+                place_id=result.get("place_id", place_id),
+                name=result.get("name", "Unknown"),
+                formatted_address=result.get("formatted_address"),
+                formatted_phone=result.get("formatted_phone_number"),
+                website=result.get("website"),
+                rating=result.get("rating"),
+                review_count=result.get("user_ratings_total"),
+                reviews=result.get("reviews", []),
+                lat=location.get("lat"),
+                lng=location.get("lng"),
+                types=result.get("types", []),
+                opening_hours=result.get("opening_hours"),
+                price_level=result.get("price_level"),
+                url=result.get("url"),
+            )
+
+        except Exception as e:
+            logger.error(f"Google Places details error: {e}")
+            return None
+
     async def _geocode(self, address: str) -> Optional[Dict[str, float]]:
         """
         Geocode an address to coordinates
@@ -273,24 +312,27 @@ class GooglePlacesClient:
         if not self.api_key:
             return None
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                url = "https://maps.googleapis.com/maps/api/geocode/json"
-                params = {
-                    "address": f"{address}, Netherlands",
-                    "key": self.api_key,
-                    "region": "nl",
-                }
-
-                response = await client.get(url, params=params)
-                data = response.json()
+        client = self.http_client
+        try:
+            url = "https://maps.googleapis.com/maps/api/geocode/json"
+            params = {
+                "address": f"{address}, Netherlands",
+                "key": self.api_key,
+                "region": "nl",
+            }
+
+            response = await get_response_cache().get(
+                client, url, params=params, source="google_places",
+                cacheable=places_response_ok,
+            )
+            data = response.json()
 
-                if data.get("status") == "OK" and data.get("results"):
-                    location = data["results"][0]["geometry"]["location"]
-                    return {"lat": location["lat"], "lng": location["lng"]}
+            if data.get("status") == "OK" and data.get("results"):
+                location = data["results"][0]["geometry"]["location"]
+                return {"lat": location["lat"], "lng": location["lng"]}
 
-            except Exception as e:
-                logger.error(f"Geocoding error: {e}")
+        except Exception as e:
+            logger.error(f"Geocoding error: {e}")
 
         return None
 
@@ -311,20 +353,10 @@ class GooglePlacesClient:
         Returns:
             Dictionary with category -> list of results
         """
-        default_categories = [
-            "loodgieter", "elektricien", "aannemer", "cv_monteur",
-            "schilder", "dakdekker", "timmerman"
-        ]
-        categories_to_search = categories or default_categories
-
-        results = {}
-
-        for category in categories_to_search:
-            places = await self.search_vakmensen(
-                category=category,
-                location=location,
-                radius_m=radius_m,
-            )
+        categories_to_search = categories or self.DEFAULT_CATEGORIES
+        results = {category: [] for category in categories_to_search}
+
+        async for category, places in self.iter_all_categories(location, categories_to_search, radius_m):
             results[category] = places
 
         total = sum(len(p) for p in results.values())
@@ -332,6 +364,40 @@ class GooglePlacesClient:
 
         return results
 
+    async def iter_all_categories(
+        self,
+        location: str,
+        categories: Optional[List[str]] = None,
+        radius_m: int = 15000,
+    ) -> AsyncIterator[Tuple[str, List[GooglePlaceResult]]]:
+        """
+        Stream results per category as each search completes
+
+        The location is geocoded once and the text searches run concurrently
+        (bounded by SCRAPER_MAX_CONCURRENT).
+
+        Yields:
+            (category, results) in arrival order
+        """
+        if not self.api_key:
+            logger.error("Google Places API key required")
+            return
+
+        coords = await self._geocode(location)
+        if not coords:
+            logger.warning(f"Could not geocode location: {location}")
+            return
+
+        async def search(category: str) -> AsyncIterator[List[GooglePlaceResult]]:
+            yield await self.search_vakmensen(category, location, radius_m, coords=coords)
+
+        streams = {
+            category: partial(search, category)
+            for category in categories or self.DEFAULT_CATEGORIES
+        }
+        async for category, places in merge_streams(streams, settings.SCRAPER_MAX_CONCURRENT):
+            yield category, places
+
     def get_photo_url(self, photo_reference: str, max_width: int = 400) -> str:
         """
         Get URL for a place photo
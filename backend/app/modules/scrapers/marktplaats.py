@@ -1,13 +1,40 @@
 """Marktplaats Diensten Scraper for Vakmensen Discovery"""
 import asyncio
+import random
 import re
-from typing import Optional, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from loguru import logger
 import httpx
 from bs4 import BeautifulSoup
 from pydantic import BaseModel
 
+from ...core.config import settings
+from ...core.http_cache import get_response_cache, is_not_challenge_page
+from ...core.http_clients import get_http_clients
+from ...core.parsing import parse
+from ..radar.scheduler import HostScheduler
+from .extraction import Node, Selector, parse_document
+from .fanout import iter_pages, merge_streams
+from .structured import (
+    PATH_APOLLO,
+    PATH_DOM,
+    PATH_EMPTY,
+    PATH_JSON_LD,
+    PATH_NEXT_DATA,
+    extract_apollo_state,
+    extract_json_ld,
+    extract_next_data,
+    has_type,
+    iter_dicts,
+    new_path_stats,
+    pick,
+    to_float,
+    to_int,
+    to_str,
+)
+
 
 class MarktplaatsVakman(BaseModel):
     """Marktplaats Diensten listing model"""
@@ -21,6 +48,8 @@ class MarktplaatsVakman(BaseModel):
     seller_name: Optional[str] = None
     seller_since: Optional[str] = None
     phone: Optional[str] = None
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
     url: str
     scraped_at: datetime
 
@@ -55,18 +84,57 @@ class MarktplaatsScraper:
         "klusjesman": "/l/diensten-en-vakmensen/klussers/",
     }
 
-    def __init__(self, delay_min: float = 1.0, delay_max: float = 3.0):
+    # Listing card selectors, compiled once
+    _CARD = Selector("li", cls=r"hz-Listing")
+    _CARD_ALT = Selector("article", attrs={"data-testid": r"listing"})
+    _LINK = Selector("a", attrs={"href": True})
+    _HEADING = Selector("h3")
+    _TITLE = Selector("span", cls=r"title", flags=re.I)
+    _PARAGRAPH = Selector("p")
+    _DESCRIPTION = Selector("span", cls=r"description", flags=re.I)
+    _PRICE = Selector("span", cls=r"price", flags=re.I)
+    _LOCATION = Selector("span", cls=r"location", flags=re.I)
+    _SELLER = Selector("span", cls=r"seller", flags=re.I)
+    _LISTING_ID = re.compile(r"/a(\d+)")
+    _JSON_LISTING_ID = re.compile(r"/[am](\d+)")
+
+    # Readable labels for Marktplaats priceInfo.priceType values
+    PRICE_TYPES = {
+        "SEE_DESCRIPTION": "Zie omschrijving",
+        "ON_REQUEST": "Op aanvraag",
+        "NOTK": "Notk",
+        "FAST_BID": "Bieden",
+        "MIN_BID": "Bieden",
+        "BIDDING": "Bieden",
+        "EXCHANGE": "Ruilen",
+        "FREE": "Gratis",
+        "RESERVED": "Gereserveerd",
+    }
+
+    # Which extraction path served each listing page (shared across instances)
+    path_stats: Dict[str, int] = new_path_stats()
+
+    def __init__(
+        self,
+        delay_min: float = 1.0,
+        delay_max: float = 3.0,
+        max_concurrent: Optional[int] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.delay_min = delay_min
         self.delay_max = delay_max
+        self.max_concurrent = max_concurrent or settings.SCRAPER_MAX_CONCURRENT
+        self.scheduler = HostScheduler(self._get_delay)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._http_client = http_client
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
-    async def _get_delay(self) -> float:
+    def _get_delay(self) -> float:
         """Get random delay for rate limiting"""
-        import random
         return random.uniform(self.delay_min, self.delay_max)
 
     async def search_vakmensen(
@@ -79,6 +147,9 @@ class MarktplaatsScraper:
         """
         Search for vakmensen in a specific category
 
+        Pages are requested concurrently (spaced by the per-host delay) and
+        pages past the first empty one are cancelled.
+
         Args:
             category: Category key (loodgieter, elektricien, etc.)
             location: City or postal code
@@ -92,64 +163,199 @@ class MarktplaatsScraper:
             logger.warning(f"Unknown category: {category}")
             return []
 
-        results = []
-        category_path = self.CATEGORIES[category]
-
-        async with httpx.AsyncClient(headers=self.headers, timeout=30.0, follow_redirects=True) as client:
-            for page in range(1, max_pages + 1):
-                try:
-                    # Build URL with filters
-                    url = f"{self.BASE_URL}{category_path}"
-                    params = {"currentPage": page}
-
-                    if location:
-                        params["postcode"] = location
-                        params["distanceMeters"] = distance_km * 1000
-
-                    logger.info(f"Marktplaats: Scraping {category} page {page}")
+        pages = {}
+        async for page, listings in self._iter_category(self.http_client, category, location, distance_km, max_pages):
+            pages[page] = listings
 
-                    # Add delay
-                    await asyncio.sleep(await self._get_delay())
-
-                    response = await client.get(url, params=params)
-
-                    if response.status_code != 200:
-                        logger.warning(f"Marktplaats returned {response.status_code}")
-                        break
+        results = [listing for page in sorted(pages) for listing in pages[page]]
+        logger.info(f"Marktplaats: Total {len(results)} vakmensen found for {category}")
+        return results
 
-                    # Parse listings
-                    listings = self._parse_listing_page(response.text, category)
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one"""
+        return self._http_client or get_http_clients().get("marktplaats")
 
-                    if not listings:
-                        logger.info(f"No more listings on page {page}")
-                        break
+    def _iter_category(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        location: Optional[str],
+        distance_km: int,
+        max_pages: int,
+    ) -> AsyncIterator[Tuple[int, List[MarktplaatsVakman]]]:
+        """Stream (page, listings) for one category as pages arrive"""
+        async def fetch_page(page: int) -> List[MarktplaatsVakman]:
+            # Build URL with filters
+            url = f"{self.BASE_URL}{self.CATEGORIES[category]}"
+            params = {"currentPage": page}
+
+            if location:
+                params["postcode"] = location
+                params["distanceMeters"] = distance_km * 1000
+
+            # Politeness delay is per host and taken outside the request slot
+            await self.scheduler.wait(self.BASE_URL)
+            async with self._slots:
+                logger.info(f"Marktplaats: Scraping {category} page {page}")
+                response = await get_response_cache().get(
+                    client, url, params=params, headers=self.headers, source="marktplaats",
+                    cacheable=is_not_challenge_page,
+                )
+
+            if response.status_code != 200:
+                logger.warning(f"Marktplaats returned {response.status_code}")
+                return []
+
+            # Parse listings
+            path, listings = await parse(self._extract_listings, response.text, category)
+            self.path_stats[path] += 1
+            logger.info(f"Found {len(listings)} listings on page {page}")
+            return listings
+
+        return iter_pages(fetch_page, max_pages)
+
+    @classmethod
+    def _parse_listing_page(cls, html: str, category: str) -> List[MarktplaatsVakman]:
+        """Parse a listing page and extract vakmensen (runs in the parse executor)"""
+        return cls._extract_listings(html, category)[1]
+
+    @classmethod
+    def _extract_listings(cls, html: str, category: str) -> Tuple[str, List[MarktplaatsVakman]]:
+        """
+        Extract listings, preferring embedded JSON over the DOM
 
-                    results.extend(listings)
-                    logger.info(f"Found {len(listings)} listings on page {page}")
+        Returns:
+            (path, listings) where path names the source that served the page
+        """
+        next_data = extract_next_data(html)
+        if next_data:
+            listings = cls._listings_from_json(next_data, category)
+            if listings:
+                return PATH_NEXT_DATA, listings
+
+        apollo = extract_apollo_state(html)
+        if apollo:
+            listings = cls._listings_from_json(apollo, category)
+            if listings:
+                return PATH_APOLLO, listings
+
+        json_ld = extract_json_ld(html)
+        if json_ld:
+            listings = cls._listings_from_json_ld(json_ld, category)
+            if listings:
+                return PATH_JSON_LD, listings
+
+        listings = cls._parse_listing_dom(html, category)
+        return (PATH_DOM if listings else PATH_EMPTY), listings
+
+    @classmethod
+    def _listings_from_json(cls, data: dict, category: str) -> List[MarktplaatsVakman]:
+        """Map Next.js / Apollo listing objects (``itemId`` + ``title``)"""
+        listings = []
+        seen = set()
+        for obj in iter_dicts(data):
+            item_id = obj.get("itemId")
+            if not item_id or not obj.get("title") or item_id in seen:
+                continue
+            seen.add(item_id)
+            try:
+                listings.append(cls._listing_from_json(obj, category))
+            except Exception as e:
+                logger.debug(f"Could not map listing JSON: {e}")
+        return listings
 
-                except Exception as e:
-                    logger.error(f"Error scraping page {page}: {e}")
-                    break
+    @classmethod
+    def _listing_from_json(cls, obj: dict, category: str) -> MarktplaatsVakman:
+        seller = obj.get("sellerInformation") or obj.get("seller") or {}
+        href = pick(obj, "vipUrl", "url") or ""
+        url = f"{cls.BASE_URL}{href}" if href.startswith("/") else href
+
+        return MarktplaatsVakman(
+            listing_id=re.sub(r"^[a-zA-Z]+", "", str(obj["itemId"])),
+            title=obj["title"],
+            description=pick(obj, "description", "categorySpecificDescription"),
+            category="diensten-en-vakmensen",
+            subcategory=category,
+            location=pick(obj, "location.cityName", "location.city"),
+            price=cls._format_price(obj.get("priceInfo")),
+            seller_name=to_str(pick(seller, "sellerName", "name")),
+            seller_since=to_str(pick(seller, "sellerSince", "memberSince", "activeSince")),
+            phone=to_str(pick(seller, "phoneNumber", "phone") or pick(obj, "phoneNumber")),
+            rating=to_float(pick(seller, "averageScore", "rating", "reviewScore")),
+            review_count=to_int(pick(seller, "numberOfReviews", "reviewCount")),
+            url=url or f"{cls.BASE_URL}/v/{obj['itemId']}",
+            scraped_at=datetime.utcnow(),
+        )
+
+    @classmethod
+    def _listings_from_json_ld(cls, objects: List[dict], category: str) -> List[MarktplaatsVakman]:
+        """Map schema.org Product/Offer/Service items, expanding ItemLists"""
+        items = []
+        for obj in objects:
+            if has_type(obj, ["ItemList"]):
+                for element in obj.get("itemListElement") or []:
+                    if isinstance(element, dict):
+                        items.append(element.get("item") if isinstance(element.get("item"), dict) else element)
+            else:
+                items.append(obj)
 
-        logger.info(f"Marktplaats: Total {len(results)} vakmensen found for {category}")
-        return results
+        listings = []
+        for item in items:
+            if not has_type(item, ["Product", "Offer", "Service"]) or not item.get("name"):
+                continue
+            url = to_str(pick(item, "url", "offers.url")) or ""
+            listing_id = cls._JSON_LISTING_ID.search(url)
+            price = pick(item, "offers.price")
+            try:
+                listings.append(MarktplaatsVakman(
+                    listing_id=listing_id.group(1) if listing_id else url,
+                    title=to_str(item["name"]),
+                    description=to_str(item.get("description")),
+                    category="diensten-en-vakmensen",
+                    subcategory=category,
+                    location=to_str(pick(item, "offers.availableAtOrFrom.address.addressLocality", "address.addressLocality")),
+                    price=f"€ {price}" if price is not None else None,
+                    seller_name=to_str(pick(item, "offers.seller.name", "seller.name", "brand.name")),
+                    phone=to_str(pick(item, "telephone", "offers.seller.telephone")),
+                    rating=to_float(pick(item, "aggregateRating.ratingValue")),
+                    review_count=to_int(pick(item, "aggregateRating.reviewCount", "aggregateRating.ratingCount")),
+                    url=url,
+                    scraped_at=datetime.utcnow(),
+                ))
+            except Exception as e:
+                logger.debug(f"Could not map listing JSON-LD: {e}")
+        return listings
 
-    def _parse_listing_page(self, html: str, category: str) -> List[MarktplaatsVakman]:
-        """Parse a listing page and extract vakmensen"""
-        soup = BeautifulSoup(html, "html.parser")
+    @classmethod
+    def _format_price(cls, price_info: Optional[dict]) -> Optional[str]:
+        """Render priceInfo the way the listing card shows it (e.g. "€ 75,00")"""
+        if not isinstance(price_info, dict):
+            return None
+        cents = price_info.get("priceCents")
+        if cents:
+            amount = f"{cents / 100:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+            return f"€ {amount}"
+        price_type = price_info.get("priceType")
+        return cls.PRICE_TYPES.get(price_type, price_type)
+
+    @classmethod
+    def _parse_listing_dom(cls, html: str, category: str) -> List[MarktplaatsVakman]:
+        """DOM fallback for pages without embedded listing JSON"""
+        doc = parse_document(html, only=("li", "article"))
         listings = []
 
         # Find all listing cards
         # Marktplaats uses data attributes for listings
-        cards = soup.find_all("li", {"class": re.compile(r"hz-Listing")})
+        cards = doc.find_all(cls._CARD)
 
         if not cards:
             # Try alternative selectors
-            cards = soup.find_all("article", {"data-testid": re.compile(r"listing")})
+            cards = doc.find_all(cls._CARD_ALT)
 
         for card in cards:
             try:
-                listing = self._parse_listing_card(card, category)
+                listing = cls._parse_listing_card(card, category)
                 if listing:
                     listings.append(listing)
             except Exception as e:
@@ -157,39 +363,40 @@ class MarktplaatsScraper:
 
         return listings
 
-    def _parse_listing_card(self, card, category: str) -> Optional[MarktplaatsVakman]:
+    @classmethod
+    def _parse_listing_card(cls, card: Node, category: str) -> Optional[MarktplaatsVakman]:
         """Parse a single listing card"""
         try:
             # Extract listing ID from link
-            link = card.find("a", href=True)
+            link = card.find(cls._LINK)
             if not link:
                 return None
 
             href = link.get("href", "")
-            listing_id = re.search(r"/a(\d+)", href)
+            listing_id = cls._LISTING_ID.search(href)
             listing_id = listing_id.group(1) if listing_id else href
 
             # Title
-            title_elem = card.find("h3") or card.find("span", {"class": re.compile(r"title", re.I)})
-            title = title_elem.get_text(strip=True) if title_elem else "Unknown"
+            title_elem = card.find(cls._HEADING) or card.find(cls._TITLE)
+            title = title_elem.text() if title_elem else "Unknown"
 
             # Description
-            desc_elem = card.find("p") or card.find("span", {"class": re.compile(r"description", re.I)})
-            description = desc_elem.get_text(strip=True) if desc_elem else None
+            desc_elem = card.find(cls._PARAGRAPH) or card.find(cls._DESCRIPTION)
+            description = desc_elem.text() if desc_elem else None
 
             # Price
-            price_elem = card.find("span", {"class": re.compile(r"price", re.I)})
-            price = price_elem.get_text(strip=True) if price_elem else None
+            price_elem = card.find(cls._PRICE)
+            price = price_elem.text() if price_elem else None
 
             # Location
-            loc_elem = card.find("span", {"class": re.compile(r"location", re.I)})
-            location = loc_elem.get_text(strip=True) if loc_elem else None
+            loc_elem = card.find(cls._LOCATION)
+            location = loc_elem.text() if loc_elem else None
 
             # Seller info
-            seller_elem = card.find("span", {"class": re.compile(r"seller", re.I)})
-            seller_name = seller_elem.get_text(strip=True) if seller_elem else None
+            seller_elem = card.find(cls._SELLER)
+            seller_name = seller_elem.text() if seller_elem else None
 
-            url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
+            url = f"{cls.BASE_URL}{href}" if href.startswith("/") else href
 
             return MarktplaatsVakman(
                 listing_id=str(listing_id),
@@ -217,65 +424,86 @@ class MarktplaatsScraper:
         Returns:
             Dictionary with detailed listing info
         """
-        async with httpx.AsyncClient(headers=self.headers, timeout=30.0, follow_redirects=True) as client:
-            try:
-                await asyncio.sleep(await self._get_delay())
-
-                response = await client.get(listing_url)
-
-                if response.status_code != 200:
-                    return None
-
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Extract detailed info
-                details = {
-                    "url": listing_url,
-                    "scraped_at": datetime.utcnow().isoformat(),
-                }
-
-                # Title
-                title = soup.find("h1")
-                if title:
-                    details["title"] = title.get_text(strip=True)
-
-                # Description
-                desc = soup.find("div", {"class": re.compile(r"description", re.I)})
-                if desc:
-                    details["description"] = desc.get_text(strip=True)
+        client = self.http_client
+        try:
+            await self.scheduler.wait(listing_url)
 
-                # Price
-                price = soup.find("span", {"class": re.compile(r"price", re.I)})
-                if price:
-                    details["price"] = price.get_text(strip=True)
+            response = await get_response_cache().get(
+                client, listing_url, headers=self.headers, source="marktplaats",
+                cacheable=is_not_challenge_page,
+            )
 
-                # Seller info
-                seller_section = soup.find("div", {"class": re.compile(r"seller", re.I)})
-                if seller_section:
-                    seller_name = seller_section.find("a")
-                    if seller_name:
-                        details["seller_name"] = seller_name.get_text(strip=True)
+            if response.status_code != 200:
+                return None
 
-                    # Member since
-                    member_since = seller_section.find(string=re.compile(r"sinds", re.I))
-                    if member_since:
-                        details["seller_since"] = str(member_since).strip()
+            return await parse(self._parse_listing_details, response.text, listing_url)
 
-                # Phone number (may be hidden)
-                phone = soup.find("a", href=re.compile(r"tel:"))
-                if phone:
-                    details["phone"] = phone.get("href", "").replace("tel:", "")
+        except Exception as e:
+            logger.error(f"Error getting listing details: {e}")
+            return None
 
-                # Location
-                location = soup.find("span", {"class": re.compile(r"location", re.I)})
-                if location:
-                    details["location"] = location.get_text(strip=True)
+    @classmethod
+    def _parse_listing_details(cls, html: str, listing_url: str) -> Dict[str, Any]:
+        """Parse a single listing page (runs in the parse executor)"""
+        soup = BeautifulSoup(html, "html.parser")
 
-                return details
+        # Extract detailed info
+        details = {
+            "url": listing_url,
+            "scraped_at": datetime.utcnow().isoformat(),
+        }
 
-            except Exception as e:
-                logger.error(f"Error getting listing details: {e}")
-                return None
+        # Title
+        title = soup.find("h1")
+        if title:
+            details["title"] = title.get_text(strip=True)
+
+        # Description
+        desc = soup.find("div", {"class": re.compile(r"description", re.I)})
+        if desc:
+            details["description"] = desc.get_text(strip=True)
+
+        # Price
+        price = soup.find("span", {"class": re.compile(r"price", re.I)})
+        if price:
+            details["price"] = price.get_text(strip=True)
+
+        # Seller info
+        seller_section = soup.find("div", {"class": re.compile(r"seller", re.I)})
+        if seller_section:
+            seller_name = seller_section.find("a")
+            if seller_name:
+                details["seller_name"] = seller_name.get_text(strip=True)
+
+            # Member since
+            member_since = seller_section.find(string=re.compile(r"sinds", re.I))
+            if member_since:
+                details["seller_since"] = str(member_since).strip()
+
+        # Phone number (may be hidden)
+        phone = soup.find("a", href=re.compile(r"tel:"))
+        if phone:
+            details["phone"] = phone.get("href", "").replace("tel:", "")
+
+        # Location
+        location = soup.find("span", {"class": re.compile(r"location", re.I)})
+        if location:
+            details["location"] = location.get_text(strip=True)
+
+        # Embedded listing JSON carries the fields the markup hides
+        next_data = extract_next_data(html)
+        if next_data:
+            listings = cls._listings_from_json(next_data, "")
+            if listings:
+                structured = listings[0].model_dump(
+                    include={"title", "description", "price", "location", "seller_name",
+                             "seller_since", "phone", "rating", "review_count"},
+                    exclude_none=True,
+                )
+                for key, value in structured.items():
+                    details.setdefault(key, value)
+
+        return details
 
     async def search_all_categories(
         self,
@@ -295,17 +523,59 @@ class MarktplaatsScraper:
             Dictionary with category -> list of vakmensen
         """
         categories_to_search = categories or list(self.CATEGORIES.keys())
-        results = {}
+        pages: Dict[str, Dict[int, List[MarktplaatsVakman]]] = {c: {} for c in categories_to_search}
 
-        for category in categories_to_search:
-            vakmensen = await self.search_vakmensen(
-                category=category,
-                location=location,
-                max_pages=max_pages_per_category,
-            )
-            results[category] = vakmensen
+        async for category, (page, listings) in self._iter_categories(
+            location, categories_to_search, max_pages_per_category
+        ):
+            pages[category][page] = listings
+
+        results = {
+            category: [listing for page in sorted(by_page) for listing in by_page[page]]
+            for category, by_page in pages.items()
+        }
 
         total = sum(len(v) for v in results.values())
         logger.info(f"Marktplaats: Total {total} vakmensen across {len(categories_to_search)} categories")
 
         return results
+
+    async def iter_all_categories(
+        self,
+        location: Optional[str] = None,
+        categories: Optional[List[str]] = None,
+        max_pages_per_category: int = 2,
+    ) -> AsyncIterator[Tuple[str, List[MarktplaatsVakman]]]:
+        """
+        Stream listings for several categories as each page arrives
+
+        Args:
+            location: City or postal code
+            categories: List of categories to search (default: all)
+            max_pages_per_category: Max pages per category
+
+        Yields:
+            (category, listings) per page, in arrival order
+        """
+        categories_to_search = categories or list(self.CATEGORIES.keys())
+        async for category, (_, listings) in self._iter_categories(
+            location, categories_to_search, max_pages_per_category
+        ):
+            yield category, listings
+
+    async def _iter_categories(
+        self,
+        location: Optional[str],
+        categories: List[str],
+        max_pages: int,
+        distance_km: int = 30,
+    ) -> AsyncIterator[Tuple[str, Tuple[int, List[MarktplaatsVakman]]]]:
+        """Fan out over categories with one shared client"""
+        client = self.http_client
+        streams = {
+            category: partial(self._iter_category, client, category, location, distance_km, max_pages)
+            for category in categories
+            if category in self.CATEGORIES
+        }
+        async for item in merge_streams(streams, settings.SCRAPER_CATEGORY_CONCURRENCY):
+            yield item
@@ -0,0 +1,131 @@
+"""Embedded structured data (Next.js, JSON-LD, Apollo) extraction
+
+Listing pages ship their data as JSON for client-side hydration. Decoding that
+JSON with a regex + json.loads is much cheaper than walking the DOM and gives
+us fields the markup does not show (phone, member-since, ratings).
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from loguru import logger
+
+
+PATH_NEXT_DATA = "next_data"
+PATH_APOLLO = "apollo"
+PATH_JSON_LD = "json_ld"
+PATH_DOM = "dom"
+PATH_EMPTY = "empty"
+
+_NEXT_DATA_RE = re.compile(
+    r"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>", re.S | re.I
+)
+_JSON_LD_RE = re.compile(
+    r"<script[^>]*\btype=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.S | re.I
+)
+_APOLLO_RE = re.compile(
+    r"__APOLLO_STATE__\s*=\s*(\{.*?\})\s*;?\s*</script>", re.S
+)
+
+
+def _loads(raw: str) -> Optional[Any]:
+    try:
+        return json.loads(raw.strip())
+    except (ValueError, TypeError) as e:
+        logger.debug(f"Embedded JSON could not be decoded: {e}")
+        return None
+
+
+def extract_next_data(html: str) -> Optional[dict]:
+    """Decoded ``<script id="__NEXT_DATA__">`` payload, if present"""
+    match = _NEXT_DATA_RE.search(html)
+    data = _loads(match.group(1)) if match else None
+    return data if isinstance(data, dict) else None
+
+
+def extract_apollo_state(html: str) -> Optional[dict]:
+    """Decoded ``window.__APOLLO_STATE__`` cache, if present"""
+    match = _APOLLO_RE.search(html)
+    data = _loads(match.group(1)) if match else None
+    return data if isinstance(data, dict) else None
+
+
+def extract_json_ld(html: str) -> List[dict]:
+    """All JSON-LD objects on the page, with ``@graph`` containers flattened"""
+    objects: List[dict] = []
+    for match in _JSON_LD_RE.finditer(html):
+        data = _loads(match.group(1))
+        stack = data if isinstance(data, list) else [data]
+        for item in stack:
+            if not isinstance(item, dict):
+                continue
+            if isinstance(item.get("@graph"), list):
+                objects.extend(i for i in item["@graph"] if isinstance(i, dict))
+            else:
+                objects.append(item)
+    return objects
+
+
+def iter_dicts(obj: Any) -> Iterator[dict]:
+    """Depth-first walk over every dict nested in ``obj``"""
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def pick(data: Optional[dict], *paths: str) -> Any:
+    """First non-empty value among dotted ``paths`` (e.g. "address.addressLocality")"""
+    if not isinstance(data, dict):
+        return None
+    for path in paths:
+        value: Any = data
+        for part in path.split("."):
+            if isinstance(value, list):
+                value = value[0] if value else None
+            value = value.get(part) if isinstance(value, dict) else None
+            if value is None:
+                break
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def has_type(obj: dict, types: Sequence[str]) -> bool:
+    """Whether a JSON-LD object has one of the given ``@type`` values"""
+    value = obj.get("@type")
+    values = value if isinstance(value, list) else [value]
+    return any(v in types for v in values if isinstance(v, str))
+
+
+def to_str(value: Any) -> Optional[str]:
+    """Scalar JSON value as text (numeric KvK/phone fields are common), else None"""
+    if value is None or isinstance(value, (dict, list, bool)):
+        return None
+    return str(value)
+
+
+def to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(str(value).replace(",", "."))
+    except ValueError:
+        return None
+
+
+def to_int(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(str(value).replace(",", ".")))
+    except ValueError:
+        return None
+
+
+def new_path_stats() -> Dict[str, int]:
+    """Counter dict for which extraction path served each page"""
+    return {PATH_NEXT_DATA: 0, PATH_APOLLO: 0, PATH_JSON_LD: 0, PATH_DOM: 0, PATH_EMPTY: 0}
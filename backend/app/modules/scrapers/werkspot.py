@@ -1,13 +1,40 @@
 """Werkspot Public Profile Scraper for Vakmensen Discovery"""
 import asyncio
+import random
 import re
-from typing import Optional, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from loguru import logger
 import httpx
 from bs4 import BeautifulSoup
 from pydantic import BaseModel
 
+from ...core.config import settings
+from ...core.http_cache import get_response_cache, is_not_challenge_page
+from ...core.http_clients import get_http_clients
+from ...core.parsing import parse
+from ..radar.scheduler import HostScheduler
+from .extraction import Node, Selector, parse_document
+from .fanout import iter_pages, merge_streams
+from .structured import (
+    PATH_APOLLO,
+    PATH_DOM,
+    PATH_EMPTY,
+    PATH_JSON_LD,
+    PATH_NEXT_DATA,
+    extract_apollo_state,
+    extract_json_ld,
+    extract_next_data,
+    has_type,
+    iter_dicts,
+    new_path_stats,
+    pick,
+    to_float,
+    to_int,
+    to_str,
+)
+
 
 class WerkspotVakman(BaseModel):
     """Werkspot vakman profile model"""
@@ -21,6 +48,7 @@ class WerkspotVakman(BaseModel):
     verified: bool = False
     kvk_nummer: Optional[str] = None
     website: Optional[str] = None
+    phone: Optional[str] = None
     profile_url: str
     scraped_at: datetime
 
@@ -59,18 +87,62 @@ class WerkspotScraper:
         "keuken": "/keuken-plaatsen/",
     }
 
-    def __init__(self, delay_min: float = 2.0, delay_max: float = 4.0):
+    # Popular categories for location sweeps
+    DEFAULT_CATEGORIES = [
+        "loodgieter", "elektricien", "schilder", "timmerman",
+        "dakdekker", "aannemer", "klusjesman", "cv_monteur",
+    ]
+
+    # Profile card selectors, compiled once
+    _CARD = Selector("div", cls=r"professional-card|specialist-card", flags=re.I)
+    _CARD_ALT = Selector("article", attrs={"data-testid": r"specialist"}, flags=re.I)
+    _CARD_ANY = Selector("div", cls=r"card", flags=re.I)
+    _PROFILE_LINK = Selector("a", attrs={"href": r"/profiel/"})
+    _LINK = Selector("a", attrs={"href": True})
+    _H2 = Selector("h2")
+    _H3 = Selector("h3")
+    _STRONG = Selector("strong")
+    _RATING = Selector("span", cls=r"rating|score", flags=re.I)
+    _REVIEWS = Selector("span", cls=r"review", flags=re.I)
+    _LOCATION = Selector("span", cls=r"location|city", flags=re.I)
+    _VERIFIED = Selector("span", cls=r"verified|badge", flags=re.I)
+    _PARAGRAPH = Selector("p")
+    _DESCRIPTION = Selector("span", cls=r"description", flags=re.I)
+    _PROFILE_ID = re.compile(r"/profiel/([^/]+)")
+    _DECIMAL = re.compile(r"(\d+[.,]\d+)")
+    _INTEGER = re.compile(r"(\d+)")
+
+    # schema.org types Werkspot uses for professionals
+    BUSINESS_TYPES = (
+        "LocalBusiness", "HomeAndConstructionBusiness", "ProfessionalService",
+        "Plumber", "Electrician", "RoofingContractor", "GeneralContractor",
+        "HousePainter", "Locksmith", "HVACBusiness", "Organization",
+    )
+
+    # Which extraction path served each search page (shared across instances)
+    path_stats: Dict[str, int] = new_path_stats()
+
+    def __init__(
+        self,
+        delay_min: float = 2.0,
+        delay_max: float = 4.0,
+        max_concurrent: Optional[int] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.delay_min = delay_min
         self.delay_max = delay_max
+        self.max_concurrent = max_concurrent or settings.SCRAPER_MAX_CONCURRENT
+        self.scheduler = HostScheduler(self._get_delay)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._http_client = http_client
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "nl-NL,nl;q=0.9,en-US;q=0.8,en;q=0.7",
         }
 
-    async def _get_delay(self) -> float:
+    def _get_delay(self) -> float:
         """Get random delay for rate limiting"""
-        import random
         return random.uniform(self.delay_min, self.delay_max)
 
     async def search_vakmensen(
@@ -82,6 +154,9 @@ class WerkspotScraper:
         """
         Search for vakmensen in a specific category
 
+        Pages are requested concurrently (spaced by the per-host delay) and
+        pages past the first empty one are cancelled.
+
         Args:
             category: Category key (loodgieter, elektricien, etc.)
             location: City name (e.g., "amsterdam", "rotterdam")
@@ -94,68 +169,159 @@ class WerkspotScraper:
             logger.warning(f"Unknown category: {category}")
             return []
 
-        results = []
-        category_path = self.CATEGORIES[category]
-
-        async with httpx.AsyncClient(headers=self.headers, timeout=30.0, follow_redirects=True) as client:
-            for page in range(1, max_pages + 1):
-                try:
-                    # Build URL
-                    if location:
-                        url = f"{self.BASE_URL}{category_path}{location.lower()}/"
-                    else:
-                        url = f"{self.BASE_URL}{category_path}"
+        pages = {}
+        async for page, profiles in self._iter_category(self.http_client, category, location, max_pages):
+            pages[page] = profiles
 
-                    if page > 1:
-                        url = f"{url}?page={page}"
+        results = [profile for page in sorted(pages) for profile in pages[page]]
+        logger.info(f"Werkspot: Total {len(results)} vakmensen found for {category}")
+        return results
 
-                    logger.info(f"Werkspot: Scraping {category} in {location or 'NL'} page {page}")
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Injected client, or the shared pooled one"""
+        return self._http_client or get_http_clients().get("werkspot")
 
-                    # Add delay
-                    await asyncio.sleep(await self._get_delay())
+    def _iter_category(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        location: Optional[str],
+        max_pages: int,
+    ) -> AsyncIterator[Tuple[int, List[WerkspotVakman]]]:
+        """Stream (page, profiles) for one category as pages arrive"""
+        async def fetch_page(page: int) -> List[WerkspotVakman]:
+            # Build URL
+            category_path = self.CATEGORIES[category]
+            if location:
+                url = f"{self.BASE_URL}{category_path}{location.lower()}/"
+            else:
+                url = f"{self.BASE_URL}{category_path}"
+
+            if page > 1:
+                url = f"{url}?page={page}"
+
+            # Politeness delay is per host and taken outside the request slot
+            await self.scheduler.wait(self.BASE_URL)
+            async with self._slots:
+                logger.info(f"Werkspot: Scraping {category} in {location or 'NL'} page {page}")
+                response = await get_response_cache().get(
+                    client, url, headers=self.headers, source="werkspot",
+                    cacheable=is_not_challenge_page,
+                )
 
-                    response = await client.get(url)
+            if response.status_code != 200:
+                logger.warning(f"Werkspot returned {response.status_code}")
+                return []
 
-                    if response.status_code != 200:
-                        logger.warning(f"Werkspot returned {response.status_code}")
-                        break
+            # Parse profiles
+            path, profiles = await parse(self._extract_profiles, response.text, category)
+            self.path_stats[path] += 1
+            logger.info(f"Found {len(profiles)} profiles on page {page}")
+            return profiles
 
-                    # Parse profiles
-                    profiles = self._parse_search_page(response.text, category)
+        return iter_pages(fetch_page, max_pages)
 
-                    if not profiles:
-                        logger.info(f"No more profiles on page {page}")
-                        break
+    @classmethod
+    def _parse_search_page(cls, html: str, category: str) -> List[WerkspotVakman]:
+        """Parse a search results page and extract vakman profiles (runs in the parse executor)"""
+        return cls._extract_profiles(html, category)[1]
 
-                    results.extend(profiles)
-                    logger.info(f"Found {len(profiles)} profiles on page {page}")
+    @classmethod
+    def _extract_profiles(cls, html: str, category: str) -> Tuple[str, List[WerkspotVakman]]:
+        """
+        Extract profiles, preferring embedded JSON over the DOM
 
-                except Exception as e:
-                    logger.error(f"Error scraping page {page}: {e}")
-                    break
+        Returns:
+            (path, profiles) where path names the source that served the page
+        """
+        next_data = extract_next_data(html)
+        if next_data:
+            profiles = cls._profiles_from_objects(iter_dicts(next_data), category)
+            if profiles:
+                return PATH_NEXT_DATA, profiles
+
+        apollo = extract_apollo_state(html)
+        if apollo:
+            profiles = cls._profiles_from_objects(iter_dicts(apollo), category)
+            if profiles:
+                return PATH_APOLLO, profiles
+
+        json_ld = extract_json_ld(html)
+        if json_ld:
+            businesses = [o for o in iter_dicts(json_ld) if has_type(o, cls.BUSINESS_TYPES)]
+            profiles = cls._profiles_from_objects(businesses, category)
+            if profiles:
+                return PATH_JSON_LD, profiles
+
+        profiles = cls._parse_search_dom(html, category)
+        return (PATH_DOM if profiles else PATH_EMPTY), profiles
+
+    @classmethod
+    def _profiles_from_objects(cls, objects, category: str) -> List[WerkspotVakman]:
+        """Map every object that links to a /profiel/ page and carries a name"""
+        profiles = []
+        seen = set()
+        for obj in objects:
+            try:
+                profile = cls._profile_from_json(obj, category)
+            except Exception as e:
+                logger.debug(f"Could not map profile JSON: {e}")
+                continue
+            if profile and profile.profile_id not in seen:
+                seen.add(profile.profile_id)
+                profiles.append(profile)
+        return profiles
 
-        logger.info(f"Werkspot: Total {len(results)} vakmensen found for {category}")
-        return results
+    @classmethod
+    def _profile_from_json(cls, obj: dict, category: str) -> Optional[WerkspotVakman]:
+        """Map a Next.js/Apollo profile object or a JSON-LD business"""
+        href = pick(obj, "profileUrl", "url", "href", "@id") or ""
+        if not isinstance(href, str) or "/profiel/" not in href:
+            slug = obj.get("slug")
+            href = f"/profiel/{slug}" if isinstance(slug, str) and slug else ""
+        name = pick(obj, "companyName", "displayName", "name")
+        if not href or not isinstance(name, str):
+            return None
 
-    def _parse_search_page(self, html: str, category: str) -> List[WerkspotVakman]:
-        """Parse a search results page and extract vakman profiles"""
-        soup = BeautifulSoup(html, "html.parser")
+        profile_id = cls._PROFILE_ID.search(href)
+        website = pick(obj, "website", "sameAs")
+        return WerkspotVakman(
+            profile_id=profile_id.group(1) if profile_id else href,
+            company_name=name,
+            description=to_str(pick(obj, "description", "about", "tagline")),
+            categories=[category],
+            location=to_str(pick(obj, "city", "location.city", "address.addressLocality", "address.city")),
+            rating=to_float(pick(obj, "aggregateRating.ratingValue", "averageRating", "rating.average", "rating")),
+            review_count=to_int(pick(obj, "aggregateRating.reviewCount", "reviewCount", "numberOfReviews", "reviews.count")),
+            verified=bool(pick(obj, "verified", "isVerified")),
+            kvk_nummer=to_str(pick(obj, "kvkNumber", "kvk", "chamberOfCommerceNumber")),
+            website=website if isinstance(website, str) else None,
+            phone=to_str(pick(obj, "telephone", "phone", "phoneNumber")),
+            profile_url=f"{cls.BASE_URL}{href}" if href.startswith("/") else href,
+            scraped_at=datetime.utcnow(),
+        )
+
+    @classmethod
+    def _parse_search_dom(cls, html: str, category: str) -> List[WerkspotVakman]:
+        """DOM fallback for pages without embedded profile JSON"""
+        doc = parse_document(html, only=("div", "article"))
         profiles = []
 
         # Find all profile cards
-        cards = soup.find_all("div", {"class": re.compile(r"professional-card|specialist-card", re.I)})
+        cards = doc.find_all(cls._CARD)
 
         if not cards:
             # Try alternative selectors
-            cards = soup.find_all("article", {"data-testid": re.compile(r"specialist", re.I)})
+            cards = doc.find_all(cls._CARD_ALT)
 
         if not cards:
             # Try finding any card-like structures with company info
-            cards = soup.find_all("div", {"class": re.compile(r"card", re.I)})
+            cards = doc.find_all(cls._CARD_ANY)
 
         for card in cards:
             try:
-                profile = self._parse_profile_card(card, category)
+                profile = cls._parse_profile_card(card, category)
                 if profile:
                     profiles.append(profile)
             except Exception as e:
@@ -163,57 +329,56 @@ class WerkspotScraper:
 
         return profiles
 
-    def _parse_profile_card(self, card, category: str) -> Optional[WerkspotVakman]:
+    @classmethod
+    def _parse_profile_card(cls, card: Node, category: str) -> Optional[WerkspotVakman]:
         """Parse a single profile card"""
         try:
             # Find profile link
-            link = card.find("a", href=re.compile(r"/profiel/"))
+            link = card.find(cls._PROFILE_LINK)
             if not link:
-                link = card.find("a", href=True)
+                link = card.find(cls._LINK)
 
             if not link:
                 return None
 
             href = link.get("href", "")
-            profile_id = re.search(r"/profiel/([^/]+)", href)
+            profile_id = cls._PROFILE_ID.search(href)
             profile_id = profile_id.group(1) if profile_id else href
 
             # Company name
-            name_elem = card.find("h2") or card.find("h3") or card.find("strong")
-            company_name = name_elem.get_text(strip=True) if name_elem else "Unknown"
+            name_elem = card.find(cls._H2) or card.find(cls._H3) or card.find(cls._STRONG)
+            company_name = name_elem.text() if name_elem else "Unknown"
 
             # Rating
             rating = None
-            rating_elem = card.find("span", {"class": re.compile(r"rating|score", re.I)})
+            rating_elem = card.find(cls._RATING)
             if rating_elem:
-                rating_text = rating_elem.get_text(strip=True)
-                rating_match = re.search(r"(\d+[.,]\d+)", rating_text)
+                rating_match = cls._DECIMAL.search(rating_elem.text())
                 if rating_match:
                     rating = float(rating_match.group(1).replace(",", "."))
 
             # Review count
             review_count = None
-            review_elem = card.find("span", {"class": re.compile(r"review", re.I)})
+            review_elem = card.find(cls._REVIEWS)
             if review_elem:
-                review_text = review_elem.get_text(strip=True)
-                review_match = re.search(r"(\d+)", review_text)
+                review_match = cls._INTEGER.search(review_elem.text())
                 if review_match:
                     review_count = int(review_match.group(1))
 
             # Location
             location = None
-            loc_elem = card.find("span", {"class": re.compile(r"location|city", re.I)})
+            loc_elem = card.find(cls._LOCATION)
             if loc_elem:
-                location = loc_elem.get_text(strip=True)
+                location = loc_elem.text()
 
             # Verified badge
-            verified = bool(card.find("span", {"class": re.compile(r"verified|badge", re.I)}))
+            verified = bool(card.find(cls._VERIFIED))
 
             # Description
-            desc_elem = card.find("p") or card.find("span", {"class": re.compile(r"description", re.I)})
-            description = desc_elem.get_text(strip=True) if desc_elem else None
+            desc_elem = card.find(cls._PARAGRAPH) or card.find(cls._DESCRIPTION)
+            description = desc_elem.text() if desc_elem else None
 
-            profile_url = f"{self.BASE_URL}{href}" if href.startswith("/") else href
+            profile_url = f"{cls.BASE_URL}{href}" if href.startswith("/") else href
 
             return WerkspotVakman(
                 profile_id=str(profile_id),
@@ -241,81 +406,102 @@ class WerkspotScraper:
         Returns:
             Dictionary with detailed profile info
         """
-        async with httpx.AsyncClient(headers=self.headers, timeout=30.0, follow_redirects=True) as client:
-            try:
-                await asyncio.sleep(await self._get_delay())
-
-                response = await client.get(profile_url)
-
-                if response.status_code != 200:
-                    return None
-
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                details = {
-                    "url": profile_url,
-                    "scraped_at": datetime.utcnow().isoformat(),
-                }
-
-                # Company name
-                name = soup.find("h1")
-                if name:
-                    details["company_name"] = name.get_text(strip=True)
-
-                # Description / About
-                about = soup.find("div", {"class": re.compile(r"about|description", re.I)})
-                if about:
-                    details["description"] = about.get_text(strip=True)
-
-                # Rating
-                rating = soup.find("span", {"class": re.compile(r"rating-value|score", re.I)})
-                if rating:
-                    rating_text = rating.get_text(strip=True)
-                    rating_match = re.search(r"(\d+[.,]\d+)", rating_text)
-                    if rating_match:
-                        details["rating"] = float(rating_match.group(1).replace(",", "."))
-
-                # Review count
-                reviews = soup.find("span", {"class": re.compile(r"review-count", re.I)})
-                if reviews:
-                    review_text = reviews.get_text(strip=True)
-                    review_match = re.search(r"(\d+)", review_text)
-                    if review_match:
-                        details["review_count"] = int(review_match.group(1))
-
-                # KvK nummer (if publicly displayed)
-                kvk = soup.find(string=re.compile(r"KvK|KVK|Kamer van Koophandel", re.I))
-                if kvk:
-                    kvk_match = re.search(r"(\d{8})", str(kvk.parent))
-                    if kvk_match:
-                        details["kvk_nummer"] = kvk_match.group(1)
-
-                # Location
-                location = soup.find("span", {"class": re.compile(r"location|address", re.I)})
-                if location:
-                    details["location"] = location.get_text(strip=True)
-
-                # Services / Categories
-                services = soup.find_all("span", {"class": re.compile(r"service|category|specialty", re.I)})
-                if services:
-                    details["services"] = [s.get_text(strip=True) for s in services]
-
-                # Website
-                website = soup.find("a", {"class": re.compile(r"website", re.I)})
-                if website:
-                    details["website"] = website.get("href")
-
-                # Certifications
-                certs = soup.find_all("span", {"class": re.compile(r"cert|badge|qualification", re.I)})
-                if certs:
-                    details["certifications"] = [c.get_text(strip=True) for c in certs]
-
-                return details
+        client = self.http_client
+        try:
+            await self.scheduler.wait(profile_url)
 
-            except Exception as e:
-                logger.error(f"Error getting profile details: {e}")
+            response = await get_response_cache().get(
+                client, profile_url, headers=self.headers, source="werkspot",
+                cacheable=is_not_challenge_page,
+            )
+
+            if response.status_code != 200:
                 return None
 
+            return await parse(self._parse_profile_details, response.text, profile_url)
+
+        except Exception as e:
+            logger.error(f"Error getting profile details: {e}")
+            return None
+
+    @classmethod
+    def _parse_profile_details(cls, html: str, profile_url: str) -> Dict[str, Any]:
+        """Parse a single profile page (runs in the parse executor)"""
+        soup = BeautifulSoup(html, "html.parser")
+
+        details = {
+            "url": profile_url,
+            "scraped_at": datetime.utcnow().isoformat(),
+        }
+
+        # Company name
+        name = soup.find("h1")
+        if name:
+            details["company_name"] = name.get_text(strip=True)
+
+        # Description / About
+        about = soup.find("div", {"class": re.compile(r"about|description", re.I)})
+        if about:
+            details["description"] = about.get_text(strip=True)
+
+        # Rating
+        rating = soup.find("span", {"class": re.compile(r"rating-value|score", re.I)})
+        if rating:
+            rating_text = rating.get_text(strip=True)
+            rating_match = re.search(r"(\d+[.,]\d+)", rating_text)
+            if rating_match:
+                details["rating"] = float(rating_match.group(1).replace(",", "."))
+
+        # Review count
+        reviews = soup.find("span", {"class": re.compile(r"review-count", re.I)})
+        if reviews:
+            review_text = reviews.get_text(strip=True)
+            review_match = re.search(r"(\d+)", review_text)
+            if review_match:
+                details["review_count"] = int(review_match.group(1))
+
+        # KvK nummer (if publicly displayed)
+        kvk = soup.find(string=re.compile(r"KvK|KVK|Kamer van Koophandel", re.I))
+        if kvk:
+            kvk_match = re.search(r"(\d{8})", str(kvk.parent))
+            if kvk_match:
+                details["kvk_nummer"] = kvk_match.group(1)
+
+        # Location
+        location = soup.find("span", {"class": re.compile(r"location|address", re.I)})
+        if location:
+            details["location"] = location.get_text(strip=True)
+
+        # Services / Categories
+        services = soup.find_all("span", {"class": re.compile(r"service|category|specialty", re.I)})
+        if services:
+            details["services"] = [s.get_text(strip=True) for s in services]
+
+        # Website
+        website = soup.find("a", {"class": re.compile(r"website", re.I)})
+        if website:
+            details["website"] = website.get("href")
+
+        # Certifications
+        certs = soup.find_all("span", {"class": re.compile(r"cert|badge|qualification", re.I)})
+        if certs:
+            details["certifications"] = [c.get_text(strip=True) for c in certs]
+
+        # JSON-LD business data fills in what the markup leaves out
+        businesses = [o for o in iter_dicts(extract_json_ld(html)) if has_type(o, cls.BUSINESS_TYPES)]
+        if businesses:
+            structured = cls._profile_from_json({**businesses[0], "profileUrl": profile_url}, "")
+            if structured:
+                fields = structured.model_dump(
+                    include={"company_name", "description", "location", "rating", "review_count",
+                             "kvk_nummer", "website", "phone"},
+                    exclude_none=True,
+                )
+                for key, value in fields.items():
+                    details.setdefault(key, value)
+
+        return details
+
     async def search_by_location(
         self,
         location: str,
@@ -333,25 +519,60 @@ class WerkspotScraper:
         Returns:
             Dictionary with category -> list of vakmensen
         """
-        # Default to popular categories
-        default_categories = [
-            "loodgieter", "elektricien", "schilder", "timmerman",
-            "dakdekker", "aannemer", "klusjesman", "cv_monteur"
-        ]
-        categories_to_search = categories or default_categories
-
-        results = {}
-
-        for category in categories_to_search:
-            if category in self.CATEGORIES:
-                vakmensen = await self.search_vakmensen(
-                    category=category,
-                    location=location,
-                    max_pages=max_pages_per_category,
-                )
-                results[category] = vakmensen
+        categories_to_search = categories or self.DEFAULT_CATEGORIES
+        pages: Dict[str, Dict[int, List[WerkspotVakman]]] = {
+            c: {} for c in categories_to_search if c in self.CATEGORIES
+        }
+
+        async for category, (page, profiles) in self._iter_categories(
+            location, categories_to_search, max_pages_per_category
+        ):
+            pages[category][page] = profiles
+
+        results = {
+            category: [profile for page in sorted(by_page) for profile in by_page[page]]
+            for category, by_page in pages.items()
+        }
 
         total = sum(len(v) for v in results.values())
-        logger.info(f"Werkspot: Total {len(results)} vakmensen in {location} across {len(categories_to_search)} categories")
+        logger.info(f"Werkspot: Total {total} vakmensen in {location} across {len(categories_to_search)} categories")
 
         return results
+
+    async def iter_by_location(
+        self,
+        location: str,
+        categories: Optional[List[str]] = None,
+        max_pages_per_category: int = 2,
+    ) -> AsyncIterator[Tuple[str, List[WerkspotVakman]]]:
+        """
+        Stream profiles for several categories as each page arrives
+
+        Args:
+            location: City name
+            categories: List of categories to search (default: popular ones)
+            max_pages_per_category: Max pages per category
+
+        Yields:
+            (category, profiles) per page, in arrival order
+        """
+        async for category, (_, profiles) in self._iter_categories(
+            location, categories or self.DEFAULT_CATEGORIES, max_pages_per_category
+        ):
+            yield category, profiles
+
+    async def _iter_categories(
+        self,
+        location: Optional[str],
+        categories: List[str],
+        max_pages: int,
+    ) -> AsyncIterator[Tuple[str, Tuple[int, List[WerkspotVakman]]]]:
+        """Fan out over categories with one shared client"""
+        client = self.http_client
+        streams = {
+            category: partial(self._iter_category, client, category, location, max_pages)
+            for category in categories
+            if category in self.CATEGORIES
+        }
+        async for item in merge_streams(streams, settings.SCRAPER_CATEGORY_CONCURRENCY):
+            yield item
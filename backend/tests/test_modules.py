@@ -7,9 +7,25 @@ import sys
 sys.path.insert(0, '..')
 
 from app.models import ScrapedData, ProfileRing, ProfileClassification
-from app.modules.radar import RadarScraper, StealthConfig
+from app.modules.radar import RadarScraper, StealthConfig, BrowserPool, TieredFetcher
 from app.modules.brain import BrainClassifier
 from app.modules.hook import HookGenerator
+from app.core.http_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_brain_state(monkeypatch):
+    """Give every test a memory-only classification cache and fresh BRAIN singletons"""
+    from app.modules.brain import breaker, cache, cascade, dedup, local_model, scheduler
+
+    monkeypatch.setattr(cache, "_cache", cache.ClassificationCache(path=""))
+    monkeypatch.setattr(dedup, "_index", dedup.SimHashIndex())
+    monkeypatch.setattr(cascade, "_stats", None)
+    monkeypatch.setattr(breaker, "_breakers", {})
+    monkeypatch.setattr(breaker, "_hedge_policy", None)
+    monkeypatch.setattr(scheduler, "_schedulers", {})
+    monkeypatch.setattr(local_model, "_model", None)
+    monkeypatch.setattr(local_model, "_load_attempted", True)
 
 
 class TestRadarModule:
@@ -39,11 +55,152 @@ class TestRadarModule:
     @pytest.mark.asyncio
     async def test_scraper_mock_mode(self):
         """Test scraper works in mock mode"""
-        async with RadarScraper() as scraper:
+        async with RadarScraper(tiered=False) as scraper:
             data = await scraper.scrape_url("https://example.com/test", "test")
             assert isinstance(data, ScrapedData)
             assert len(data.text_content) > 0
 
+    @pytest.mark.asyncio
+    async def test_browser_pool_reuses_and_recycles_contexts(self):
+        """Test contexts are reused per domain and recycled after N pages"""
+
+        class FakePage:
+            async def close(self):
+                pass
+
+        class FakeContext:
+            def __init__(self):
+                self.closed = False
+
+            async def new_page(self):
+                return FakePage()
+
+            async def close(self):
+                self.closed = True
+
+        class FakeBrowser:
+            def is_connected(self):
+                return True
+
+            async def new_context(self, **options):
+                return FakeContext()
+
+        pool = BrowserPool(max_contexts=2, max_pages_per_context=2, min_free_memory_mb=0)
+        pool.browser = FakeBrowser()
+
+        for _ in range(3):
+            async with pool.page("https://example.com/a"):
+                pass
+        async with pool.page("https://other.nl/"):
+            pass
+
+        stats = pool.get_stats()
+        assert stats["contexts_created"] == 3
+        assert stats["contexts_reused"] == 1
+        assert stats["contexts_recycled"] == 1
+        assert stats["contexts_leased"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_delays_apply_per_host(self):
+        """Test politeness delays only serialize URLs on the same host"""
+        config = StealthConfig(min_delay=0.2, max_delay=0.2)
+        urls = [f"https://host{i}.nl/page{j}" for i in range(4) for j in range(2)]
+
+        async with RadarScraper(stealth_config=config, tiered=False) as scraper:
+            start = asyncio.get_running_loop().time()
+            results = [data async for data in scraper.scrape_batch(urls, max_concurrent=2)]
+            elapsed = asyncio.get_running_loop().time() - start
+
+        assert len(results) == len(urls)
+        # One delay per host in parallel, not sum(delays) / concurrency
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_tiered_fetcher_remembers_js_domains(self, tmp_path):
+        """Test static pages are served over HTTP and JS apps escalate once"""
+        import httpx
+
+        static_html = "<html><title>Van Dijk</title><body><p>" + "Loodgieter " * 60 + "</p></body></html>"
+        spa_html = '<html><body><div id="root"></div><noscript>Enable JavaScript</noscript></body></html>'
+
+        def handler(request):
+            html = spa_html if request.url.host == "app.example.nl" else static_html
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+
+        fetcher = TieredFetcher(cache=ResponseCache(cache_dir=str(tmp_path)))
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        page = await fetcher.fetch_static("https://vandijk.nl/")
+        assert page is not None and page.title == "Van Dijk"
+        assert await fetcher.fetch_static("https://app.example.nl/") is None
+        assert await fetcher.fetch_static("https://app.example.nl/other") is None
+
+        stats = fetcher.get_stats()
+        assert stats["http_served"] == 1
+        assert stats["browser_escalations"] == 1
+        assert stats["browser_remembered"] == 1
+        await fetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_static_tier_runs_without_browser(self, tmp_path):
+        """Test the plain HTTP tier is tried before falling back to mock data"""
+        import httpx
+
+        html = "<html><title>Van Dijk</title><body><p>" + "Loodgieter " * 60 + "</p></body></html>"
+
+        def handler(request):
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+
+        fetcher = TieredFetcher(cache=ResponseCache(cache_dir=str(tmp_path)))
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        async with RadarScraper(fetcher=fetcher) as scraper:
+            assert not scraper.pool.available
+            data = await scraper._scrape("https://vandijk.nl/", "website")
+
+        assert data.metadata["fetch_tier"] == "http"
+        assert data.metadata["title"] == "Van Dijk"
+        await fetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_request_blocker_aborts_media_and_trackers(self):
+        """Test heavy resources and tracker hosts are aborted and counted"""
+        from types import SimpleNamespace
+        from app.modules.radar.blocking import RequestBlocker
+
+        class FakeRoute:
+            def __init__(self, url, resource_type):
+                self.request = SimpleNamespace(url=url, resource_type=resource_type)
+                self.outcome = None
+
+            async def continue_(self):
+                self.outcome = "continue"
+
+            async def abort(self, error_code=None):
+                self.outcome = "abort"
+
+        blocker = RequestBlocker(StealthConfig())
+        routes = [
+            FakeRoute("https://vandijk.nl/", "document"),
+            FakeRoute("https://vandijk.nl/hero.jpg", "image"),
+            FakeRoute("https://www.googletagmanager.com/gtm.js", "script"),
+        ]
+        for route in routes:
+            await blocker.handle(route)
+
+        assert [r.outcome for r in routes] == ["continue", "abort", "abort"]
+        stats = blocker.get_stats()
+        assert stats["requests_blocked"] == 2
+        assert stats["bytes_saved_estimate"] > 0
+        assert not StealthConfig(block_resources=False).should_block("image", "https://x.nl/a.png")
+
+    def test_blocklisted_hosts_still_navigate(self):
+        """Test documents on tracker hosts load while their subresources are blocked"""
+        config = StealthConfig()
+        assert not config.should_block("document", "https://www.linkedin.com/company/vandijk")
+        assert not config.should_block("document", "https://www.youtube.com/embed/abc")
+        assert config.should_block("script", "https://www.linkedin.com/li.js")
+
 
 class TestBrainModule:
     """Tests for the BRAIN classifier module"""
@@ -109,6 +266,740 @@ class TestBrainModule:
         assert result.ring == ProfileRing.HOBBYIST
 
 
+class TestRuleEngine:
+    """Tests for the compiled keyword rules"""
+
+    def test_terms_match_whole_words_only(self):
+        """Test indicators no longer fire inside other words or numbers"""
+        from app.modules.brain import RuleEngine
+
+        engine = RuleEngine()
+
+        noise = engine.classify("Administratie, subvloer, jongleur, info@vandijk.nl, €150 voorrijkosten")
+        assert noise.matched == frozenset()
+
+        verdict = engine.classify("Van Dijk B.V. | KvK-nummer: 12345678 | 4.8 ★ (127 reviews)")
+        assert verdict.matched == {"legal_form", "kvk_number", "reviews"}
+        assert verdict.ring == ProfileRing.VAKMAN
+        assert verdict.confidence == 0.95
+
+        hobby = engine.classify("Geen KvK, klus ik voor €15,- per uur als hobby")
+        assert hobby.matched == {"no_kvk", "low_rate", "hobby"}
+        assert "kvk_number" not in hobby.matched
+
+    def test_custom_rules_table(self):
+        """Test the engine is driven entirely by its rules table"""
+        from app.modules.brain import Rule, RuleEngine
+
+        engine = RuleEngine([
+            Rule(ProfileRing.VAKMAN, "certified", (r"vca\w*", r"erkend\s+installateur")),
+            Rule(ProfileRing.VAKMAN, "since", (r"sinds\s+(?:19|20)\d\d",)),
+        ])
+
+        verdict = engine.classify("Erkend installateur, VCA-gecertificeerd, sinds 1998")
+        assert verdict.count(ProfileRing.VAKMAN) == 2
+        assert verdict.ring == ProfileRing.VAKMAN
+
+
+class TestLocalModel:
+    """Tests for the local TF-IDF classifier trained on LLM labels"""
+
+    @staticmethod
+    def _labelled(n, seed):
+        import random
+
+        rng = random.Random(seed)
+        vocab = {
+            1: "bv kvk medewerkers reviews garantie erkend installatiebedrijf vestigingen".split(),
+            2: "zzp instagram volg portfolio freelance eigen baas zelfstandig".split(),
+            3: "hobby buurman bijverdienste marktplaats klusjes weekend goedkoop".split(),
+        }
+        common = "wij doen werk in utrecht snel netjes schilder loodgieter tegelzetter".split()
+        rows = []
+        for i in range(n):
+            ring = i % 3 + 1
+            words = [rng.choice(vocab[ring]) if rng.random() < 0.3 else rng.choice(common) for _ in range(25)]
+            rows.append((" ".join(words), ring, {1: 8.0, 2: 6.5, 3: 5.0}[ring]))
+        return rows
+
+    def test_train_predict_and_persist(self, tmp_path):
+        """Test the model learns the rings, calibrates and survives a save/load"""
+        from app.modules.brain import LocalModel
+
+        texts, rings, quality = zip(*self._labelled(300, seed=1))
+        model = LocalModel.train(texts, rings, quality, n_features=2 ** 14, epochs=100)
+        assert model.meta["validated_on"] == 60
+        assert model.meta["val_accuracy"] >= 0.9
+
+        held_out = self._labelled(60, seed=2)
+        predictions = model.predict_many([text for text, _, _ in held_out])
+        accuracy = sum(int(p.ring) == ring for p, (_, ring, _) in zip(predictions, held_out)) / len(held_out)
+        assert accuracy >= 0.9
+        assert all(0 < p.confidence <= 1 and 0 <= p.quality_score <= 10 for p in predictions)
+
+        path = str(tmp_path / "model.npz")
+        model.save(path)
+        loaded = LocalModel.load(path)
+        assert [loaded.predict(text) for text, _, _ in held_out] == predictions
+
+    @pytest.mark.asyncio
+    async def test_classifier_uses_local_model_offline(self):
+        """Test provider="local" answers from the model instead of the keyword rules"""
+        from app.modules.brain import ClassificationCache, LocalModel
+
+        texts, rings, quality = zip(*self._labelled(90, seed=3))
+        model = LocalModel.train(texts, rings, quality, n_features=2 ** 12, epochs=60)
+        classifier = BrainClassifier(provider="local", cache=ClassificationCache(path=""), local_model=model)
+        classifier.dedup = None
+        assert classifier._providers() == []
+
+        data = ScrapedData(url="https://x.nl", text_content="hobby buurman klusjes marktplaats", source_type="test")
+        result = await classifier.classify(data)
+        assert result.ring == ProfileRing.HOBBYIST
+        assert result.reasoning.startswith("Local model")
+
+        batch = await classifier.classify_batch([data, data])
+        assert [r.ring for r in batch] == [ProfileRing.HOBBYIST] * 2
+
+
+class TestClassificationCache:
+    """Tests for the LLM classification cache"""
+
+    @staticmethod
+    def _fake_openai(calls):
+        import json
+        from types import SimpleNamespace
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            content = json.dumps({
+                "ring": 1, "quality_score": 8.5, "confidence": 0.9, "reasoning": "LLM",
+                "extracted_data": {"name": "Van Dijk"}, "recommended_hook": "agenda",
+            })
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    @pytest.mark.asyncio
+    async def test_repeat_classification_skips_llm(self, tmp_path):
+        """Test a repost with different whitespace/case is served from the cache"""
+        from app.modules.brain import ClassificationCache
+
+        calls = []
+        classifier = BrainClassifier(cache=ClassificationCache(path=str(tmp_path / "c.sqlite")))
+        classifier._openai_client = self._fake_openai(calls)
+
+        first = await classifier.classify(ScrapedData(
+            url="https://a.nl", text_content="Loodgieter Van Dijk\n  KvK 12345678", source_type="test",
+        ))
+        second = await classifier.classify(ScrapedData(
+            url="https://b.nl", text_content="loodgieter van dijk kvk 12345678 ", source_type="test",
+        ))
+
+        assert len(calls) == 1
+        assert second == first
+        assert classifier.cache.get_stats()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier_and_key_parts(self, tmp_path):
+        """Test entries survive a restart and are scoped to model and prompt version"""
+        from app.modules.brain import ClassificationCache
+
+        path = str(tmp_path / "c.sqlite")
+        result = ProfileClassification(
+            ring=ProfileRing.ZZP, quality_score=6.0, confidence=0.8, reasoning="x",
+            extracted_data={}, recommended_hook="y",
+        )
+        writer = ClassificationCache(path=path)
+        await writer.put("ZZP tegelzetter", "gpt-4o", result)
+        writer.close()
+
+        reader = ClassificationCache(path=path)
+        assert await reader.get("zzp  TEGELZETTER", "gpt-4o") == result
+        assert reader.stats["persistent_hits"] == 1
+        assert await reader.get("zzp tegelzetter", "claude-3-haiku-20240307") is None
+        bumped = ClassificationCache(path=path, prompt_version=reader.prompt_version + "-next")
+        assert await bumped.get("zzp tegelzetter", "gpt-4o") is None
+
+
+class TestNearDuplicates:
+    """Tests for SimHash near-duplicate detection"""
+
+    LISTING = (
+        "Ervaren klusjesman voor al uw kleine klussen in en om het huis. Schilderwerk, "
+        "tegelwerk, laminaat leggen en lampen ophangen. Snel, netjes en betaalbaar. "
+        "Bel of app voor een vrijblijvende offerte, ook in het weekend beschikbaar in Utrecht."
+    )
+
+    def test_simhash_separates_reposts_from_other_texts(self):
+        """Test a few changed words stay within the threshold and other texts do not"""
+        from app.modules.brain.dedup import hamming, simhash
+
+        repost = self.LISTING.replace("Utrecht", "Utrecht en omstreken")
+        other = (
+            "Loodgietersbedrijf met twintig jaar ervaring in cv-ketels, badkamers en "
+            "lekkages. Erkend installateur, 24 uur per dag bereikbaar voor spoedklussen."
+        )
+
+        assert hamming(simhash(self.LISTING), simhash(repost)) <= 6
+        assert hamming(simhash(self.LISTING), simhash(other)) > 10
+        assert simhash("te kort") is None
+
+    def test_index_finds_closest_within_threshold(self):
+        """Test band lookup returns the nearest item and respects exclude/eviction"""
+        from app.modules.brain import SimHashIndex
+
+        index = SimHashIndex(max_distance=3, max_items=2)
+        index.add("a", 0b1011)
+        index.add("b", 0b1011 ^ (1 << 40) ^ (1 << 41))
+
+        assert index.find(0b1011 ^ (1 << 40)).distance == 1
+        assert index.find(0b1011, exclude="a").ref == "b"
+        assert index.find(0b1011 ^ 0xFFFF) is None
+
+        index.add("c", 1 << 63)
+        assert len(index) == 2 and index.find(0b1011).ref == "b"
+
+    @pytest.mark.asyncio
+    async def test_classifier_reuses_near_duplicate(self):
+        """Test a lightly edited repost reuses the LLM result and is flagged"""
+        from app.modules.brain import ClassificationCache, SimHashIndex
+
+        calls = []
+        classifier = BrainClassifier(cache=ClassificationCache(path=""), dedup=SimHashIndex(max_distance=6))
+        classifier._openai_client = TestClassificationCache._fake_openai(calls)
+
+        original = await classifier.classify(ScrapedData(
+            url="https://marktplaats.nl/a/1", text_content=self.LISTING, source_type="marketplace",
+        ))
+        repost = ScrapedData(
+            url="https://marktplaats.nl/a/2",
+            text_content=self.LISTING.replace("Utrecht", "Utrecht en omstreken"),
+            source_type="marketplace",
+        )
+        reused = await classifier.classify(repost)
+
+        assert len(calls) == 1
+        assert reused.ring == original.ring
+        assert reused.extracted_data["duplicate_of"] == "https://marktplaats.nl/a/1"
+        assert classifier.find_duplicate(repost).ref == "https://marktplaats.nl/a/1"
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_does_not_inherit_contact_data(self):
+        """Test only the verdict is reused, never the other seller's name or phone"""
+        from app.modules.brain import ClassificationCache, SimHashIndex
+
+        calls = []
+        classifier = BrainClassifier(cache=ClassificationCache(path=""), dedup=SimHashIndex(max_distance=6))
+        classifier._openai_client = TestClassificationCache._fake_openai(calls)
+
+        original = await classifier.classify(ScrapedData(
+            url="https://marktplaats.nl/a/1", text_content=self.LISTING + " Vraag naar Jan",
+            source_type="marketplace",
+        ))
+        other_seller = await classifier.classify(ScrapedData(
+            url="https://marktplaats.nl/a/2", text_content=self.LISTING + " Vraag naar Piet",
+            source_type="marketplace",
+        ))
+
+        assert len(calls) == 1
+        assert original.extracted_data["name"] == "Van Dijk"
+        assert (other_seller.ring, other_seller.quality_score, other_seller.recommended_hook) == (
+            original.ring, original.quality_score, original.recommended_hook,
+        )
+        assert "name" not in other_seller.extracted_data
+        assert other_seller.extracted_data["source_url"] == "https://marktplaats.nl/a/2"
+        assert other_seller.extracted_data["duplicate_of"] == "https://marktplaats.nl/a/1"
+
+    @pytest.mark.asyncio
+    async def test_batch_items_are_not_duplicates_of_later_items(self):
+        """Test two near-identical items in one batch flag only the second one"""
+        from app.modules.brain import ClassificationCache, SimHashIndex
+
+        calls = []
+        classifier = BrainClassifier(cache=ClassificationCache(path=""), dedup=SimHashIndex(max_distance=6))
+        classifier._openai_client = TestBatchClassification._fake_openai(calls)
+        chunk = [
+            ScrapedData(url="https://marktplaats.nl/a/1", text_content=self.LISTING + " Vraag naar Jan",
+                        source_type="marketplace"),
+            ScrapedData(url="https://marktplaats.nl/a/2", text_content=self.LISTING + " Vraag naar Piet",
+                        source_type="marketplace"),
+        ]
+
+        await classifier.classify_batch(chunk)
+        duplicates = [
+            classifier.find_duplicate(data, exclude=[later.url for later in chunk[i + 1:]])
+            for i, data in enumerate(chunk)
+        ]
+
+        assert duplicates[0] is None
+        assert duplicates[1].ref == "https://marktplaats.nl/a/1"
+
+
+class TestBatchClassification:
+    """Tests for packing several profiles into one LLM request"""
+
+    @staticmethod
+    def _fake_openai(calls, drop_ids=()):
+        import json
+        import re
+        from types import SimpleNamespace
+
+        async def create(**kwargs):
+            prompt = kwargs["messages"][-1]["content"]
+            calls.append(prompt)
+            ids = re.findall(r"### id: (p\d+)", prompt)
+            entry = {"ring": 2, "quality_score": 6.5, "confidence": 0.85, "reasoning": "LLM",
+                     "extracted_data": {}, "recommended_hook": "admin-bot"}
+            if ids:
+                content = json.dumps({"results": [{"id": i, **entry} for i in ids if i not in drop_ids]})
+            else:
+                content = json.dumps(entry)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    @staticmethod
+    def _items(n):
+        return [
+            ScrapedData(url=f"https://x.nl/{i}", text_content=f"Profiel nummer {i} tegelzetter", source_type="test")
+            for i in range(n)
+        ]
+
+    @staticmethod
+    def _classifier(calls, drop_ids=()):
+        from app.modules.brain import ClassificationCache
+
+        classifier = BrainClassifier(cache=ClassificationCache(path=""))
+        classifier.dedup = None
+        classifier._openai_client = TestBatchClassification._fake_openai(calls, drop_ids)
+        return classifier
+
+    @pytest.mark.asyncio
+    async def test_batch_packs_profiles_into_one_request(self):
+        """Test K profiles cost one call and come back in input order"""
+        calls = []
+        classifier = self._classifier(calls)
+
+        results = await classifier.classify_batch(self._items(5))
+
+        assert len(calls) == 1
+        assert [r.ring for r in results] == [ProfileRing.ZZP] * 5
+        assert classifier.batch_stats["batched_profiles"] == 5
+
+        await classifier.classify_batch(self._items(5))
+        assert len(calls) == 1  # all cached now
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_fall_back_to_single_calls(self):
+        """Test profiles absent from the batch answer are classified individually"""
+        calls = []
+        classifier = self._classifier(calls, drop_ids=("p1",))
+
+        results = await classifier.classify_batch(self._items(3))
+
+        assert len(calls) == 2
+        assert "### id:" not in calls[1]
+        assert all(r is not None for r in results)
+        assert classifier.batch_stats["fallback_profiles"] == 1
+        assert classifier._batch_limit < 10
+
+    def test_batches_respect_token_budget(self, monkeypatch):
+        """Test packing closes a batch when the next profile would exceed the budget"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "BRAIN_BATCH_TOKEN_BUDGET", 100)
+        classifier = self._classifier([])
+        items = [
+            ScrapedData(url=f"https://x.nl/{i}", text_content="x" * 160, source_type="test")
+            for i in range(5)
+        ]
+
+        assert classifier._plan_batches(items, list(range(5))) == [[0, 1], [2, 3], [4]]
+
+
+class TestPromptCaching:
+    """Tests for the cacheable static prompt prefix"""
+
+    @pytest.mark.asyncio
+    async def test_static_prefix_and_cached_token_accounting(self):
+        """Test every request starts with the same system prompt and cached tokens are counted"""
+        import json
+        from types import SimpleNamespace
+        from app.modules.brain import ClassificationCache, CLASSIFICATION_SYSTEM_PROMPT
+
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs["messages"])
+            usage = SimpleNamespace(
+                prompt_tokens=1500,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1280 if len(requests) > 1 else 0),
+            )
+            content = json.dumps({"ring": 2, "quality_score": 6.5, "confidence": 0.85, "reasoning": "LLM",
+                                  "extracted_data": {}, "recommended_hook": "admin-bot"})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+        classifier = BrainClassifier(cache=ClassificationCache(path=""))
+        classifier.dedup = None
+        classifier._openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        for text in ("ZZP loodgieter in Utrecht", "Schildersbedrijf met 3 man personeel"):
+            await classifier.classify(ScrapedData(url="https://x.nl", text_content=text, source_type="test"))
+
+        assert [m[0] for m in requests] == [{"role": "system", "content": CLASSIFICATION_SYSTEM_PROMPT}] * 2
+        assert "loodgieter" in requests[0][1]["content"]
+        assert "loodgieter" not in CLASSIFICATION_SYSTEM_PROMPT
+        assert classifier.token_stats["openai"] == {
+            "calls": 2, "uncached_tokens": 1720, "cached_tokens": 1280, "cache_write_tokens": 0,
+        }
+
+
+class TestClassificationCascade:
+    """Tests for answering confident cases with the rules and escalating the rest"""
+
+    @staticmethod
+    def _classifier(calls):
+        from app.modules.brain import CascadeStats, ClassificationCache
+
+        classifier = BrainClassifier(
+            cache=ClassificationCache(path=""), cascade=True, cascade_stats=CascadeStats(threshold=0.8),
+        )
+        classifier.dedup = None
+        classifier._openai_client = TestBatchClassification._fake_openai(calls)
+        return classifier
+
+    @pytest.mark.asyncio
+    async def test_confident_rules_skip_the_llm(self):
+        """Test an obvious Vakman never reaches the LLM while an unclear profile does"""
+        calls = []
+        classifier = self._classifier(calls)
+
+        obvious = ScrapedData(
+            url="https://x.nl/1",
+            text_content="Van Dijk B.V. - KvK 12345678 - 127 reviews",
+            source_type="test",
+        )
+        unclear = ScrapedData(url="https://x.nl/2", text_content="Tegelzetter in Utrecht", source_type="test")
+
+        assert (await classifier.classify(obvious)).ring == ProfileRing.VAKMAN
+        assert calls == []
+
+        result = await classifier.classify(unclear)
+        assert result.reasoning == "LLM"
+        assert len(calls) == 1
+
+        stats = classifier.cascade_stats.get_stats()
+        assert stats["rules"] == 1 and stats["escalated"] == 1
+        assert stats["agreement_by_confidence"] == {"0.0": {"compared": 1, "agreement": 1.0}}
+
+    @pytest.mark.asyncio
+    async def test_batch_only_packs_escalated_profiles(self):
+        """Test classify_batch sends only low-confidence profiles to the LLM"""
+        calls = []
+        classifier = self._classifier(calls)
+        items = [
+            ScrapedData(url="https://x.nl/a", text_content="Hobby klusjesman, €15 per uur", source_type="test"),
+            ScrapedData(url="https://x.nl/b", text_content="Tegelzetter Utrecht", source_type="test"),
+            ScrapedData(url="https://x.nl/c", text_content="Schilder Amersfoort", source_type="test"),
+        ]
+
+        results = await classifier.classify_batch(items)
+
+        assert results[0].ring == ProfileRing.HOBBYIST
+        assert len(calls) == 1
+        assert "Hobby" not in calls[0]
+        assert classifier.cascade_stats.get_stats()["rules_ratio"] == round(1 / 3, 3)
+
+
+class TestProviderScheduler:
+    """Tests for per-provider quotas, adaptive concurrency and 429 handling"""
+
+    @staticmethod
+    def _throttle(retry_after_ms="50"):
+        from types import SimpleNamespace
+
+        error = Exception("rate limited")
+        error.status_code = 429
+        error.response = SimpleNamespace(headers={"retry-after-ms": retry_after_ms})
+        return error
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured_and_limit_halved(self):
+        """Test a 429 pauses the provider for Retry-After, halves the limit and retries"""
+        import time
+        from app.modules.brain import ProviderScheduler
+
+        scheduler = ProviderScheduler("test", rpm=6000, tpm=10**6, max_concurrency=16, latency_target=0)
+        attempts = []
+
+        async def call():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise self._throttle()
+            return "ok"
+
+        assert await scheduler.run(call, tokens=100) == "ok"
+        assert attempts[1] - attempts[0] >= 0.05
+        stats = scheduler.get_stats()
+        assert stats["rate_limited"] == 1 and stats["retries"] == 1
+        assert stats["concurrency_limit"] == 2  # 4 halved, then +1/limit
+        assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_call_larger_than_token_bucket_is_clamped(self):
+        """Test a request over the burst capacity drains the bucket without overdrawing it"""
+        from app.modules.brain import ProviderScheduler
+
+        scheduler = ProviderScheduler("test", rpm=6000, tpm=600, max_concurrency=4, latency_target=0)
+        assert scheduler.tokens.capacity == 100
+
+        async def call():
+            return "ok"
+
+        assert await asyncio.wait_for(scheduler.run(call, tokens=11000), timeout=1) == "ok"
+        assert 0 <= scheduler.tokens.tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_grows_from_slow_start_up_to_ceiling(self):
+        """Test in-flight calls never exceed the adaptive limit"""
+        from app.modules.brain import ProviderScheduler
+
+        scheduler = ProviderScheduler("test", rpm=6000, tpm=10**6, max_concurrency=4, latency_target=0)
+        active, peaks = 0, []
+
+        async def call():
+            nonlocal active
+            active += 1
+            peaks.append((active, int(scheduler.limit)))
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await asyncio.gather(*(scheduler.run(call) for _ in range(20)))
+
+        assert peaks[0] == (1, 1)
+        assert all(n <= limit for n, limit in peaks)
+        assert max(n for n, _ in peaks) == 4
+        assert scheduler.get_stats()["completed"] == 20
+
+    @pytest.mark.asyncio
+    async def test_non_throttle_errors_are_not_retried(self):
+        """Test ordinary errors surface immediately"""
+        from app.modules.brain import ProviderScheduler
+
+        scheduler = ProviderScheduler("test", rpm=6000, tpm=10**6)
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await scheduler.run(call)
+        assert len(attempts) == 1 and scheduler.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeouts_and_connection_errors_are_retried(self):
+        """Test network failures without a status code get the retries the SDK used to do"""
+        import httpx
+        from openai import APITimeoutError
+        from app.modules.brain import ProviderScheduler
+
+        scheduler = ProviderScheduler("test", rpm=6000, tpm=10**6, max_retries=2)
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        errors = [APITimeoutError(request=request), httpx.ConnectError("reset", request=request)]
+
+        async def call():
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        assert await scheduler.run(call) == "ok"
+        stats = scheduler.get_stats()
+        assert stats["retries"] == 2 and stats["rate_limited"] == 0
+
+    @pytest.mark.asyncio
+    async def test_classifier_retries_429_instead_of_falling_back(self, monkeypatch):
+        """Test a throttled LLM call is retried rather than answered by the rules"""
+        from app.modules.brain import ClassificationCache, ProviderScheduler
+        from app.modules.brain import scheduler as scheduler_module
+
+        scheduler = ProviderScheduler("openai", rpm=6000, tpm=10**6)
+        monkeypatch.setattr(scheduler_module, "_schedulers", {"openai": scheduler})
+
+        calls = []
+        fake = TestBatchClassification._fake_openai(calls)
+        create = fake.chat.completions.create
+
+        async def flaky(**kwargs):
+            if not calls:
+                calls.append(None)
+                raise self._throttle("10")
+            return await create(**kwargs)
+
+        fake.chat.completions.create = flaky
+        classifier = BrainClassifier(cache=ClassificationCache(path=""))
+        classifier.dedup = None
+        classifier._openai_client = fake
+
+        result = await classifier.classify(
+            ScrapedData(url="https://x.nl", text_content="Tegelzetter in Utrecht", source_type="test")
+        )
+
+        assert result.reasoning == "LLM"
+        assert scheduler.get_stats()["rate_limited"] == 1
+
+
+class TestCircuitBreaker:
+    """Tests for per-provider circuit breakers and hedged requests"""
+
+    @staticmethod
+    def _fake_anthropic(calls, delay=0.0):
+        import json
+        from types import SimpleNamespace
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            await asyncio.sleep(delay)
+            text = json.dumps({"ring": 3, "quality_score": 5.5, "confidence": 0.8, "reasoning": "Anthropic",
+                               "extracted_data": {}, "recommended_hook": "starter"})
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+        return SimpleNamespace(messages=SimpleNamespace(create=create))
+
+    @staticmethod
+    def _classifier(monkeypatch, openai_create, anthropic_calls, anthropic_delay=0.0, **kwargs):
+        from types import SimpleNamespace
+        from app.modules.brain import ClassificationCache
+        from app.modules.brain import breaker as breaker_module
+        from app.modules.brain import scheduler as scheduler_module
+
+        monkeypatch.setattr(breaker_module, "_breakers", {})
+        monkeypatch.setattr(scheduler_module, "_schedulers", {})
+        classifier = BrainClassifier(cache=ClassificationCache(path=""), **kwargs)
+        classifier.dedup = None
+        classifier._openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=openai_create)))
+        classifier._anthropic_client = TestCircuitBreaker._fake_anthropic(anthropic_calls, anthropic_delay)
+        return classifier
+
+    @staticmethod
+    def _profile():
+        return ScrapedData(url="https://x.nl", text_content="Tegelzetter in Utrecht", source_type="test")
+
+    @pytest.mark.asyncio
+    async def test_state_transitions(self):
+        """Test closed -> open after N failures, half-open probe, closed on success"""
+        from app.modules.brain import CircuitBreaker, CircuitOpenError, CircuitState
+
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+        calls = []
+
+        async def fail():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        async def succeed():
+            calls.append(1)
+            return "ok"
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(fail)
+        assert breaker.state is CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+        assert len(calls) == 2
+
+        await asyncio.sleep(0.06)
+        assert await breaker.call(succeed) == "ok"
+        stats = breaker.get_stats()
+        assert stats["state"] == "closed" and stats["short_circuited"] == 1
+        assert stats["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_open_the_circuit(self):
+        """Test 4xx request errors pass through while 5xx/timeouts count as failures"""
+        import httpx
+        from openai import APITimeoutError
+        from app.modules.brain import CircuitBreaker, CircuitState
+
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+
+        def status_error(code):
+            error = Exception(f"HTTP {code}")
+            error.status_code = code
+            return error
+
+        async def raise_(error):
+            raise error
+
+        for code in (400, 401, 404, 422, 400):
+            with pytest.raises(Exception):
+                await breaker.call(lambda: raise_(status_error(code)))
+        assert breaker.state is CircuitState.CLOSED
+        assert breaker.get_stats()["failures"] == 0
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        with pytest.raises(APITimeoutError):
+            await breaker.call(lambda: raise_(APITimeoutError(request=request)))
+        with pytest.raises(Exception):
+            await breaker.call(lambda: raise_(status_error(503)))
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_provider(self, monkeypatch):
+        """Test a failing primary is skipped outright once its circuit opens"""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "BRAIN_BREAKER_FAILURES", 2)
+        monkeypatch.setattr(settings, "BRAIN_LLM_MAX_RETRIES", 0)
+        openai_calls, anthropic_calls = [], []
+
+        async def down(**kwargs):
+            openai_calls.append(kwargs)
+            raise ConnectionError("down")
+
+        classifier = self._classifier(monkeypatch, down, anthropic_calls)
+        for town in ("Utrecht", "Zwolle", "Breda", "Assen"):
+            result = await classifier.classify(
+                ScrapedData(url="https://x.nl", text_content=f"Tegelzetter in {town}", source_type="test")
+            )
+            assert result.reasoning == "Anthropic"
+
+        assert len(openai_calls) == 2
+        assert len(anthropic_calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_hedge_fires_secondary_when_primary_is_slow(self, monkeypatch):
+        """Test the secondary answers when the primary exceeds the hedge delay"""
+        import time
+        from app.modules.brain import HedgePolicy, get_provider_scheduler
+
+        cancelled = []
+
+        async def slow(**kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        anthropic_calls = []
+        policy = HedgePolicy(default_delay=0.05)
+        classifier = self._classifier(monkeypatch, slow, anthropic_calls, hedge=True, hedge_policy=policy)
+
+        started = time.monotonic()
+        result = await classifier.classify(self._profile())
+
+        assert time.monotonic() - started < 1
+        assert result.reasoning == "Anthropic"
+        assert policy.stats == {"hedged": 1, "hedge_wins": 1}
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+        assert get_provider_scheduler("openai").get_stats()["in_flight"] == 0
+
+
 class TestHookModule:
     """Tests for the HOOK outreach module"""
 
@@ -176,6 +1067,1134 @@ class TestHookModule:
         assert message.ring == ProfileRing.HOBBYIST
 
 
+class TestHTTPCache:
+    """Tests for the shared on-disk response cache"""
+
+    def test_cache_key_ignores_secrets_and_param_order(self):
+        """Test normalization drops API keys and sorts parameters"""
+        cache = ResponseCache(cache_dir="unused")
+        a = cache.key_for("https://Maps.example.com/x?b=2", {"a": 1, "key": "secret"})
+        b = cache.key_for("https://maps.example.com/x?a=1&b=2#frag")
+        assert a == b
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_and_conditional_revalidation(self, tmp_path):
+        """Test fresh entries skip the network and stale ones revalidate"""
+        import httpx
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="<html>listing</html>", headers={"etag": '"v1"'})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache = ResponseCache(cache_dir=str(tmp_path), ttls={"fresh": 3600, "stale": 0})
+
+        first = await cache.get(client, "https://marktplaats.nl/l/a", source="fresh")
+        hit = await cache.get(client, "https://marktplaats.nl/l/a", source="fresh")
+        revalidated = await cache.get(client, "https://marktplaats.nl/l/a", source="stale")
+
+        assert first.text == hit.text == revalidated.text == "<html>listing</html>"
+        assert hit.headers["x-solvari-cache"] == "hit"
+        assert revalidated.headers["x-solvari-cache"] == "revalidated"
+        assert seen == [None, '"v1"']
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self, tmp_path):
+        """Test the cache stays under its size budget"""
+        import httpx
+        import os
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=os.urandom(4000))
+        ))
+        cache = ResponseCache(cache_dir=str(tmp_path), max_bytes=10_000)
+        for i in range(5):
+            await cache.get(client, f"https://werkspot.nl/p/{i}", source="werkspot")
+
+        stats = cache.get_stats()
+        assert stats["size_bytes"] <= 10_000
+        assert stats["evicted"] >= 2
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cacheable_predicate_skips_error_bodies(self, tmp_path):
+        """Test 200 responses carrying API errors or challenges are not stored"""
+        import httpx
+        from app.core.http_cache import is_not_challenge_page
+        from app.modules.scrapers.google_places import places_response_ok
+
+        bodies = {
+            "/quota": {"status": "OVER_QUERY_LIMIT"},
+            "/denied": {"status": "REQUEST_DENIED"},
+            "/empty": {"status": "ZERO_RESULTS", "results": []},
+        }
+
+        def handler(request):
+            if request.url.path == "/challenge":
+                return httpx.Response(200, text="<html><div id='cf-challenge'></div></html>")
+            return httpx.Response(200, json=bodies[request.url.path])
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        for path in bodies:
+            await cache.get(client, f"https://maps.example.com{path}", cacheable=places_response_ok)
+        await cache.get(client, "https://marktplaats.nl/challenge", cacheable=is_not_challenge_page)
+
+        assert cache.get_stats()["stored"] == 1
+        repeat = await cache.get(client, "https://maps.example.com/quota", cacheable=places_response_ok)
+        assert "x-solvari-cache" not in repeat.headers
+        await client.aclose()
+
+
+class TestHTTPClients:
+    """Tests for the pooled HTTP client registry"""
+
+    @pytest.mark.asyncio
+    async def test_registry_reuses_keepalive_connections(self):
+        """Test one client per upstream and reuse counted per connection"""
+        import http.server
+        import socketserver
+        import threading
+        from app.core.http_clients import HTTPClientRegistry
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        registry = HTTPClientRegistry(http2=False)
+        try:
+            assert registry.get("kvk") is registry.get("kvk")
+            for _ in range(3):
+                await registry.get("kvk").get(f"http://127.0.0.1:{server.server_address[1]}/")
+
+            stats = registry.get_stats()["upstreams"]["kvk"]
+            assert stats["requests"] == 3
+            assert stats["new_connections"] == 1
+            assert stats["reused_connections"] == 2
+        finally:
+            await registry.aclose()
+            server.shutdown()
+            server.server_close()
+
+
+class TestParseExecutor:
+    """Tests for the off-loop HTML parse executor"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    async def test_parse_runs_scraper_parsers_off_loop(self, mode):
+        """Test scraper parse methods run in the pool and metrics are kept"""
+        from app.core.parsing import ParseExecutor
+        from app.modules.scrapers import MarktplaatsScraper
+
+        html = """
+            <ul><li class="hz-Listing"><a href="/a123-tegelzetter">
+                <h3>Tegelzetter Tim</h3><p>Badkamers en keukens</p>
+            </a></li></ul>
+        """
+        executor = ParseExecutor(mode=mode, workers=2)
+        try:
+            listings = await executor.parse(MarktplaatsScraper._parse_listing_page, html, "tegelzetter")
+        finally:
+            executor.shutdown()
+
+        assert [l.listing_id for l in listings] == ["123"]
+        stats = executor.get_stats()
+        assert stats["completed"] == 1
+        assert stats["queue_depth"] == 0
+
+
+MARKTPLAATS_LISTING_HTML = """<html><head><title>Loodgieters</title><script>window.x = 1;</script></head>
+<body>
+<nav><a href="/">Home</a></nav>
+<ul class="hz-Listings">
+  <li class="hz-Listing hz-Listing--list-item">
+    <a class="hz-Listing-coverLink" href="/v/diensten/loodgieters/a1234567-loodgieter-amsterdam">
+      <h3 class="hz-Listing-title">Loodgieter   Amsterdam <b>24/7</b></h3>
+    </a>
+    <p class="hz-Listing-description">Lekkage? Verstopping? Wij komen <!-- x --> direct.</p>
+    <span class="hz-Listing-price hz-Listing-price--mobile">Op aanvraag</span>
+    <span class="hz-Listing-location">Amsterdam</span>
+    <span class="hz-Listing-seller-name">Van Dijk Installatie</span>
+  </li>
+  <li class="hz-Listing hz-Listing--list-item">
+    <a href="https://www.marktplaats.nl/v/diensten/a7654321-cv">
+      <span class="hz-Listing-title">CV ketel onderhoud</span>
+    </a>
+    <span class="hz-Listing-price">€ 75,00</span>
+  </li>
+  <li class="hz-Listing hz-Listing--cas">Advertentie zonder link</li>
+  <li class="hz-Listing"><a href="/v/diensten/m999-no-id"><h3>Zonder nummer</h3></a></li>
+</ul>
+<footer><p>Footer</p></footer>
+</body></html>
+"""
+
+WERKSPOT_SEARCH_HTML = """<html><body>
+<section class="results">
+  <div class="ProfessionalCard professional-card">
+    <a href="/profiel/van-dijk-loodgieters-123/"><h2>Van Dijk Loodgieters</h2></a>
+    <span class="rating-score">4,8 <small>/ 5</small></span>
+    <span class="review-count">(127 reviews)</span>
+    <span class="location-city">Amsterdam</span>
+    <span class="badge badge--verified">Geverifieerd</span>
+    <p>Al 25 jaar uw loodgieter in de regio.</p>
+  </div>
+  <div class="specialist-card">
+    <a href="https://www.werkspot.nl/profiel/tim-tegels/">Profiel</a>
+    <h3>Tim's Tegelwerk</h3>
+    <span class="score">9.1</span>
+    <span class="description">Badkamers &amp; keukens</span>
+  </div>
+  <div class="professional-card"><strong>Zonder link</strong></div>
+</section>
+</body></html>
+"""
+
+
+class TestExtraction:
+    """Parity tests for the lxml and BeautifulSoup extraction backends"""
+
+    @staticmethod
+    def _parse_with(backend, func, html):
+        from app.modules.scrapers import extraction
+
+        original = extraction.settings.HTML_EXTRACTION_BACKEND
+        extraction.settings.HTML_EXTRACTION_BACKEND = backend
+        try:
+            return [r.model_dump(exclude={"scraped_at"}) for r in func(html, "loodgieter")]
+        finally:
+            extraction.settings.HTML_EXTRACTION_BACKEND = original
+
+    def test_marktplaats_backends_match_original_output(self):
+        """Test both backends reproduce the html.parser card output"""
+        pytest.importorskip("lxml")
+        from app.modules.scrapers import MarktplaatsScraper
+
+        fast = self._parse_with("lxml", MarktplaatsScraper._parse_listing_page, MARKTPLAATS_LISTING_HTML)
+        soup = self._parse_with("soup", MarktplaatsScraper._parse_listing_page, MARKTPLAATS_LISTING_HTML)
+
+        assert fast == soup
+        assert [l["listing_id"] for l in fast] == ["1234567", "7654321", "/v/diensten/m999-no-id"]
+        assert fast[0]["title"] == "Loodgieter   Amsterdam24/7"
+        assert fast[0]["description"] == "Lekkage? Verstopping? Wij komendirect."
+        assert fast[0]["seller_name"] == "Van Dijk Installatie"
+        assert fast[1]["price"] == "€ 75,00"
+        assert fast == _baseline_marktplaats_cards(MARKTPLAATS_LISTING_HTML, "loodgieter")
+
+    def test_werkspot_backends_match_original_output(self):
+        """Test both backends reproduce the html.parser card output"""
+        pytest.importorskip("lxml")
+        from app.modules.scrapers import WerkspotScraper
+
+        fast = self._parse_with("lxml", WerkspotScraper._parse_search_page, WERKSPOT_SEARCH_HTML)
+        soup = self._parse_with("soup", WerkspotScraper._parse_search_page, WERKSPOT_SEARCH_HTML)
+
+        assert fast == soup
+        assert [p["profile_id"] for p in fast] == ["van-dijk-loodgieters-123", "tim-tegels"]
+        assert fast[0]["rating"] == 4.8 and fast[0]["review_count"] == 127
+        assert fast[0]["verified"] is True
+        assert fast[1]["description"] == "Badkamers & keukens"
+        assert fast == _baseline_werkspot_cards(WERKSPOT_SEARCH_HTML, "loodgieter")
+
+
+def _baseline_marktplaats_cards(html, category):
+    """The pre-extraction-layer html.parser card parser, kept as the parity oracle"""
+    import re
+    from bs4 import BeautifulSoup
+    from app.modules.scrapers.marktplaats import MarktplaatsScraper, MarktplaatsVakman
+
+    def text_of(elem):
+        return elem.get_text(strip=True) if elem else None
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.find_all("li", {"class": re.compile(r"hz-Listing")})
+    if not cards:
+        cards = soup.find_all("article", {"data-testid": re.compile(r"listing")})
+
+    listings = []
+    for card in cards:
+        link = card.find("a", href=True)
+        if not link:
+            continue
+        href = link.get("href", "")
+        listing_id = re.search(r"/a(\d+)", href)
+        listing_id = listing_id.group(1) if listing_id else href
+        title_elem = card.find("h3") or card.find("span", {"class": re.compile(r"title", re.I)})
+        desc_elem = card.find("p") or card.find("span", {"class": re.compile(r"description", re.I)})
+        listing = MarktplaatsVakman(
+            listing_id=str(listing_id),
+            title=title_elem.get_text(strip=True) if title_elem else "Unknown",
+            description=text_of(desc_elem),
+            category="diensten-en-vakmensen",
+            subcategory=category,
+            location=text_of(card.find("span", {"class": re.compile(r"location", re.I)})),
+            price=text_of(card.find("span", {"class": re.compile(r"price", re.I)})),
+            seller_name=text_of(card.find("span", {"class": re.compile(r"seller", re.I)})),
+            url=f"{MarktplaatsScraper.BASE_URL}{href}" if href.startswith("/") else href,
+            scraped_at=datetime.utcnow(),
+        )
+        listings.append(listing.model_dump(exclude={"scraped_at"}))
+    return listings
+
+
+def _baseline_werkspot_cards(html, category):
+    """The pre-extraction-layer html.parser card parser, kept as the parity oracle"""
+    import re
+    from bs4 import BeautifulSoup
+    from app.modules.scrapers.werkspot import WerkspotScraper, WerkspotVakman
+
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.find_all("div", {"class": re.compile(r"professional-card|specialist-card", re.I)})
+    if not cards:
+        cards = soup.find_all("article", {"data-testid": re.compile(r"specialist", re.I)})
+    if not cards:
+        cards = soup.find_all("div", {"class": re.compile(r"card", re.I)})
+
+    profiles = []
+    for card in cards:
+        link = card.find("a", href=re.compile(r"/profiel/")) or card.find("a", href=True)
+        if not link:
+            continue
+        href = link.get("href", "")
+        profile_id = re.search(r"/profiel/([^/]+)", href)
+        profile_id = profile_id.group(1) if profile_id else href
+        name_elem = card.find("h2") or card.find("h3") or card.find("strong")
+
+        rating = None
+        rating_elem = card.find("span", {"class": re.compile(r"rating|score", re.I)})
+        if rating_elem:
+            match = re.search(r"(\d+[.,]\d+)", rating_elem.get_text(strip=True))
+            if match:
+                rating = float(match.group(1).replace(",", "."))
+
+        review_count = None
+        review_elem = card.find("span", {"class": re.compile(r"review", re.I)})
+        if review_elem:
+            match = re.search(r"(\d+)", review_elem.get_text(strip=True))
+            if match:
+                review_count = int(match.group(1))
+
+        loc_elem = card.find("span", {"class": re.compile(r"location|city", re.I)})
+        desc_elem = card.find("p") or card.find("span", {"class": re.compile(r"description", re.I)})
+        profile = WerkspotVakman(
+            profile_id=str(profile_id),
+            company_name=name_elem.get_text(strip=True) if name_elem else "Unknown",
+            description=desc_elem.get_text(strip=True) if desc_elem else None,
+            categories=[category],
+            location=loc_elem.get_text(strip=True) if loc_elem else None,
+            rating=rating,
+            review_count=review_count,
+            verified=bool(card.find("span", {"class": re.compile(r"verified|badge", re.I)})),
+            profile_url=f"{WerkspotScraper.BASE_URL}{href}" if href.startswith("/") else href,
+            scraped_at=datetime.utcnow(),
+        )
+        profiles.append(profile.model_dump(exclude={"scraped_at"}))
+    return profiles
+
+
+MARKTPLAATS_NEXT_DATA_HTML = """<html><head>
+<script id="__NEXT_DATA__" type="application/json">{"props": {"pageProps": {"searchRequestAndResponse": {
+  "listings": [
+    {"itemId": "a1234567", "title": "Loodgieter Amsterdam 24/7",
+     "description": "Lekkage? Wij komen direct.",
+     "priceInfo": {"priceCents": 7500, "priceType": "FIXED"},
+     "location": {"cityName": "Amsterdam"},
+     "vipUrl": "/v/diensten/loodgieters/a1234567-loodgieter-amsterdam",
+     "sellerInformation": {"sellerName": "Van Dijk Installatie", "phoneNumber": "020-1234567",
+                           "averageScore": 4.5, "numberOfReviews": 12}},
+    {"itemId": "m7654321", "title": "CV ketel onderhoud",
+     "priceInfo": {"priceType": "SEE_DESCRIPTION"},
+     "vipUrl": "/v/diensten/m7654321-cv"}
+  ]}}}}</script>
+</head><body><div id="__next"></div></body></html>
+"""
+
+WERKSPOT_JSON_LD_HTML = """<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@graph": [
+  {"@type": "BreadcrumbList", "name": "Loodgieters", "url": "https://www.werkspot.nl/loodgieter/"},
+  {"@type": "Plumber", "name": "Van Dijk Loodgieters",
+   "url": "https://www.werkspot.nl/profiel/van-dijk-loodgieters-123/",
+   "telephone": "+31201234567",
+   "address": {"@type": "PostalAddress", "addressLocality": "Amsterdam"},
+   "aggregateRating": {"ratingValue": "4.8", "reviewCount": "127"}}
+]}</script>
+</head><body></body></html>
+"""
+
+
+class TestStructuredExtraction:
+    """Tests for the embedded-JSON fast path"""
+
+    def test_marktplaats_prefers_next_data(self):
+        """Test listings come from __NEXT_DATA__ with fields the cards lack"""
+        from app.modules.scrapers import MarktplaatsScraper
+        from app.modules.scrapers.structured import PATH_NEXT_DATA
+
+        path, listings = MarktplaatsScraper._extract_listings(MARKTPLAATS_NEXT_DATA_HTML, "loodgieter")
+
+        assert path == PATH_NEXT_DATA
+        assert [l.listing_id for l in listings] == ["1234567", "7654321"]
+        assert listings[0].price == "€ 75,00"
+        assert listings[0].phone == "020-1234567"
+        assert listings[0].rating == 4.5 and listings[0].review_count == 12
+        assert listings[0].url.startswith("https://www.marktplaats.nl/v/diensten/")
+        assert listings[1].price == "Zie omschrijving"
+
+    def test_werkspot_reads_json_ld_graph(self):
+        """Test JSON-LD businesses inside @graph are mapped to profiles"""
+        from app.modules.scrapers import WerkspotScraper
+        from app.modules.scrapers.structured import PATH_JSON_LD
+
+        path, profiles = WerkspotScraper._extract_profiles(WERKSPOT_JSON_LD_HTML, "loodgieter")
+
+        assert path == PATH_JSON_LD
+        assert len(profiles) == 1
+        assert profiles[0].profile_id == "van-dijk-loodgieters-123"
+        assert profiles[0].rating == 4.8 and profiles[0].review_count == 127
+        assert profiles[0].phone == "+31201234567"
+        assert profiles[0].location == "Amsterdam"
+
+    def test_json_ld_numeric_values_are_coerced(self):
+        """Test numeric KvK/phone values neither fail the object nor the page"""
+        from app.modules.scrapers import MarktplaatsScraper, WerkspotScraper
+
+        html = """<script type="application/ld+json">[
+          {"@type": "Plumber", "name": "Van Dijk", "url": "/profiel/van-dijk/",
+           "kvkNumber": 12345678, "telephone": 31201234567, "address": {"addressLocality": 1011}},
+          {"@type": "Plumber", "name": "Tim Tegels", "url": "/profiel/tim-tegels/"}
+        ]</script>"""
+        _, profiles = WerkspotScraper._extract_profiles(html, "loodgieter")
+
+        assert [p.profile_id for p in profiles] == ["van-dijk", "tim-tegels"]
+        assert profiles[0].kvk_nummer == "12345678"
+        assert profiles[0].phone == "31201234567"
+        assert profiles[0].location == "1011"
+
+        html = """<script type="application/ld+json">{"@type": "Service", "name": 42,
+          "url": "https://www.marktplaats.nl/v/diensten/m123-x", "telephone": 201234567}</script>"""
+        _, listings = MarktplaatsScraper._extract_listings(html, "loodgieter")
+        assert listings[0].title == "42" and listings[0].phone == "201234567"
+
+    def test_falls_back_to_dom(self):
+        """Test pages without embedded JSON still go through the card parser"""
+        from app.modules.scrapers import MarktplaatsScraper, WerkspotScraper
+        from app.modules.scrapers.structured import PATH_DOM, PATH_EMPTY
+
+        path, listings = MarktplaatsScraper._extract_listings(MARKTPLAATS_LISTING_HTML, "loodgieter")
+        assert path == PATH_DOM and len(listings) == 3
+
+        path, profiles = WerkspotScraper._extract_profiles("<html><body></body></html>", "loodgieter")
+        assert path == PATH_EMPTY and profiles == []
+
+    def test_broken_json_is_ignored(self):
+        """Test undecodable payloads fall through instead of raising"""
+        from app.modules.scrapers.structured import extract_next_data, extract_json_ld
+
+        html = '<script id="__NEXT_DATA__">{not json</script><script type="application/ld+json">[</script>'
+        assert extract_next_data(html) is None
+        assert extract_json_ld(html) == []
+
+
+class TestScraperFanout:
+    """Tests for concurrent page and category fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_cancels_after_empty_page(self):
+        """Test pages run concurrently and later pages are cancelled"""
+        import asyncio
+        from app.modules.scrapers.fanout import iter_pages
+
+        cancelled = []
+
+        async def fetch_page(page):
+            try:
+                await asyncio.sleep(0.01 * page)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+            return [page] if page < 3 else []
+
+        pages = [page async for page, _ in iter_pages(fetch_page, 6)]
+
+        assert pages == [1, 2]
+        assert sorted(cancelled) == [4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_marktplaats_categories_stream_concurrently(self, monkeypatch, tmp_path):
+        """Test a multi-category sweep keeps page order per category"""
+        import httpx
+        from app.core.http_cache import ResponseCache
+        from app.modules.scrapers import MarktplaatsScraper, marktplaats
+
+        requested = []
+
+        def handler(request):
+            page = int(request.url.params["currentPage"])
+            requested.append((request.url.path, page))
+            html = MARKTPLAATS_NEXT_DATA_HTML if page < 3 else "<html></html>"
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+
+        cache = ResponseCache(cache_dir=str(tmp_path), enabled=False)
+        monkeypatch.setattr(marktplaats, "get_response_cache", lambda: cache)
+        scraper = MarktplaatsScraper(
+            delay_min=0, delay_max=0, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        results = await scraper.search_all_categories(
+            categories=["loodgieter", "elektricien"], max_pages_per_category=4
+        )
+
+        assert set(results) == {"loodgieter", "elektricien"}
+        assert all(len(listings) == 4 for listings in results.values())
+        assert {path for path, _ in requested} == {
+            "/l/diensten-en-vakmensen/loodgieters/",
+            "/l/diensten-en-vakmensen/elektriciens/",
+        }
+
+
+class FakeSession:
+    """AsyncSession stand-in that counts savepoints"""
+
+    def __init__(self):
+        self.savepoints = 0
+        self.rolled_back = 0
+
+    def begin_nested(self):
+        session = self
+
+        class Savepoint:
+            async def __aenter__(self):
+                session.savepoints += 1
+
+            async def __aexit__(self, exc_type, exc, tb):
+                if exc_type is not None:
+                    session.rolled_back += 1
+                return False
+
+        return Savepoint()
+
+
+class TestKvKScan:
+    """Tests for the token bucket and the concurrent KvK scan engine"""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_throttles_after_burst(self):
+        """Test the burst is free and later tokens arrive at the refill rate"""
+        import time
+        from app.core.ratelimit import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        assert 0.03 <= elapsed < 0.5
+        assert bucket.stats["acquired"] == 4
+        assert bucket.stats["throttled"] == 2
+
+    @pytest.mark.asyncio
+    async def test_scan_engine_runs_concurrently_and_batches_writes(self):
+        """Test fetches overlap, results keep input order and saves are batched"""
+        import asyncio
+        from app.core.ratelimit import TokenBucket
+        from app.models import ProfileClassification, ProfileRing
+        from app.modules.hook import HookGenerator
+        from app.modules.kvk import KvKScanEngine
+        from app.modules.kvk.models import KvKBasisprofiel
+
+        class FakeClient:
+            quota = TokenBucket(rate=1000)
+            in_flight = peak = 0
+
+            async def get_basisprofiel(self, kvk_nummer):
+                FakeClient.in_flight += 1
+                FakeClient.peak = max(FakeClient.peak, FakeClient.in_flight)
+                await asyncio.sleep(0.01)
+                FakeClient.in_flight -= 1
+                if kvk_nummer == "00000000":
+                    return None
+                return KvKBasisprofiel(kvkNummer=kvk_nummer, naam=f"Bedrijf {kvk_nummer}")
+
+        class FakeClassifier:
+            async def classify(self, scraped):
+                return ProfileClassification(
+                    ring=ProfileRing.VAKMAN, quality_score=8.0, confidence=0.9, reasoning="test",
+                    extracted_data={"name": scraped.metadata["kvk_nummer"]}, recommended_hook="vakman",
+                )
+
+        class FakeDB:
+            def __init__(self):
+                self.profile_batches = []
+                self.outreach_batches = []
+
+            async def save_profiles(self, session, profiles):
+                self.profile_batches.append(profiles)
+
+            async def save_outreach_batch(self, session, outreach):
+                self.outreach_batches.append(outreach)
+
+        db = FakeDB()
+        engine = KvKScanEngine(
+            client=FakeClient(), classifier=FakeClassifier(), generator=HookGenerator(),
+            db=db, fetch_concurrency=4, classify_concurrency=2, batch_size=3,
+        )
+        numbers = [f"{i:08d}" for i in range(1, 8)] + ["00000000"]
+        response = await engine.scan(FakeSession(), numbers)
+
+        assert [r["kvkNummer"] for r in response["results"]] == numbers
+        assert response["results"][-1]["success"] is False
+        assert FakeClient.peak == 4
+        assert [len(b) for b in db.profile_batches] == [3, 3, 1]
+        saved_ids = {str(p["id"]) for batch in db.profile_batches for p in batch}
+        outreach_ids = {str(o["profile_id"]) for batch in db.outreach_batches for o in batch}
+        assert saved_ids == outreach_ids
+        assert response["timing"]["fetch"]["count"] == 8
+        assert response["timing"]["save"]["count"] == 7
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_rolls_back_to_its_savepoint(self):
+        """Test a failing insert only fails its own batch"""
+        from app.core.ratelimit import TokenBucket
+        from app.models import ProfileClassification, ProfileRing
+        from app.modules.kvk import KvKScanEngine
+        from app.modules.kvk.models import KvKBasisprofiel
+
+        class FakeClient:
+            quota = TokenBucket(rate=1000)
+
+            async def get_basisprofiel(self, kvk_nummer):
+                return KvKBasisprofiel(kvkNummer=kvk_nummer, naam=kvk_nummer)
+
+        class FakeClassifier:
+            async def classify(self, scraped):
+                return ProfileClassification(
+                    ring=ProfileRing.VAKMAN, quality_score=8.0, confidence=0.9, reasoning="test",
+                    extracted_data={}, recommended_hook="vakman",
+                )
+
+        class FakeDB:
+            saved = []
+
+            async def save_profiles(self, session, profiles):
+                if any(p["kvk_number"] == "00000003" for p in profiles):
+                    raise RuntimeError("duplicate key")
+                FakeDB.saved.extend(p["kvk_number"] for p in profiles)
+
+        session = FakeSession()
+        engine = KvKScanEngine(
+            client=FakeClient(), classifier=FakeClassifier(), db=FakeDB(),
+            fetch_concurrency=1, classify_concurrency=1, batch_size=2,
+        )
+        numbers = [f"{i:08d}" for i in range(1, 7)]
+        response = await engine.scan(session, numbers, auto_generate_outreach=False)
+
+        assert session.savepoints == 3 and session.rolled_back == 1
+        assert response["succeeded"] == 4 and response["failed"] == 2
+        assert sorted(FakeDB.saved) == ["00000001", "00000002", "00000005", "00000006"]
+
+    @pytest.mark.asyncio
+    async def test_failing_source_is_reported_not_truncated(self):
+        """Test numbers pulled before the source fails are saved and the error surfaces"""
+        from app.core.ratelimit import TokenBucket
+        from app.models import ProfileClassification, ProfileRing
+        from app.modules.kvk import KvKScanEngine
+        from app.modules.kvk.models import KvKBasisprofiel
+
+        class FakeClient:
+            quota = TokenBucket(rate=1000)
+
+            async def get_basisprofiel(self, kvk_nummer):
+                return KvKBasisprofiel(kvkNummer=kvk_nummer, naam=kvk_nummer)
+
+        class FakeClassifier:
+            async def classify(self, scraped):
+                return ProfileClassification(
+                    ring=ProfileRing.VAKMAN, quality_score=8.0, confidence=0.9, reasoning="test",
+                    extracted_data={}, recommended_hook="vakman",
+                )
+
+        class FakeDB:
+            saved = 0
+
+            async def save_profiles(self, session, profiles):
+                FakeDB.saved += len(profiles)
+
+        async def source():
+            for i in range(1, 4):
+                yield f"{i:08d}"
+            raise RuntimeError("KVK Search page 2 failed: 503")
+
+        engine = KvKScanEngine(client=FakeClient(), classifier=FakeClassifier(), db=FakeDB())
+        response = await engine.scan(FakeSession(), source(), auto_generate_outreach=False)
+
+        assert response["scanned"] == response["succeeded"] == FakeDB.saved == 3
+        assert "503" in response["source_error"]
+
+    def test_sbi_trie_matches_most_specific_trade_prefix(self):
+        """Test the SBI trie walks the hierarchy and the filter counts rejections"""
+        from app.modules.kvk import SBIFilter, SBITrie
+        from app.modules.kvk.models import KvKSbiActiviteit, KvKSearchResultItem
+
+        trie = SBITrie()
+        assert trie.match("43221")[0] == "4322"
+        assert trie.match("43999")[0] == "4399"
+        assert trie.match("81221")[0] == "812"
+        assert "47430" not in trie
+        assert "4110" not in trie  # projectontwikkeling is not a trade
+
+        def item(kvk, *codes):
+            return KvKSearchResultItem(
+                kvkNummer=kvk, naam=kvk, type="hoofdvestiging",
+                sbiActiviteiten=[KvKSbiActiviteit(sbiCode=c, sbiOmschrijving="") for c in codes] or None,
+            )
+
+        sbi_filter = SBIFilter()
+        items = [item("1", "43210"), item("2", "47430"), item("3"), item("4", "43341")]
+        kept, rejected = sbi_filter.filter(items, vakgebied="elektra")
+
+        assert [i.kvkNummer for i in kept] == ["1", "3"]
+        assert rejected == 2
+        assert sbi_filter.get_stats()["unknown"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scan_rejects_non_trade_before_classifying(self):
+        """Test a non-trade SBI profile is fetched but never classified"""
+        from app.core.ratelimit import TokenBucket
+        from app.models import ProfileClassification, ProfileRing
+        from app.modules.kvk import KvKScanEngine, SBIFilter
+        from app.modules.kvk.models import KvKBasisprofiel, KvKSbiActiviteit
+
+        class FakeClient:
+            quota = TokenBucket(rate=1000)
+
+            async def get_basisprofiel(self, kvk_nummer):
+                code = "43221" if kvk_nummer == "11111111" else "47430"
+                return KvKBasisprofiel(
+                    kvkNummer=kvk_nummer, naam=kvk_nummer,
+                    sbiActiviteiten=[KvKSbiActiviteit(sbiCode=code, sbiOmschrijving="")],
+                )
+
+        class FakeClassifier:
+            calls = 0
+
+            async def classify(self, scraped):
+                FakeClassifier.calls += 1
+                return ProfileClassification(
+                    ring=ProfileRing.VAKMAN, quality_score=8.0, confidence=0.9, reasoning="test",
+                    extracted_data={}, recommended_hook="vakman",
+                )
+
+        class FakeDB:
+            async def save_profiles(self, session, profiles):
+                pass
+
+            async def save_outreach_batch(self, session, outreach):
+                pass
+
+        engine = KvKScanEngine(
+            client=FakeClient(), classifier=FakeClassifier(), db=FakeDB(), sbi_filter=SBIFilter(),
+        )
+        response = await engine.scan(FakeSession(), ["11111111", "22222222"], auto_generate_outreach=False)
+
+        assert FakeClassifier.calls == 1
+        assert response["succeeded"] == 1
+        assert response["rejected"] == 1
+        assert response["failed"] == 0
+        assert response["results"][1]["sbi"] == ["47430"]
+
+        # Numbers listed explicitly (no filter given) are all scanned
+        engine = KvKScanEngine(client=FakeClient(), classifier=FakeClassifier(), db=FakeDB())
+        response = await engine.scan(FakeSession(), ["11111111", "22222222"], auto_generate_outreach=False)
+        assert response["succeeded"] == 2 and response["rejected"] == 0
+
+
+class TestKvKClient:
+    """Tests for concurrent KvK detail fetches and speculative prefetch"""
+
+    @staticmethod
+    def _client(monkeypatch, tmp_path, handler):
+        import httpx
+        from app.core.ratelimit import TokenBucket
+        from app.modules.kvk import KvKCache, KvKClient
+
+        return KvKClient(
+            api_key="test",
+            use_test=True,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            quota=TokenBucket(rate=100, capacity=20),
+            cache=KvKCache(backend="disk", cache_dir=str(tmp_path)),
+        )
+
+    @staticmethod
+    def _handler(requests):
+        import asyncio
+        import httpx
+
+        async def handler(request):
+            requests.append(request.url.path)
+            await asyncio.sleep(0.02)
+            if request.url.path.endswith("/vestigingen"):
+                return httpx.Response(200, json={"vestigingen": [{"vestigingsnummer": "000012345678"}]})
+            kvk_nummer = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json={"kvkNummer": kvk_nummer, "naam": f"Bedrijf {kvk_nummer}"})
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_company_details_fetches_in_parallel(self, monkeypatch, tmp_path):
+        """Test basisprofiel and vestigingen are requested concurrently"""
+        import time
+
+        requests = []
+        client = self._client(monkeypatch, tmp_path, self._handler(requests))
+
+        start = time.perf_counter()
+        details = await client.get_company_details("12345678")
+
+        assert details["naam"] == "Bedrijf 12345678"
+        assert len(details["vestigingen"]) == 1
+        assert len(requests) == 2
+        assert time.perf_counter() - start < 0.04
+
+    @pytest.mark.asyncio
+    async def test_prefetch_is_joined_by_detail_view(self, monkeypatch, tmp_path):
+        """Test a detail fetch reuses the in-flight prefetch instead of re-requesting"""
+        from app.modules.kvk.client import get_prefetch_stats
+
+        requests = []
+        client = self._client(monkeypatch, tmp_path, self._handler(requests))
+
+        scheduled = client.prefetch_basisprofielen(["11111111", "22222222", "33333333"], limit=2)
+        profile = await client.get_basisprofiel("11111111")
+
+        assert scheduled == 2
+        assert profile.naam == "Bedrijf 11111111"
+        assert requests.count("/test/api/v1/basisprofielen/11111111") == 1
+        assert "/test/api/v1/basisprofielen/33333333" not in requests
+        assert get_prefetch_stats()["joined"] >= 1
+
+        import asyncio
+        from app.modules.kvk.client import _prefetch_tasks
+        await asyncio.gather(*list(_prefetch_tasks.values()))
+
+    def test_prefetch_respects_quota_reserve(self, monkeypatch, tmp_path):
+        """Test nothing is prefetched when the quota is down to its reserve"""
+        from app.core.ratelimit import TokenBucket
+
+        client = self._client(monkeypatch, tmp_path, self._handler([]))
+        client.quota = TokenBucket(rate=0.001, capacity=3)
+
+        assert client.prefetch_basisprofielen(["11111111"]) == 0
+
+    @staticmethod
+    def _search_handler(pages):
+        import httpx
+
+        # 5 results over pages of 2, with one repeat across a page boundary
+        rows = [("11111111", "1"), ("22222222", "2"), ("22222222", "2"), ("33333333", "3"), ("44444444", "4")]
+
+        async def handler(request):
+            pagina = int(request.url.params["pagina"])
+            pages.append(pagina)
+            chunk = rows[(pagina - 1) * 2:pagina * 2]
+            return httpx.Response(200, json={
+                "pagina": pagina,
+                "resultatenPerPagina": 2,
+                "totaal": len(rows),
+                "resultaten": [
+                    {"kvkNummer": k, "vestigingsnummer": v, "naam": f"Bedrijf {k}", "type": "hoofdvestiging"}
+                    for k, v in chunk
+                ],
+            })
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_iter_search_pages_until_totaal_and_dedupes(self, monkeypatch, tmp_path):
+        """Test iter_search walks all pages once and skips repeated results"""
+        pages = []
+        client = self._client(monkeypatch, tmp_path, self._search_handler(pages))
+
+        found = [item.kvkNummer async for item in client.iter_search(query="test", per_pagina=2)]
+
+        assert found == ["11111111", "22222222", "33333333", "44444444"]
+        assert sorted(pages) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_iter_search_stops_at_max_results(self, monkeypatch, tmp_path):
+        """Test max_results ends iteration without fetching further pages"""
+        pages = []
+        client = self._client(monkeypatch, tmp_path, self._search_handler(pages))
+
+        found = [item.kvkNummer async for item in client.iter_search(query="test", per_pagina=2, max_results=2)]
+
+        assert found == ["11111111", "22222222"]
+        assert 3 not in pages
+
+    @pytest.mark.asyncio
+    async def test_iter_search_retries_and_raises_on_failing_page(self, monkeypatch, tmp_path):
+        """Test a failing page is retried and never mistaken for the last page"""
+        import httpx
+
+        pages = []
+        ok = self._search_handler(pages)
+        failures = {"left": 1}
+
+        async def flaky(request):
+            if request.url.params["pagina"] == "2" and failures["left"]:
+                failures["left"] -= 1
+                return httpx.Response(503)
+            return await ok(request)
+
+        client = self._client(monkeypatch, tmp_path, flaky)
+        client.SEARCH_RETRY_BACKOFF = 0
+        found = [item.kvkNummer async for item in client.iter_search(query="test", per_pagina=2)]
+        assert found == ["11111111", "22222222", "33333333", "44444444"]
+
+        failures["left"] = 99
+        client = self._client(monkeypatch, tmp_path / "down", flaky)
+        client.SEARCH_RETRY_BACKOFF = 0
+        found = []
+        with pytest.raises(httpx.HTTPStatusError):
+            async for item in client.iter_search(query="test", per_pagina=2):
+                found.append(item.kvkNummer)
+        assert found == ["11111111", "22222222"]
+
+        # Plain search() keeps returning an empty result for interactive callers
+        result = await client.search(query="test", pagina=2, per_pagina=2)
+        assert result.totaal == 0
+
+    @pytest.mark.asyncio
+    async def test_scan_consumes_async_source_with_bounded_window(self):
+        """Test scan pulls from an async iterable and only summarizes when results are dropped"""
+        import asyncio
+        from app.core.ratelimit import TokenBucket
+        from app.models import ProfileClassification, ProfileRing
+        from app.modules.kvk import KvKScanEngine
+        from app.modules.kvk.models import KvKBasisprofiel
+
+        pulled = classified = peak = 0
+
+        async def source():
+            nonlocal pulled, peak
+            for i in range(1, 21):
+                pulled += 1
+                peak = max(peak, pulled - classified)
+                yield f"{i:08d}"
+
+        class FakeClient:
+            quota = TokenBucket(rate=1000)
+
+            async def get_basisprofiel(self, kvk_nummer):
+                await asyncio.sleep(0.005)
+                return KvKBasisprofiel(kvkNummer=kvk_nummer, naam=f"Bedrijf {kvk_nummer}")
+
+        class FakeClassifier:
+            async def classify(self, scraped):
+                nonlocal classified
+                classified += 1
+                return ProfileClassification(
+                    ring=ProfileRing.VAKMAN, quality_score=8.0, confidence=0.9, reasoning="test",
+                    extracted_data={}, recommended_hook="vakman",
+                )
+
+        class FakeDB:
+            saved = 0
+
+            async def save_profiles(self, session, profiles):
+                FakeDB.saved += len(profiles)
+
+            async def save_outreach_batch(self, session, outreach):
+                pass
+
+        engine = KvKScanEngine(
+            client=FakeClient(), classifier=FakeClassifier(), db=FakeDB(),
+            fetch_concurrency=2, classify_concurrency=1, batch_size=5,
+        )
+        response = await engine.scan(FakeSession(), source(), auto_generate_outreach=False, keep_results=False)
+
+        assert response["scanned"] == 20
+        assert response["succeeded"] == 20
+        assert response["by_ring"] == {ProfileRing.VAKMAN.value: 20}
+        assert response["results"] is None
+        assert FakeDB.saved == 20
+        # window of fetch + classify slots, plus the one just pulled
+        assert peak <= 4
+
+
+class TestKvKBulkStore:
+    """Tests for the local KvK bulk-extract store"""
+
+    CSV = (
+        "kvkNummer;naam;plaats;postcode;straatnaam;huisnummer;sbiCodes;sbiOmschrijvingen\n"
+        "11111111;Loodgietersbedrijf Van Dijk;Utrecht;3511 AB;Oudegracht;12;43221;Loodgieters\n"
+        "22222222;Elektro Jansen;Utrecht;3512 CD;Neude;3;43210;Elektrotechnische bouwinstallatie\n"
+        "33333333;Elektronica Outlet BV;Utrecht;3513 EF;Lange Viestraat;8;47430;Winkels in elektronica\n"
+        ";Zonder nummer;Utrecht;;;;;\n"
+    )
+
+    @classmethod
+    def _store(cls, tmp_path):
+        from app.modules.kvk import KvKBulkStore
+
+        extract = tmp_path / "extract.csv"
+        extract.write_text(cls.CSV)
+        store = KvKBulkStore(str(tmp_path / "kvk.sqlite"))
+        assert store.import_file(str(extract)) == {"imported": 3, "skipped": 1}
+        return store
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_trigrams_postcode_and_sbi(self, tmp_path):
+        """Test name, postcode and SBI-prefix filters use the local indexes"""
+        store = self._store(tmp_path)
+
+        total, companies = await store.search(query="elektr", plaats="utrecht")
+        assert total == 2
+        assert {c["kvkNummer"] for c in companies} == {"22222222", "33333333"}
+
+        total, companies = await store.search(query="elektr", sbi_prefixes=["43"])
+        assert [c["kvkNummer"] for c in companies] == ["22222222"]
+
+        total, companies = await store.search(postcode="3511ab")
+        assert companies[0]["adres"]["binnenlandsAdres"]["straatnaam"] == "Oudegracht"
+        assert (await store.search(query="schilder"))[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_answers_from_store_before_api(self, tmp_path):
+        """Test search and basisprofiel never hit the API for companies in the extract"""
+        import httpx
+        from app.core.ratelimit import TokenBucket
+        from app.modules.kvk import KvKCache, KvKClient
+
+        requests = []
+
+        def handler(request):
+            requests.append(request.url.path)
+            return httpx.Response(404)
+
+        client = KvKClient(
+            api_key="test",
+            use_test=True,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            quota=TokenBucket(rate=100),
+            cache=KvKCache(backend="memory"),
+            bulk=self._store(tmp_path),
+        )
+
+        result = await client.search_vakmensen(plaats="Utrecht", vakgebied="loodgieter")
+        profile = await client.get_basisprofiel("22222222")
+
+        assert [r.kvkNummer for r in result.resultaten] == ["11111111"]
+        assert profile.naam == "Elektro Jansen"
+        assert profile.sbiActiviteiten[0].sbiCode == "43210"
+        assert requests == []
+
+        assert await client.get_basisprofiel("99999999") is None
+        assert requests == ["/test/api/v1/basisprofielen/99999999"]
+
+
+    @pytest.mark.asyncio
+    async def test_every_vestiging_is_kept(self, tmp_path):
+        """Test a neven- after a hoofdvestiging neither replaces it nor hides the company"""
+        from app.modules.kvk import KvKBulkStore
+
+        extract = tmp_path / "vestigingen.csv"
+        extract.write_text(
+            "kvkNummer;vestigingsnummer;type;naam;plaats;sbiCodes\n"
+            "11111111;000011111111;hoofdvestiging;Van Dijk Installatie;Utrecht;43221\n"
+            "11111111;000022222222;nevenvestiging;Van Dijk Installatie;Utrecht;43222\n"
+        )
+        store = KvKBulkStore(str(tmp_path / "kvk.sqlite"))
+        assert store.import_file(str(extract), batch_size=1)["imported"] == 2
+
+        total, companies = await store.search(plaats="utrecht", type_filter="hoofdvestiging")
+        assert total == 1 and companies[0]["vestigingsnummer"] == "000011111111"
+        total, companies = await store.search(plaats="utrecht")
+        assert {c["vestigingsnummer"] for c in companies} == {"000011111111", "000022222222"}
+
+        company = await store.get("11111111")
+        assert company["type"] == "hoofdvestiging"
+        assert {s["sbiCode"] for s in company["sbiActiviteiten"]} == {"43221", "43222"}
+        assert store.count() == 1
+
+
+class TestKvKCache:
+    """Tests for the KvK response cache"""
+
+    @pytest.mark.asyncio
+    async def test_hits_survive_memory_and_404s_are_cached(self, tmp_path):
+        """Test disk-tier hits, negative caching and per-endpoint TTLs"""
+        import httpx
+        from app.modules.kvk import KvKCache
+
+        calls = []
+
+        async def fetch_ok():
+            calls.append("ok")
+            return {"kvkNummer": "12345678"}
+
+        async def fetch_missing():
+            calls.append("missing")
+            request = httpx.Request("GET", "https://api.kvk.nl/test/api/v1/basisprofielen/00000000")
+            raise httpx.HTTPStatusError("404", request=request, response=httpx.Response(404, request=request))
+
+        cache = KvKCache(backend="disk", cache_dir=str(tmp_path))
+        assert await cache.get_or_fetch("v1/basisprofielen/12345678", None, fetch_ok) == {"kvkNummer": "12345678"}
+
+        # A fresh instance only has the disk tier to go on
+        cache = KvKCache(backend="disk", cache_dir=str(tmp_path))
+        assert await cache.get_or_fetch("v1/basisprofielen/12345678", None, fetch_ok) == {"kvkNummer": "12345678"}
+        assert cache.stats["persistent_hits"] == 1
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError) as exc:
+                await cache.get_or_fetch("v1/basisprofielen/00000000", None, fetch_missing)
+            assert exc.value.response.status_code == 404
+
+        assert calls == ["ok", "missing"]
+        assert cache.stats["negative_hits"] == 1
+        assert cache.ttl_for("v1/basisprofielen/1/vestigingen") < cache.ttl_for("v1/basisprofielen/1")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_call(self):
+        """Test single-flight coalescing of identical lookups"""
+        import asyncio
+        from app.modules.kvk import KvKCache
+
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"resultaten": []}
+
+        cache = KvKCache(backend="memory")
+        params = {"naam": "bakker", "pagina": 1}
+        results = await asyncio.gather(*(cache.get_or_fetch("v2/zoeken", params, fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"resultaten": []} for r in results)
+        assert cache.stats["coalesced"] == 4
+
+
 class TestModels:
     """Tests for Pydantic models"""
 